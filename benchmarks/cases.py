@@ -0,0 +1,178 @@
+"""
+Benchmark cases for the hot paths of the games and tools. Each case builds
+its inputs for a given size, and returns the function to time.
+"""
+
+import itertools
+import random
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+
+from src.backend.encoding import GameEncoder
+from src.games.twenty_forty_eight.game import Game, GameConfig, SlideDirection
+from src.games.twenty_forty_eight.symmetry import SymmetryHelper
+from src.tiled_tools.common.graph import Edge, Graph, Node
+from src.tiled_tools.common.grid import Grid, GridGenerator, WrapDirection
+from src.tiled_tools.common.queues import PriorityQueue
+from src.tiled_tools.map.algorithms import QuantumState, WaveFunctionCollapse
+from src.tiled_tools.map.map import ISLAND_RULESET, TileType
+
+# Fixed, so every run times the same boards, graphs and maps
+SEED = 2048
+
+
+@dataclass
+class BenchmarkCase:
+    """
+    A named benchmark, run once per size
+
+    Args:
+        name: Name of the benchmark, usually the function being timed
+        sizes: The sizes to run the benchmark with
+        setup: Builds the inputs for a size, returning the function to time
+    """
+
+    name: str
+    sizes: list[int]
+    setup: Callable[[int], Callable[[], object]]
+
+
+CASES: list[BenchmarkCase] = []
+
+
+def seed_games():
+    """
+    Seed both random modules games draw from, tile positions from random
+    and mutations from np.random, as games cannot be handed a generator
+    """
+    random.seed(SEED)
+    np.random.seed(SEED)
+
+
+def benchmark(name: str, sizes: list[int]):
+    """Registers a setup function as a benchmark case"""
+
+    def register(setup: Callable[[int], Callable[[], object]]):
+        CASES.append(BenchmarkCase(name, sizes, setup))
+        return setup
+
+    return register
+
+
+@benchmark("Game.play_turn", sizes=[4, 8, 16])
+def play_turn(grid_size: int):
+    """A slide on a board of grid_size, starting a new game when one ends"""
+    seed_games()
+    config = GameConfig(grid_size=grid_size)
+    directions = itertools.cycle(
+        [
+            SlideDirection.UP,
+            SlideDirection.LEFT,
+            SlideDirection.DOWN,
+            SlideDirection.RIGHT,
+        ]
+    )
+    state = {"game": Game(config)}
+
+    def run():
+        if state["game"].board_full():
+            state["game"] = Game(config)
+
+        state["game"].play_turn(next(directions))
+
+    return run
+
+
+@benchmark("GameEncoder.encode_game", sizes=[4, 8, 16])
+def encode_game(grid_size: int):
+    """Encoding a game of grid_size a few slides in, as a response would"""
+    seed_games()
+    game = Game(GameConfig(grid_size=grid_size))
+    for direction in [SlideDirection.UP, SlideDirection.LEFT] * 4:
+        game.play_turn(direction)
+
+    def run():
+        GameEncoder.encode_game(game)
+
+    return run
+
+
+@benchmark("SymmetryHelper.canonicalize_batch", sizes=[1, 100, 10000])
+def canonicalize_batch(batch_size: int):
+    """Canonicalization of a batch of random 4x4 boards"""
+    rng = random.Random(SEED)
+    values = [0, 0, 0, 2, 4, 8, 16, 32, 64, 128]
+    boards = [
+        [[rng.choice(values) for _c in range(4)] for _r in range(4)]
+        for _board in range(batch_size)
+    ]
+
+    def run():
+        SymmetryHelper.canonicalize_batch(boards)
+
+    return run
+
+
+@benchmark("Grid.get_adjacent_coords", sizes=[16, 64, 256])
+def get_adjacent_coords(size: int):
+    """Adjacent coordinates of every cell of a wrapping size x size grid, in turn"""
+    grid = GridGenerator.filled(size, size, 0, wrap_direction=WrapDirection.TORUS)
+    coords = itertools.cycle([(c, r) for r in range(size) for c in range(size)])
+
+    def run():
+        grid.get_adjacent_coords(*next(coords))
+
+    return run
+
+
+@benchmark("Graph.get_neighbors", sizes=[100, 1000, 5000])
+def get_neighbors(size: int):
+    """Neighbors of random nodes, in a ring of size nodes with size extra random edges"""
+    rng = random.Random(SEED)
+    nodes = [Node(i) for i in range(size)]
+    graph = Graph()
+
+    for i, node in enumerate(nodes):
+        graph.add_edge(Edge(node, nodes[(i + 1) % size], 1))
+
+    for _i in range(size):
+        graph.add_edge(Edge(rng.choice(nodes), rng.choice(nodes), rng.random()))
+
+    samples = itertools.cycle(rng.sample(nodes, min(size, 100)))
+
+    def run():
+        graph.get_neighbors(next(samples))
+
+    return run
+
+
+@benchmark("PriorityQueue.push", sizes=[100, 1000, 10000])
+def priority_push(size: int):
+    """A push onto a queue holding size items, popped again to keep the size steady"""
+    rng = random.Random(SEED)
+    queue = PriorityQueue()
+    for i in range(size):
+        queue.push((i, rng.random()))
+
+    priorities = itertools.cycle([rng.random() for _i in range(1000)])
+
+    def run():
+        queue.push(("item", next(priorities)))
+        queue.pop()
+
+    return run
+
+
+@benchmark("WaveFunctionCollapse.collapse", sizes=[6, 8, 10])
+def collapse(size: int):
+    """Collapse of a new size x size island map, the same map every time"""
+
+    def run():
+        random.seed(SEED)
+        states = [[QuantumState(TileType) for _c in range(size)] for _r in range(size)]
+        grid = Grid(states, wrap_direction=WrapDirection.NONE)
+        WaveFunctionCollapse(ISLAND_RULESET, grid, {}).collapse()
+
+    return run
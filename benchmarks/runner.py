@@ -0,0 +1,174 @@
+"""
+Runs the benchmark cases, writing the results to JSON along with details of
+the machine, and compares results against a saved baseline.
+
+    python -m benchmarks.runner run --output bench_results.json
+    python -m benchmarks.runner compare baseline.json bench_results.json --threshold 0.1
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import timeit
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+import numpy as np
+
+from benchmarks.cases import CASES, BenchmarkCase
+
+
+def machine_metadata() -> dict[str, Any]:
+    """Details of the machine and code the benchmarks ran on"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run_case(case: BenchmarkCase, size: int, repeat: int = 5) -> dict[str, Any]:
+    """
+    Times a case at a size. The number of calls per repeat is picked so each
+    repeat takes at least 0.2 seconds, and times are reported per call
+    """
+    timer = timeit.Timer(case.setup(size))
+    number, _time_taken = timer.autorange()
+    per_call = [total / number for total in timer.repeat(repeat, number)]
+
+    return {
+        "name": case.name,
+        "size": size,
+        "calls": number,
+        "repeat": repeat,
+        "min": min(per_call),
+        "median": statistics.median(per_call),
+        "max": max(per_call),
+    }
+
+
+def run(name_filter: Optional[str] = None, repeat: int = 5) -> dict[str, Any]:
+    """Runs every case whose name contains the filter, at every size"""
+    results = []
+    for case in CASES:
+        if name_filter and name_filter not in case.name:
+            continue
+
+        for size in case.sizes:
+            result = run_case(case, size, repeat)
+            print(
+                f"{case.name}[{size}]: {result['min'] * 1e6:.2f} us "
+                f"(median {result['median'] * 1e6:.2f} us)"
+            )
+            results.append(result)
+
+    return {"metadata": machine_metadata(), "results": results}
+
+
+def compare(
+    baseline: dict[str, Any], current: dict[str, Any], threshold: float = 0.1
+) -> list[dict[str, Any]]:
+    """
+    Compares the minimum time per call of each benchmark present in both runs.
+    The minimum is the least affected by noise from the rest of the machine.
+
+    Returns:
+        list[dict]: For each benchmark, the baseline and current times, the
+            ratio between them and whether it slowed down by more than the threshold
+    """
+    baseline_times = {
+        (result["name"], result["size"]): result["min"]
+        for result in baseline["results"]
+    }
+
+    comparisons = []
+    for result in current["results"]:
+        key = (result["name"], result["size"])
+        if key not in baseline_times:
+            continue
+
+        ratio = result["min"] / baseline_times[key]
+        comparisons.append(
+            {
+                "name": result["name"],
+                "size": result["size"],
+                "baseline": baseline_times[key],
+                "current": result["min"],
+                "ratio": ratio,
+                "regression": ratio > 1 + threshold,
+            }
+        )
+
+    return comparisons
+
+
+def main(args: Optional[list[str]] = None) -> int:
+    """Command line entry point, returns the exit code"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the benchmarks")
+    run_parser.add_argument("--output", default="bench_results.json")
+    run_parser.add_argument("--filter", help="Only run benchmarks containing this")
+    run_parser.add_argument("--repeat", type=int, default=5)
+
+    compare_parser = commands.add_parser(
+        "compare", help="Flag regressions against a baseline"
+    )
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Slowdown allowed before flagging a regression, 0.1 is 10%%",
+    )
+
+    options = parser.parse_args(args)
+
+    if options.command == "run":
+        results = run(options.filter, options.repeat)
+        with open(options.output, "w", encoding="utf-8") as output:
+            json.dump(results, output, indent=2)
+
+        print(f"Wrote {len(results['results'])} results to {options.output}")
+        return 0
+
+    with open(options.baseline, encoding="utf-8") as baseline_file:
+        baseline = json.load(baseline_file)
+    with open(options.current, encoding="utf-8") as current_file:
+        current = json.load(current_file)
+
+    comparisons = compare(baseline, current, options.threshold)
+    for comparison in comparisons:
+        flag = "REGRESSION" if comparison["regression"] else "ok"
+        print(
+            f"{comparison['name']}[{comparison['size']}]: "
+            f"{comparison['ratio']:.2f}x baseline {flag}"
+        )
+
+    return 1 if any(comparison["regression"] for comparison in comparisons) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
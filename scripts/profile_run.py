@@ -0,0 +1,85 @@
+"""
+Profiles a map generation or a batch of 2048 games, reporting per-phase
+counters and, with --profile, writing collapsed stacks for a flamegraph.
+
+    python -m scripts.profile_run wfc --size 10 --profile wfc.folded
+    python -m scripts.profile_run 2048 --games 50 --grid-size 6 --profile 2048.folded
+    flamegraph.pl wfc.folded > wfc.svg
+"""
+
+import argparse
+import random
+from typing import Optional
+
+import numpy as np
+
+from src.games.twenty_forty_eight.game import Game, GameConfig, SlideDirection
+from src.tiled_tools.common.grid import Grid, WrapDirection
+from src.tiled_tools.common.profiling import PhaseCounters, Profile
+from src.tiled_tools.map.algorithms import QuantumState, WaveFunctionCollapse
+from src.tiled_tools.map.map import ISLAND_RULESET, TileType
+
+DIRECTIONS = [
+    SlideDirection.UP,
+    SlideDirection.RIGHT,
+    SlideDirection.DOWN,
+    SlideDirection.LEFT,
+]
+
+
+def generate_map(size: int, counters: PhaseCounters):
+    """Collapse a new size x size island map"""
+    states = [[QuantumState(TileType) for _c in range(size)] for _r in range(size)]
+    grid = Grid(states, wrap_direction=WrapDirection.NONE)
+    WaveFunctionCollapse(ISLAND_RULESET, grid, {}, counters=counters).collapse()
+    counters.increment("maps")
+
+
+def play_games(games: int, grid_size: int, counters: PhaseCounters):
+    """Play games to the end with random slides"""
+    config = GameConfig(grid_size=grid_size)
+
+    for _i in range(games):
+        game = Game(config)
+        while game.can_play():
+            game.play_turn(random.choice(DIRECTIONS))
+            counters.increment("slides")
+
+        counters.increment("games")
+
+
+def main(args: Optional[list[str]] = None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--profile", help="Write collapsed stacks to this path")
+    parser.add_argument(
+        "--interval", type=float, default=0.005, help="Seconds between samples"
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    runs = parser.add_subparsers(dest="run", required=True)
+
+    wfc_parser = runs.add_parser("wfc", help="Wave function collapse of an island map")
+    wfc_parser.add_argument("--size", type=int, default=8)
+
+    game_parser = runs.add_parser("2048", help="Games of 2048 with random slides")
+    game_parser.add_argument("--games", type=int, default=10)
+    game_parser.add_argument("--grid-size", type=int, default=4)
+
+    options = parser.parse_args(args)
+    # Games draw tile positions from random and mutations from np.random
+    random.seed(options.seed)
+    np.random.seed(options.seed)
+
+    with Profile(options.profile, options.interval) as profile:
+        if options.run == "wfc":
+            generate_map(options.size, profile.counters)
+        else:
+            play_games(options.games, options.grid_size, profile.counters)
+
+    print(profile.counters.report())
+    if options.profile:
+        print(f"{profile.profiler.samples} samples written to {options.profile}")
+
+
+if __name__ == "__main__":
+    main()
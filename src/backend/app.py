@@ -1,14 +1,22 @@
+import json
 import uuid
 from enum import Enum
 from typing import Optional
 
-from flask import Flask, jsonify, request
+import click
+from flask import Blueprint, Flask, Response, current_app, g, jsonify, request
+from flask.cli import with_appcontext
 from flask_cors import CORS
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import types
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Connection, inspect, text, types, update
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
+from src.backend.concurrency import ConflictCounter, LockStripes
+from src.backend.encoding import GameJSONProvider
+from src.backend.metrics import Metrics, ServerTiming
+from src.backend.spectate import SpectatorHub, encode_event
+from src.backend.startup import StartupTimer
+from src.backend.storage import StorageHelper
 from src.games.twenty_forty_eight.game import (
     Game,
     GameConfig,
@@ -17,10 +25,24 @@ from src.games.twenty_forty_eight.game import (
     SlideResult,
 )
 
-app = Flask(__name__, instance_relative_config=True)
-cors = CORS(app, resources={r"*": {"origins": "*"}})
-
-app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///backend.db"
+# Defaults for every app, any of which can be overridden by environment
+# variables, e.g. FLASK_STORAGE_PROFILE, or by the config given to create_app
+DEFAULT_CONFIG = {
+    "SQLALCHEMY_DATABASE_URI": "sqlite:///backend.db",
+    # Engine tuning, one of storage.STORAGE_PROFILES
+    "STORAGE_PROFILE": "sqlite",
+    # Number of in-process locks slides are striped across, 0 disables them
+    "GAME_LOCK_STRIPES": 64,
+    # Moves between full snapshots of a game, loading replays at most this many
+    "GAME_SNAPSHOT_INTERVAL": 32,
+    # Events buffered per spectator before it is evicted for being too slow
+    "SPECTATOR_BUFFER_SIZE": 64,
+    "SPECTATOR_HEARTBEAT_SECONDS": 15,
+    # Time the phases of each request for /metrics, and optionally the
+    # Server-Timing header, which exposes timings to every client
+    "METRICS_ENABLED": True,
+    "SERVER_TIMING": False,
+}
 
 
 class Base(DeclarativeBase):
@@ -30,7 +52,112 @@ class Base(DeclarativeBase):
 
 
 db = SQLAlchemy(model_class=Base)
-db.init_app(app)
+routes = Blueprint("twenty_forty_eight", __name__)
+
+
+class BackendServices:
+    """
+    State an app shares between its requests, created with the app
+
+    Args:
+        config: The app config
+        startup: Timings of creating the app
+    """
+
+    def __init__(self, config: dict, startup: StartupTimer):
+        self.game_locks = LockStripes(config["GAME_LOCK_STRIPES"])
+        self.spectators = SpectatorHub(
+            config["SPECTATOR_BUFFER_SIZE"], config["SPECTATOR_HEARTBEAT_SECONDS"]
+        )
+        self.metrics = Metrics(config["METRICS_ENABLED"])
+        self.save_conflicts = ConflictCounter()
+        self.startup = startup
+
+
+def services(flask_app: Optional[Flask] = None) -> BackendServices:
+    """The services of an app, by default the app handling the current request"""
+    return (flask_app or current_app).extensions["tiled_games"]
+
+
+def create_app(config: Optional[dict] = None) -> Flask:
+    """
+    Build the backend app. Building it does not touch the database, the
+    schema is created separately with init_db or `flask init-db`
+
+    Args:
+        config: Config overriding the defaults and environment variables
+    """
+    startup = StartupTimer()
+
+    with startup.phase("config"):
+        flask_app = Flask(__name__, instance_relative_config=True)
+        # Encodes games in response bodies straight to JSON, see encoding.py
+        flask_app.json = GameJSONProvider(flask_app)
+        CORS(flask_app, resources={r"*": {"origins": "*"}})
+
+        flask_app.config.from_mapping(DEFAULT_CONFIG)
+        flask_app.config.from_prefixed_env()
+        flask_app.config.from_mapping(config or {})
+
+    with startup.phase("database"):
+        storage_profile = StorageHelper.profile(flask_app.config["STORAGE_PROFILE"])
+        flask_app.config.setdefault(
+            "SQLALCHEMY_ENGINE_OPTIONS",
+            StorageHelper.engine_options(
+                flask_app.config["SQLALCHEMY_DATABASE_URI"], storage_profile
+            ),
+        )
+        db.init_app(flask_app)
+
+        with flask_app.app_context():
+            StorageHelper.apply_pragmas(db.engine, storage_profile)
+
+    with startup.phase("routes"):
+        flask_app.register_blueprint(routes)
+        flask_app.cli.add_command(init_db_command)
+
+    flask_app.extensions["tiled_games"] = BackendServices(flask_app.config, startup)
+
+    return flask_app
+
+
+def create_schema(connection: Connection):
+    """
+    Create any missing tables, and add the version columns to game tables
+    created before games were versioned. Old snapshots hold every move, so
+    their snapshot_version is their version
+    """
+    Base.metadata.create_all(connection)
+
+    game_table = GameModel2048.__tablename__
+    columns = {column["name"] for column in inspect(connection).get_columns(game_table)}
+    for column in ["version", "snapshot_version"]:
+        if column not in columns:
+            connection.execute(
+                text(
+                    f"ALTER TABLE {game_table} "
+                    f"ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0"
+                )
+            )
+
+    if "snapshot_version" not in columns:
+        connection.execute(
+            update(GameModel2048).values(snapshot_version=GameModel2048.version)
+        )
+
+
+def init_db(flask_app: Flask):
+    """Create or upgrade the schema, once before serving"""
+    with flask_app.app_context(), db.engine.begin() as connection:
+        create_schema(connection)
+
+
+@click.command("init-db")
+@with_appcontext
+def init_db_command():
+    """Create any missing tables and columns"""
+    init_db(current_app)
+    click.echo("Created the database tables")
 
 
 class GameErrorCode(Enum):
@@ -38,6 +165,8 @@ class GameErrorCode(Enum):
 
     GAME_NOT_FOUND = 1
     INVALID_GAME_UUID = 2
+    # The game was saved by another request since it was loaded
+    VERSION_CONFLICT = 3
 
 
 class GameError(Exception):
@@ -58,8 +187,27 @@ class GameError(Exception):
 class GameModel2048(db.Model):
     """Model for 2048 game object"""
 
-    id: Mapped[UUID] = mapped_column(types.Uuid, primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(
+        types.Uuid, primary_key=True, default=uuid.uuid4
+    )
     save_string: Mapped[str] = mapped_column(nullable=False)
+    # Incremented on every save, so concurrent saves can be detected
+    version: Mapped[int] = mapped_column(nullable=False, default=0)
+    # Version the save_string snapshot was taken at, later moves are in GameMove2048
+    snapshot_version: Mapped[int] = mapped_column(nullable=False, default=0)
+
+
+class GameMove2048(db.Model):
+    """
+    Append-only log of 2048 moves, seq matching the game version after the move.
+    Holds the random draws of the move so it can be replayed exactly
+    """
+
+    game_id: Mapped[uuid.UUID] = mapped_column(types.Uuid, primary_key=True)
+    seq: Mapped[int] = mapped_column(primary_key=True)
+    direction: Mapped[int] = mapped_column(nullable=False)
+    # JSON list of the tiles spawned, as [c, r, value]
+    spawns: Mapped[str] = mapped_column(nullable=False)
 
 
 class GameObject2048:
@@ -74,6 +222,10 @@ class GameObject2048:
         # so we don't need to worry about them being None
         self.game: Game = None
         self.game_uuid: str = None
+        # Version of the saved game this object was loaded from
+        self.version: int = 0
+        # Moves played since loading, written to the move log on save
+        self.pending_moves: list[tuple[SlideDirection, list]] = []
 
         if config:
             self.config: GameConfig = config
@@ -90,32 +242,76 @@ class GameObject2048:
         """Creates a new game"""
         self.game = Game(self.config)
         self.game_uuid = uuid.uuid4()
+        self.version = 0
+        self.pending_moves = []
         save_string = self.game.to_json()
 
-        with app.app_context():
-            game_model = GameModel2048(id=self.game_uuid, save_string=save_string)
+        with current_app.app_context():
+            game_model = GameModel2048(
+                id=self.game_uuid, save_string=save_string, version=self.version
+            )
             db.session.add(game_model)
             db.session.commit()
 
+    def play_turn(self, direction: SlideDirection) -> SlideResult:
+        """Play a turn, remembering it for the move log"""
+        result = self.game.play_turn(direction)
+        spawns = [] if result == SlideResult.BOARD_FULL else self.game.latest_spawns()
+        self.pending_moves.append((direction, spawns))
+
+        return result
+
     def save_game(self):
         """
-        Saves the game to the database, creating a new entry if one does not exist
+        Appends the moves played since loading to the move log, only if no other
+        request has saved the game since it was loaded (compare-and-swap on the
+        version). The full game is only written every GAME_SNAPSHOT_INTERVAL moves.
+
+        Raises:
+            GameError: VERSION_CONFLICT if the game was saved in the meantime,
+                GAME_NOT_FOUND if it no longer exists
         """
-        with app.app_context():
-            save_string = self.game.to_json()
-            prev_game_model = db.session.execute(
-                db.select(GameModel2048).where(GameModel2048.id == self.game_uuid)
-            ).scalar_one()
+        new_version, values = save_values(
+            self.game,
+            self.version,
+            self.pending_moves,
+            current_app.config["GAME_SNAPSHOT_INTERVAL"],
+        )
 
-            if prev_game_model is None:
-                raise GameError(
-                    GameErrorCode.GAME_NOT_FOUND,
-                    f"Critical Error: {self.game_uuid} invalid while attempting to save game",
+        with current_app.app_context():
+            result = db.session.execute(
+                db.update(GameModel2048)
+                .where(GameModel2048.id == self.game_uuid)
+                .where(GameModel2048.version == self.version)
+                .values(**values)
+            )
+
+            if result.rowcount == 1:
+                db.session.add_all(
+                    move_rows(self.game_uuid, self.version, self.pending_moves)
                 )
+                db.session.commit()
+                self.version = new_version
+                self.pending_moves = []
+                return
 
-            prev_game_model.save_string = save_string
-            db.session.add(prev_game_model)
-            db.session.commit()
+            db.session.rollback()
+
+            exists = db.session.execute(
+                db.select(GameModel2048.id).where(GameModel2048.id == self.game_uuid)
+            ).scalar_one_or_none()
+
+        if exists is None:
+            raise GameError(
+                GameErrorCode.GAME_NOT_FOUND,
+                f"Critical Error: {self.game_uuid} invalid while attempting to save game",
+            )
+
+        services().save_conflicts.increment()
+        raise GameError(
+            GameErrorCode.VERSION_CONFLICT,
+            f"Game {self.game_uuid} was changed by another request, reload and retry",
+        )
 
     def load_game(self):
         """Loads a  game, given the game_uuid"""
@@ -129,10 +325,10 @@ class GameObject2048:
                 GameErrorCode.INVALID_GAME_UUID, f"{self.game_uuid} is not a valid UUID"
             ) from exc
 
-        with app.app_context():
+        with current_app.app_context(), services().metrics.timer("db_load"):
             saved_game: Optional[GameModel2048] = db.session.execute(
                 db.select(GameModel2048).where(GameModel2048.id == game_uuid)
-            ).scalar_one()
+            ).scalar_one_or_none()
 
             if saved_game is None:
                 raise GameError(
@@ -140,12 +336,79 @@ class GameObject2048:
                     f"Game with UUID {self.game_uuid} not found",
                 )
 
-            save_string = saved_game.save_string
+            moves = (
+                db.session.execute(
+                    db.select(GameMove2048)
+                    .where(GameMove2048.game_id == game_uuid)
+                    .where(GameMove2048.seq > saved_game.snapshot_version)
+                    .where(GameMove2048.seq <= saved_game.version)
+                    .order_by(GameMove2048.seq)
+                )
+                .scalars()
+                .all()
+            )
+
+        with services().metrics.timer("game_load"):
+            self.game = replay_moves(GameHelper.load(saved_game.save_string), moves)
 
-            self.game = GameHelper.load(save_string)
+        self.version = saved_game.version
+        self.pending_moves = []
 
 
-@app.route("/perform_slide/v1", methods=["POST"])
+@routes.app_errorhandler(GameError)
+def handle_game_error(error: GameError):
+    """Report game errors as JSON, with a status matching the error"""
+    if error.error_code == GameErrorCode.GAME_NOT_FOUND:
+        return jsonify({"error": error.message}), 404
+
+    if error.error_code == GameErrorCode.VERSION_CONFLICT:
+        return jsonify({"error": error.message}), 409
+
+    return jsonify({"error": error.message}), 400
+
+
+@routes.before_app_request
+def start_server_timing():
+    """Collect the phases timed during the request, if Server-Timing is on"""
+    g.server_timing = current_app.config["SERVER_TIMING"] and services().metrics.enabled
+    if g.server_timing:
+        ServerTiming.start()
+    else:
+        ServerTiming.stop()
+
+
+@routes.after_app_request
+def add_server_timing(response: Response) -> Response:
+    """Report the phases timed during the request in the Server-Timing header"""
+    if g.get("server_timing"):
+        header = ServerTiming.header()
+        if header:
+            response.headers["Server-Timing"] = header
+
+    return response
+
+
+@routes.route("/metrics", methods=["GET"])
+def get_metrics():
+    """
+    Returns the request phase timers and counters, in the Prometheus text format
+    """
+    backend = services()
+    counters = {
+        "save_conflicts": backend.save_conflicts.value,
+        "spectator_evictions": backend.spectators.evictions,
+    }
+    gauges = {"spectators": backend.spectators.spectator_count()}
+    for phase, seconds in backend.startup.phases.items():
+        gauges[f"startup_{phase}_seconds"] = seconds
+
+    return Response(
+        backend.metrics.render(counters, gauges),
+        mimetype="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+@routes.route("/perform_slide/v1", methods=["POST"])
 def perform_slide():
     """
     Perform a slide, given a slide direction and game UUID
@@ -153,113 +416,253 @@ def perform_slide():
     Parameters:
         - slide_direction: The direction to slide the tiles, one of "up", "down", "left", "right" (Representative SlideDirection enum names)
         - game_uuid: The UUID of the game to slide, provided originally when the client created the game
+        - response_mode: (optional) "full" (default) to return the whole game, or "delta" to return only what changed
 
 
     Responses:
         - 200: Slide was successful
         - 400: Bad request, something was probably malformed
+        - 404: No game with the given UUID
+        - 409: The game was changed by a concurrent request, reload and retry
         - 500: Error processing slide
 
     Response JSON:
         - result: The result of the slide, one of "normal" or "game_over"
         - reason: The reason for the result, one of "win", "board_full", "spawn_kill", "spawn_fill".
-        - game: The game state after the slide
+        - game: The game state after the slide, for the "full" response mode
+        - delta: What the slide changed, for the "delta" response mode
+            - changed: The tiles whose value changed, as [c, r, value]
+            - spawn_locations: The tiles spawned by the slide, as [c, r]
+            - score_delta: How much the score increased
+            - checksum: The checksum of the game after the slide, see Game.checksum.
+                If it does not match the client's, fetch the full game from get_game
+    """
+    error, slide_direction, game_uuid = parse_slide_request(request.json)
+
+    if error:
+        return jsonify({"error": error}), 400
+
+    delta = request.json.get("response_mode", "full") == "delta"
+    backend = services()
+
+    # Slides for the same game are serialized within this process,
+    # the versioned save catches any overlap with other processes
+    with backend.game_locks.lock_for(game_uuid):
+        game_object = GameObject2048(game_uuid)
+
+        if not game_object.game.can_play():
+            return jsonify({"error": "Game is over"}), 400
+
+        # Only the delta response mode compares against the previous state
+        previous: Optional[tuple[list[list[int]], int]] = None
+        if delta:
+            previous = (game_object.game.grid_values(), game_object.game.score)
+        with backend.metrics.timer("play_turn"):
+            result: SlideResult = game_object.play_turn(slide_direction)
+        with backend.metrics.timer("can_play"):
+            can_play = game_object.game.can_play()
+
+        with backend.metrics.timer("save_game"):
+            game_object.save_game()
+
+        body, status = slide_response(game_object.game, result, can_play, previous)
+        # Published while locked, so spectators see slides in order
+        publish_slide(
+            backend.spectators, game_object, result, can_play, None if delta else body
+        )
+
+    backend.metrics.increment("slides")
+    with backend.metrics.timer("encode"):
+        response = jsonify(body)
+
+    return response, status
+
+
+def parse_slide_request(
+    body: dict,
+) -> tuple[Optional[str], Optional[SlideDirection], Optional[uuid.UUID]]:
+    """
+    Validate the body of a slide request, returning an error message if it is
+    malformed, otherwise the slide direction and game UUID
     """
-    slide_direction: str = request.json.get("slide_direction")
-    game_uuid: str = request.json.get("game_uuid")
+    slide_direction: str = body.get("slide_direction")
+    game_uuid: str = body.get("game_uuid")
 
     if not slide_direction:
-        return jsonify({"error": "No slide direction provided"}), 400
+        return "No slide direction provided", None, None
 
     if not game_uuid:
-        return jsonify({"error": "No game UUID provided"}), 400
+        return "No game UUID provided", None, None
 
     try:
         game_uuid = uuid.UUID(game_uuid)
     except ValueError:
-        return jsonify({"error": f"{game_uuid} is not a valid UUID"}), 400
+        return f"{game_uuid} is not a valid UUID", None, None
 
     if slide_direction not in ["up", "down", "left", "right"]:
-        return (
-            jsonify({"error": f"{slide_direction} is not a valid slide direction"}),
-            400,
-        )
+        return f"{slide_direction} is not a valid slide direction", None, None
 
-    slide_direction: SlideDirection = SlideDirection[slide_direction.upper()]
-    game_object = GameObject2048(game_uuid)
+    response_mode = body.get("response_mode", "full")
+    if response_mode not in ["full", "delta"]:
+        return f"{response_mode} is not a valid response mode", None, None
 
-    if not game_object.game.can_play():
-        return jsonify({"error": "Game is over"}), 400
-
-    result: SlideResult = game_object.game.play_turn(slide_direction)
-    can_play = game_object.game.can_play()
-    game_object.save_game()
-
-    win_score = game_object.game.config.win_tile_value
-    if game_object.game.get_highest_tile() >= win_score:
-        return (
-            jsonify(
-                {
-                    "result": "game_over",
-                    "reason": "win",
-                    "game": game_object.game.to_dict(),
-                }
-            ),
-            200,
-        )
+    return None, SlideDirection[slide_direction.upper()], game_uuid
+
+
+def slide_response(
+    game: Game,
+    result: SlideResult,
+    can_play: bool,
+    previous: Optional[tuple[list[list[int]], int]] = None,
+):
+    """
+    Build the response body and status for a slide that was just played,
+    shared by every server implementation so the responses stay identical.
+    If the grid values and score from before the slide are given, only
+    the delta is returned instead of the whole game.
+    """
+    state = slide_state(game, result, previous)
+
+    win_score = game.config.win_tile_value
+    if game.get_highest_tile() >= win_score:
+        return {"result": "game_over", "reason": "win", **state}, 200
 
     if not can_play:
-        return (
-            jsonify(
-                {
-                    "result": "game_over",
-                    "reason": "board_full",
-                    "game": game_object.game.to_dict(),
-                }
-            ),
-            200,
-        )
+        return {"result": "game_over", "reason": "board_full", **state}, 200
 
     if result in [SlideResult.NORMAL, SlideResult.SPAWN_FILL]:
-        return (
-            jsonify(
-                {
-                    "result": "normal",
-                    "reason": result.name,
-                    "game": game_object.game.to_dict(),
-                }
-            ),
-            200,
-        )
+        return {"result": "normal", "reason": result.name, **state}, 200
 
     if result in [SlideResult.BOARD_FULL, SlideResult.SPAWN_KILL]:
-        if game_object.game.config.spawn_kill:
-            return (
-                jsonify(
-                    {
-                        "result": "game_over",
-                        "reason": result.name,
-                        "game": game_object.game.to_dict(),
-                    }
-                ),
-                200,
-            )
-        else:
-            return (
-                jsonify(
-                    {
-                        "result": "normal",
-                        "reason": result.name,
-                        "game": game_object.game.to_dict(),
-                    }
-                ),
-                200,
-            )
+        if game.config.spawn_kill:
+            return {"result": "game_over", "reason": result.name, **state}, 200
+
+        return {"result": "normal", "reason": result.name, **state}, 200
 
-    return jsonify({"error": "Could not resolve slide result"}), 500
+    return {"error": "Could not resolve slide result"}, 500
+
+
+def publish_slide(
+    hub: SpectatorHub,
+    game_object,
+    result: SlideResult,
+    can_play: bool,
+    body: Optional[dict] = None,
+):
+    """
+    Send a saved slide to the game's spectators, as the full slide response
+    plus the game version. The response body is reused if it is a full one
+    """
+    if not hub.has_subscribers(game_object.game_uuid):
+        return
+
+    if body is None:
+        body, _status = slide_response(game_object.game, result, can_play)
+
+    hub.publish(
+        game_object.game_uuid, "slide", {"version": game_object.version, **body}
+    )
+
+
+def parse_game_uuid(game_uuid: str) -> tuple[Optional[str], Optional[uuid.UUID]]:
+    """
+    Validate a game UUID query parameter, returning an error message
+    if it is malformed, otherwise the UUID
+    """
+    if not game_uuid:
+        return "No game UUID provided", None
+
+    try:
+        return None, uuid.UUID(game_uuid)
+    except ValueError:
+        return f"{game_uuid} is not a valid UUID", None
+
+
+def slide_state(
+    game: Game,
+    result: SlideResult,
+    previous: Optional[tuple[list[list[int]], int]],
+) -> dict:
+    """
+    Returns the game part of a slide response, the whole game or only the
+    delta from the previous grid values and score. The game is left for
+    GameJSONProvider to encode
+    """
+    if previous is None:
+        return {"game": game}
 
+    previous_grid, previous_score = previous
+    spawns = [] if result == SlideResult.BOARD_FULL else game.latest_spawn_locations
 
-@app.route("/create_game/v1", methods=["GET", "POST"])
+    return {
+        "delta": {
+            "changed": game.changed_tiles(previous_grid),
+            "spawn_locations": spawns,
+            "score_delta": game.score - previous_score,
+            "checksum": game.checksum(),
+        }
+    }
+
+
+def save_values(
+    game: Game, version: int, moves: list[tuple[SlideDirection, list]], interval: int
+) -> tuple[int, dict]:
+    """
+    Returns the version after saving the given moves, and the game row values
+    to write. A snapshot is included when the moves reach the next multiple of
+    the interval, or when there are no moves to log
+    """
+    new_version = version + max(len(moves), 1)
+    values = {"version": new_version}
+
+    if not moves or new_version // interval > version // interval:
+        values["save_string"] = game.to_json()
+        values["snapshot_version"] = new_version
+
+    return new_version, values
+
+
+def move_rows(
+    game_uuid: uuid.UUID, version: int, moves: list[tuple[SlideDirection, list]]
+) -> list[GameMove2048]:
+    """Builds the move log rows for moves played after the given version"""
+    return [
+        GameMove2048(
+            game_id=game_uuid,
+            seq=version + i + 1,
+            direction=direction.value,
+            spawns=json.dumps(spawns),
+        )
+        for i, (direction, spawns) in enumerate(moves)
+    ]
+
+
+def replay_moves(game: Game, moves) -> Game:
+    """Replays logged moves, in order, on top of a snapshot"""
+    for move in moves:
+        game.play_turn(SlideDirection(move.direction), json.loads(move.spawns))
+
+    return game
+
+
+def config_from_request(body: dict) -> GameConfig:
+    """
+    Build a game config from the body of a create game request,
+    using the standard 2048 defaults for any missing field
+    """
+    return GameConfig(
+        grid_size=body.get("grid_size", 4),
+        spawn_tile_count=body.get("spawn_tile_count", 2),
+        starting_tile_count=body.get("starting_tile_count", 2),
+        win_tile_value=body.get("win_tile_value", 2048),
+        mutation_probability=body.get("mutation_probability", 0.1),
+        mutation_at_start=body.get("mutation_at_start", True),
+        spawn_kill=body.get("spawn_kill", False),
+        root_tile_value=body.get("root_tile_value", 2),
+    )
+
+
+@routes.route("/create_game/v1", methods=["GET", "POST"])
 def create_game():
     """
     Creates a new game, provided the desired config fields. Each field
@@ -283,38 +686,18 @@ def create_game():
         - game_uuid: The UUID of the game that was created
         - game: The game state after the slide
     """
-    grid_size: int = request.json.get("grid_size", 4)
-    spawn_tile_count: int = request.json.get("spawn_tile_count", 2)
-    starting_tile_count: int = request.json.get("starting_tile_count", 2)
-    win_tile_value: int = request.json.get("win_tile_value", 2048)
-    mutation_probability: float = request.json.get("mutation_probability", 0.1)
-    mutation_at_start: bool = request.json.get("mutation_at_start", True)
-    spawn_kill: bool = request.json.get("spawn_kill", False)
-    root_tile_value: int = request.json.get("root_tile_value", 2)
-
-    game_config = GameConfig(
-        grid_size=grid_size,
-        spawn_tile_count=spawn_tile_count,
-        starting_tile_count=starting_tile_count,
-        win_tile_value=win_tile_value,
-        mutation_probability=mutation_probability,
-        mutation_at_start=mutation_at_start,
-        spawn_kill=spawn_kill,
-        root_tile_value=root_tile_value,
-    )
+    game_config = config_from_request(request.json)
 
     game_object = GameObject2048(config=game_config)
     game_object.create_new_game()
 
     return (
-        jsonify(
-            {"game_uuid": game_object.game_uuid, "game": game_object.game.to_dict()}
-        ),
+        jsonify({"game_uuid": game_object.game_uuid, "game": game_object.game}),
         200,
     )
 
 
-@app.route("/get_game/v1", methods=["GET"])
+@routes.route("/get_game/v1", methods=["GET"])
 def get_game():
     """
     Returns the game state, given a game UUID
@@ -325,23 +708,70 @@ def get_game():
     Responses:
         - 200: Game was retrieved successfully
         - 400: Bad request, something was probably malformed
+        - 404: No game with the given UUID
 
     Response JSON:
         - game: The game state
     """
-    game_uuid: str = request.args.get("game_uuid", type=str, default="")
-
-    if not game_uuid:
-        return jsonify({"error": "No game UUID provided"}), 400
+    error, game_uuid = parse_game_uuid(
+        request.args.get("game_uuid", type=str, default="")
+    )
 
-    try:
-        game_uuid = uuid.UUID(game_uuid)
-    except ValueError:
-        return jsonify({"error": f"{game_uuid} is not a valid UUID"}), 400
+    if error:
+        return jsonify({"error": error}), 400
 
     game_object = GameObject2048(game_uuid)
-    return jsonify({"game": game_object.game.to_dict()}), 200
+    return jsonify({"game": game_object.game}), 200
+
+
+@routes.route("/spectate_game/v1", methods=["GET"])
+def spectate_game():
+    """
+    Streams a game as server-sent events, given a game UUID. Slides are only
+    streamed from the server process that played them
 
+    Parameters:
+        - game_uuid: The UUID of the game to spectate
 
-with app.app_context():
-    db.create_all()
+    Responses:
+        - 200: An event stream
+        - 400: Bad request, something was probably malformed
+        - 404: No game with the given UUID
+
+    Events:
+        - game: Sent first, {"version": ..., "game": ...} with the current game
+        - slide: {"version": ..., ...} with the perform_slide response JSON.
+            Slides with a version no newer than the game event can be ignored
+        - evicted: Sent last if the spectator fell too far behind, reconnect to resume
+        - Heartbeat comments are sent while the game is idle
+    """
+    error, game_uuid = parse_game_uuid(
+        request.args.get("game_uuid", type=str, default="")
+    )
+
+    if error:
+        return jsonify({"error": error}), 400
+
+    # Streamed outside the app context, so the hub is looked up now
+    spectators = services().spectators
+    # Subscribe before loading so no slide is missed in between
+    subscription = spectators.subscribe(game_uuid)
+    try:
+        game_object = GameObject2048(game_uuid)
+    except Exception:
+        spectators.unsubscribe(game_uuid, subscription)
+        raise
+
+    def stream():
+        try:
+            yield encode_event(
+                "game",
+                {"version": game_object.version, "game": game_object.game},
+            )
+            yield from subscription.frames()
+        finally:
+            spectators.unsubscribe(game_uuid, subscription)
+
+    return Response(
+        stream(), mimetype="text/event-stream", headers={"Cache-Control": "no-cache"}
+    )
@@ -0,0 +1,423 @@
+"""
+An ASGI version of the 2048 backend, serving the same endpoints as app.py
+with the same request and response JSON, but with async database access so
+a slow write does not hold up every other request on the worker.
+
+Run with any ASGI server, e.g. `hypercorn src.backend.asgi_app:app`
+"""
+
+import asyncio
+import uuid
+from typing import Optional
+
+from quart import Quart, Response, g, jsonify, request
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from src.backend.app import (
+    GameError,
+    GameErrorCode,
+    GameModel2048,
+    GameMove2048,
+    config_from_request,
+    create_schema,
+    move_rows,
+    parse_game_uuid,
+    parse_slide_request,
+    publish_slide,
+    replay_moves,
+    save_values,
+    slide_response,
+)
+from src.backend.concurrency import ConflictCounter, LockStripes
+from src.backend.encoding import GameJSONProvider
+from src.backend.metrics import Metrics, ServerTiming
+from src.backend.spectate import SpectatorHub, encode_event
+from src.backend.storage import StorageHelper, StorageProfile
+from src.games.twenty_forty_eight.game import (
+    Game,
+    GameConfig,
+    GameHelper,
+    SlideDirection,
+    SlideResult,
+)
+
+app = Quart(__name__)
+app.json = GameJSONProvider(app)
+# Relative SQLite paths are in the instance folder, the same database as app.py
+app.config["ASYNC_DATABASE_URI"] = "sqlite+aiosqlite:///backend.db"
+app.config["STORAGE_PROFILE"] = "sqlite"
+app.config["GAME_LOCK_STRIPES"] = 64
+app.config["GAME_SNAPSHOT_INTERVAL"] = 32
+app.config["SPECTATOR_BUFFER_SIZE"] = 64
+app.config["SPECTATOR_HEARTBEAT_SECONDS"] = 15
+app.config["METRICS_ENABLED"] = True
+app.config["SERVER_TIMING"] = False
+app.config.from_prefixed_env("QUART")
+
+metrics = Metrics(app.config["METRICS_ENABLED"])
+
+
+class AsyncDatabase:
+    """
+    Holds the async engine and session factory, created when the app starts
+    serving so the database URI can still be changed before then
+    """
+
+    def __init__(self):
+        self.engine: Optional[AsyncEngine] = None
+        self.session_factory: Optional[async_sessionmaker[AsyncSession]] = None
+        self.game_locks = LockStripes(0)
+        self.spectators = SpectatorHub()
+        self.save_conflicts = ConflictCounter()
+
+    async def connect(
+        self,
+        database_uri: str,
+        lock_stripes: int = 0,
+        spectators: Optional[SpectatorHub] = None,
+        storage_profile: Optional[StorageProfile] = None,
+    ):
+        """Create the engine, game locks, spectator hub and any missing schema"""
+        # Created here so the locks belong to the serving event loop
+        self.game_locks = LockStripes(lock_stripes, asyncio.Lock)
+        self.spectators = spectators or SpectatorHub()
+
+        storage_profile = storage_profile or StorageProfile()
+        self.engine = create_async_engine(
+            database_uri, **StorageHelper.engine_options(database_uri, storage_profile)
+        )
+        StorageHelper.apply_pragmas(self.engine.sync_engine, storage_profile)
+        self.session_factory = async_sessionmaker(self.engine, expire_on_commit=False)
+
+        async with self.engine.begin() as connection:
+            await connection.run_sync(create_schema)
+
+    async def disconnect(self):
+        """Close every pooled connection"""
+        if self.engine is not None:
+            await self.engine.dispose()
+
+        self.engine = None
+        self.session_factory = None
+
+    def session(self) -> AsyncSession:
+        """Start a new session"""
+        return self.session_factory()
+
+
+async_db = AsyncDatabase()
+
+
+@app.before_serving
+async def connect_database():
+    """Connect to the database before the first request"""
+    await async_db.connect(
+        StorageHelper.instance_uri(app.config["ASYNC_DATABASE_URI"], app.instance_path),
+        app.config["GAME_LOCK_STRIPES"],
+        SpectatorHub(
+            app.config["SPECTATOR_BUFFER_SIZE"],
+            app.config["SPECTATOR_HEARTBEAT_SECONDS"],
+        ),
+        StorageHelper.profile(app.config["STORAGE_PROFILE"]),
+    )
+
+
+@app.after_serving
+async def disconnect_database():
+    """Release database connections on shutdown"""
+    await async_db.disconnect()
+
+
+class AsyncGameObject2048:
+    """
+    Async counterpart to GameObject2048. Loading and creating need to await
+    the database, so they are class methods rather than part of the constructor
+    """
+
+    def __init__(self, game_uuid: uuid.UUID, game: Game, version: int = 0):
+        self.game_uuid = game_uuid
+        self.game = game
+        # Version of the saved game this object was loaded from
+        self.version = version
+        # Moves played since loading, written to the move log on save
+        self.pending_moves: list[tuple[SlideDirection, list]] = []
+
+    @classmethod
+    async def create(cls, config: GameConfig) -> "AsyncGameObject2048":
+        """Creates and saves a new game"""
+        game_object = cls(uuid.uuid4(), Game(config))
+
+        async with async_db.session() as session:
+            session.add(
+                GameModel2048(
+                    id=game_object.game_uuid,
+                    save_string=game_object.game.to_json(),
+                    version=game_object.version,
+                )
+            )
+            await session.commit()
+
+        return game_object
+
+    @classmethod
+    async def load(cls, game_uuid: uuid.UUID) -> "AsyncGameObject2048":
+        """Loads a game, given the game_uuid"""
+        async with async_db.session() as session:
+            with metrics.timer("db_load"):
+                saved_game: Optional[GameModel2048] = (
+                    await session.execute(
+                        select(GameModel2048).where(GameModel2048.id == game_uuid)
+                    )
+                ).scalar_one_or_none()
+
+                if saved_game is None:
+                    raise GameError(
+                        GameErrorCode.GAME_NOT_FOUND,
+                        f"Game with UUID {game_uuid} not found",
+                    )
+
+                moves = (
+                    (
+                        await session.execute(
+                            select(GameMove2048)
+                            .where(GameMove2048.game_id == game_uuid)
+                            .where(GameMove2048.seq > saved_game.snapshot_version)
+                            .where(GameMove2048.seq <= saved_game.version)
+                            .order_by(GameMove2048.seq)
+                        )
+                    )
+                    .scalars()
+                    .all()
+                )
+
+        with metrics.timer("game_load"):
+            game = replay_moves(GameHelper.load(saved_game.save_string), moves)
+
+        return cls(game_uuid, game, saved_game.version)
+
+    def play_turn(self, direction: SlideDirection) -> SlideResult:
+        """Play a turn, remembering it for the move log"""
+        result = self.game.play_turn(direction)
+        spawns = [] if result == SlideResult.BOARD_FULL else self.game.latest_spawns()
+        self.pending_moves.append((direction, spawns))
+
+        return result
+
+    async def save_game(self):
+        """
+        Appends the moves played since loading to the move log, only if no other
+        request has saved the game since it was loaded (compare-and-swap on the
+        version). See GameObject2048.save_game
+        """
+        new_version, values = save_values(
+            self.game,
+            self.version,
+            self.pending_moves,
+            app.config["GAME_SNAPSHOT_INTERVAL"],
+        )
+
+        async with async_db.session() as session:
+            result = await session.execute(
+                update(GameModel2048)
+                .where(GameModel2048.id == self.game_uuid)
+                .where(GameModel2048.version == self.version)
+                .values(**values)
+            )
+
+            if result.rowcount == 1:
+                session.add_all(
+                    move_rows(self.game_uuid, self.version, self.pending_moves)
+                )
+                await session.commit()
+                self.version = new_version
+                self.pending_moves = []
+                return
+
+            await session.rollback()
+
+            saved_game = await session.get(GameModel2048, self.game_uuid)
+
+        if saved_game is None:
+            raise GameError(
+                GameErrorCode.GAME_NOT_FOUND,
+                f"Critical Error: {self.game_uuid} invalid while attempting to save game",
+            )
+
+        async_db.save_conflicts.increment()
+        raise GameError(
+            GameErrorCode.VERSION_CONFLICT,
+            f"Game {self.game_uuid} was changed by another request, reload and retry",
+        )
+
+
+@app.errorhandler(GameError)
+async def handle_game_error(error: GameError):
+    """Report game errors as JSON, with a status matching the error"""
+    if error.error_code == GameErrorCode.GAME_NOT_FOUND:
+        return jsonify({"error": error.message}), 404
+
+    if error.error_code == GameErrorCode.VERSION_CONFLICT:
+        return jsonify({"error": error.message}), 409
+
+    return jsonify({"error": error.message}), 400
+
+
+@app.before_request
+async def start_server_timing():
+    """Collect the phases timed during the request, if Server-Timing is on"""
+    g.server_timing = app.config["SERVER_TIMING"] and metrics.enabled
+    if g.server_timing:
+        ServerTiming.start()
+    else:
+        ServerTiming.stop()
+
+
+@app.after_request
+async def add_server_timing(response: Response) -> Response:
+    """Report the phases timed during the request in the Server-Timing header"""
+    if g.get("server_timing"):
+        header = ServerTiming.header()
+        if header:
+            response.headers["Server-Timing"] = header
+
+    return response
+
+
+@app.route("/metrics", methods=["GET"])
+async def get_metrics():
+    """
+    Returns the request phase timers and counters, in the Prometheus text format
+    """
+    spectators = async_db.spectators
+    counters = {
+        "save_conflicts": async_db.save_conflicts.value,
+        "spectator_evictions": spectators.evictions,
+    }
+    gauges = {"spectators": spectators.spectator_count()}
+
+    return Response(
+        metrics.render(counters, gauges),
+        mimetype="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+@app.route("/perform_slide/v1", methods=["POST"])
+async def perform_slide():
+    """
+    Perform a slide, given a slide direction and game UUID. See
+    the perform_slide endpoint in app.py for the request and response format.
+    """
+    body = await request.get_json()
+    error, slide_direction, game_uuid = parse_slide_request(body)
+
+    if error:
+        return jsonify({"error": error}), 400
+
+    delta = body.get("response_mode", "full") == "delta"
+
+    async with async_db.game_locks.lock_for(game_uuid):
+        game_object = await AsyncGameObject2048.load(game_uuid)
+
+        if not game_object.game.can_play():
+            return jsonify({"error": "Game is over"}), 400
+
+        # Only the delta response mode compares against the previous state
+        previous: Optional[tuple[list[list[int]], int]] = None
+        if delta:
+            previous = (game_object.game.grid_values(), game_object.game.score)
+        with metrics.timer("play_turn"):
+            result = game_object.play_turn(slide_direction)
+        with metrics.timer("can_play"):
+            can_play = game_object.game.can_play()
+        with metrics.timer("save_game"):
+            await game_object.save_game()
+
+        body, status = slide_response(game_object.game, result, can_play, previous)
+        publish_slide(
+            async_db.spectators, game_object, result, can_play, None if delta else body
+        )
+
+    metrics.increment("slides")
+    with metrics.timer("encode"):
+        response = jsonify(body)
+
+    return response, status
+
+
+@app.route("/create_game/v1", methods=["GET", "POST"])
+async def create_game():
+    """
+    Creates a new game, provided the desired config fields. See
+    the create_game endpoint in app.py for the request and response format.
+    """
+    game_config = config_from_request(await request.get_json())
+    game_object = await AsyncGameObject2048.create(game_config)
+
+    return (
+        jsonify({"game_uuid": game_object.game_uuid, "game": game_object.game}),
+        200,
+    )
+
+
+@app.route("/get_game/v1", methods=["GET"])
+async def get_game():
+    """
+    Returns the game state, given a game UUID. See
+    the get_game endpoint in app.py for the request and response format.
+    """
+    error, game_uuid = parse_game_uuid(
+        request.args.get("game_uuid", type=str, default="")
+    )
+
+    if error:
+        return jsonify({"error": error}), 400
+
+    game_object = await AsyncGameObject2048.load(game_uuid)
+    return jsonify({"game": game_object.game}), 200
+
+
+@app.route("/spectate_game/v1", methods=["GET"])
+async def spectate_game():
+    """
+    Streams a game as server-sent events, given a game UUID. See
+    the spectate_game endpoint in app.py for the request and event format.
+    """
+    error, game_uuid = parse_game_uuid(
+        request.args.get("game_uuid", type=str, default="")
+    )
+
+    if error:
+        return jsonify({"error": error}), 400
+
+    spectators = async_db.spectators
+    # Subscribe before loading so no slide is missed in between
+    subscription = spectators.subscribe(game_uuid, asynchronous=True)
+    try:
+        game_object = await AsyncGameObject2048.load(game_uuid)
+    except GameError:
+        spectators.unsubscribe(game_uuid, subscription)
+        raise
+
+    async def stream():
+        try:
+            yield encode_event(
+                "game",
+                {"version": game_object.version, "game": game_object.game},
+            )
+            async for frame in subscription.async_frames():
+                yield frame
+        finally:
+            spectators.unsubscribe(game_uuid, subscription)
+
+    response = await app.make_response(
+        (stream(), 200, {"Content-Type": "text/event-stream"})
+    )
+    response.headers["Cache-Control"] = "no-cache"
+    response.timeout = None
+    return response
@@ -0,0 +1,78 @@
+"""
+Helpers for playing the same game from many threads or workers at once,
+without a single lock serializing the whole backend.
+"""
+
+import threading
+import uuid
+from typing import Any, Callable
+
+
+class NoLock:
+    """
+    Stands in for a lock when locking is disabled, usable with both
+    with and async with
+    """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_args):
+        return False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_args):
+        return False
+
+
+class LockStripes:
+    """
+    A fixed pool of locks shared between games, each game always mapping to
+    the same lock. Slides for one game are serialized, while slides for
+    games on different stripes run in parallel. Only covers one process,
+    saves are still compare-and-swap to catch conflicts between workers.
+
+    Args:
+        stripes: The number of locks, 0 disables locking entirely
+        lock_factory: Creates each lock, e.g. asyncio.Lock for async servers.
+            Defaults to threading.Lock
+    """
+
+    def __init__(self, stripes: int = 64, lock_factory: Callable[[], Any] = None):
+        lock_factory = lock_factory or threading.Lock
+        self.locks = [lock_factory() for _i in range(stripes)]
+
+    def lock_for(self, game_uuid: uuid.UUID):
+        """
+        Returns the lock for a game, or a no-op context if striping is disabled
+        """
+        if not self.locks:
+            return NoLock()
+
+        return self.locks[game_uuid.int % len(self.locks)]
+
+    def __len__(self):
+        return len(self.locks)
+
+
+class ConflictCounter:
+    """
+    Thread safe count of saves rejected because another request
+    saved the same game first
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def increment(self):
+        """Record a conflict"""
+        with self.lock:
+            self.count += 1
+
+    @property
+    def value(self) -> int:
+        """The number of conflicts so far"""
+        return self.count
@@ -0,0 +1,180 @@
+"""
+Fast JSON encoding of game state for responses. Games are encoded straight
+from their tiles, without building Game.to_dict and walking it again, and
+the config part is encoded once per distinct config. The output is the same
+as jsonify of the dicts, byte for byte: sorted keys and compact separators.
+
+Response bodies hold Game objects where they hold game state, and the apps
+install GameJSONProvider so jsonify encodes them this way:
+
+    app.json = GameJSONProvider(app)
+    return jsonify({"game": game_object.game})
+"""
+
+import json
+import uuid
+from enum import Enum
+from functools import lru_cache
+from typing import Any
+
+from flask.json.provider import DefaultJSONProvider
+
+from src.games.twenty_forty_eight.game import Game, GameConfig
+
+# Configs come from requests, so only the most recent ones are kept
+CONFIG_CACHE_SIZE = 256
+# Rows repeat a lot, within a board and across boards, so encoded rows are
+# kept until there are this many, then dropped all at once
+ROW_CACHE_SIZE = 65536
+
+# Only rows of ints are cached, as 2 and 2.0 are equal keys but encode
+# differently
+_encoded_rows: dict[tuple, str] = {}
+_SPAWN_RESULTS = {True: "true", False: "false", None: "null"}
+
+
+@lru_cache(maxsize=CONFIG_CACHE_SIZE)
+def _encode_config(fields: tuple[tuple[str, type, Any], ...]) -> str:
+    return json.dumps(
+        {name: value for name, _type, value in fields},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+
+
+def _encode_rows(rows: list[tuple]) -> str:
+    encoded = []
+    for row in rows:
+        # Any float or other number makes the sum one, much faster than
+        # checking every type. Tile values are never bools
+        if type(sum(row)) is not int:  # pylint: disable=unidiomatic-typecheck
+            encoded.append("[" + ",".join(map(GameEncoder.encode, row)) + "]")
+            continue
+
+        row_json = _encoded_rows.get(row)
+        if row_json is None:
+            if len(_encoded_rows) >= ROW_CACHE_SIZE:
+                _encoded_rows.clear()
+
+            row_json = "[" + ",".join(map(GameEncoder.encode, row)) + "]"
+            _encoded_rows[row] = row_json
+
+        encoded.append(row_json)
+
+    return "[" + ",".join(encoded) + "]"
+
+
+class GameEncoder:
+    """
+    Encodes game state to compact JSON with sorted keys, the way the apps'
+    jsonify does
+    """
+
+    @staticmethod
+    def encode_config(config: GameConfig) -> str:
+        """The config as JSON, cached per distinct config"""
+        # Typed, as 0 and 0.0 are equal keys but encode differently
+        return _encode_config(
+            tuple((name, type(value), value) for name, value in config.__dict__.items())
+        )
+
+    @staticmethod
+    def encode_enum(value: Enum) -> str:
+        """Enums are encoded by name, like slide results in responses"""
+        return json.dumps(value.name)
+
+    @staticmethod
+    def encode_game(game: Game) -> str:
+        """The game as JSON, the same as encoding Game.to_dict"""
+        # tolist hands back the tiles much faster than iterating the array,
+        # and a list comprehension is faster than a generator here
+        # pylint: disable=consider-using-generator
+        rows = [
+            tuple([tile.value for tile in row]) for row in game.grid.get_grid().tolist()
+        ]
+        movement = [tuple(row) for row in game.movement_matrix]
+        spawn_locations = [tuple(location) for location in game.latest_spawn_locations]
+
+        spawn_result = game.latest_spawn_result
+        if isinstance(spawn_result, Enum):
+            spawn_result_json = GameEncoder.encode_enum(spawn_result)
+        else:
+            spawn_result_json = _SPAWN_RESULTS[spawn_result]
+
+        return (
+            f'{{"config":{GameEncoder.encode_config(game.config)},'
+            f'"grid":{_encode_rows(rows)},'
+            f'"latest_spawn_locations":{_encode_rows(spawn_locations)},'
+            f'"latest_spawn_result":{spawn_result_json},'
+            f'"movement_matrix":{_encode_rows(movement)},'
+            f'"score":{GameEncoder.encode(game.score)}}}'
+        )
+
+    @staticmethod
+    def encode(value: Any) -> str:  # pylint: disable=too-many-return-statements
+        """
+        Any JSON value as JSON, encoding games with encode_game and enums
+        by name. Other values are encoded like jsonify
+        """
+        if type(value) is int:  # pylint: disable=unidiomatic-typecheck
+            # Most values are tile values and scores, bool is left to json
+            return str(value)
+
+        if isinstance(value, Game):
+            return GameEncoder.encode_game(value)
+
+        if isinstance(value, dict):
+            return (
+                "{"
+                + ",".join(
+                    f"{json.dumps(str(key))}:{GameEncoder.encode(value[key])}"
+                    for key in sorted(value)
+                )
+                + "}"
+            )
+
+        if isinstance(value, (list, tuple)):
+            return "[" + ",".join(GameEncoder.encode(item) for item in value) + "]"
+
+        if isinstance(value, Enum):
+            return GameEncoder.encode_enum(value)
+
+        if isinstance(value, uuid.UUID):
+            return f'"{value}"'
+
+        return json.dumps(
+            value,
+            sort_keys=True,
+            separators=(",", ":"),
+            default=GameJSONProvider.default,
+        )
+
+
+class GameJSONProvider(DefaultJSONProvider):
+    """
+    The default JSON provider, but encoding with GameEncoder when the output
+    is compact, which it is unless the app is in debug mode
+    """
+
+    @staticmethod
+    def default(o: Any) -> Any:
+        """Values the json module cannot encode, as ones it can"""
+        if isinstance(o, Game):
+            return o.to_dict()
+
+        if isinstance(o, Enum):
+            return o.name
+
+        return DefaultJSONProvider.default(o)
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if (
+            kwargs.get("separators") == (",", ":")
+            and "indent" not in kwargs
+            and self.sort_keys
+            and self.ensure_ascii
+        ):
+            return GameEncoder.encode(obj)
+
+        kwargs.setdefault("default", self.default)
+        return super().dumps(obj, **kwargs)
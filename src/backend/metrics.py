@@ -0,0 +1,175 @@
+"""
+Lightweight timers and counters for the backends, rendered in the Prometheus
+text format for a /metrics endpoint. Timers can also be collected per request,
+for a Server-Timing header.
+
+When disabled, timers and counters do nothing beyond a flag check, so they
+can be left in the hot paths.
+"""
+
+import threading
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+# Phases timed during the current request, when Server-Timing is on
+_request_timings: ContextVar[Optional[list[tuple[str, float]]]] = ContextVar(
+    "request_timings", default=None
+)
+
+
+class _NullTimer:
+    """Stands in for a timer when metrics are disabled"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_args):
+        return False
+
+
+NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    """Times a block, recording it to the metrics and any request timings"""
+
+    __slots__ = ("metrics", "phase", "start")
+
+    def __init__(self, metrics: "Metrics", phase: str):
+        self.metrics = metrics
+        self.phase = phase
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *_args):
+        self.metrics.observe(self.phase, time.perf_counter() - self.start)
+        return False
+
+
+class Metrics:
+    """
+    Named phase timers and counters
+
+    Args:
+        enabled: Whether to record anything
+        namespace: Prefix of every metric name
+    """
+
+    def __init__(self, enabled: bool = True, namespace: str = "tiled_games"):
+        self.enabled = enabled
+        self.namespace = namespace
+        # Phase to [count, total seconds]
+        self.timers: dict[str, list] = {}
+        self.counters: dict[str, int] = {}
+        self.lock = threading.Lock()
+
+    def timer(self, phase: str):
+        """
+        Returns a context manager timing a phase, e.g.
+
+            with metrics.timer("play_turn"):
+                game.play_turn(direction)
+        """
+        if not self.enabled:
+            return NULL_TIMER
+
+        return _Timer(self, phase)
+
+    def observe(self, phase: str, seconds: float):
+        """Record that a phase took some number of seconds"""
+        if not self.enabled:
+            return
+
+        with self.lock:
+            timer = self.timers.setdefault(phase, [0, 0.0])
+            timer[0] += 1
+            timer[1] += seconds
+
+        timings = _request_timings.get()
+        if timings is not None:
+            timings.append((phase, seconds))
+
+    def increment(self, counter: str, amount: int = 1):
+        """Increase a counter"""
+        if not self.enabled:
+            return
+
+        with self.lock:
+            self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def reset(self):
+        """Forget every timer and counter"""
+        with self.lock:
+            self.timers = {}
+            self.counters = {}
+
+    def render(
+        self,
+        counters: Optional[dict[str, int]] = None,
+        gauges: Optional[dict[str, float]] = None,
+    ) -> str:
+        """
+        Render every timer and counter in the Prometheus text format. Timers
+        are a summary of seconds labelled by phase, counters are suffixed
+        with _total. Extra counters and gauges are values kept elsewhere,
+        sampled when rendering
+        """
+        name = f"{self.namespace}_phase_seconds"
+        lines = [
+            f"# HELP {name} Time spent in each phase of a request",
+            f"# TYPE {name} summary",
+        ]
+
+        with self.lock:
+            timers = sorted(self.timers.items())
+            counters = sorted({**self.counters, **(counters or {})}.items())
+
+        for phase, (count, total) in timers:
+            lines.append(f'{name}_sum{{phase="{phase}"}} {total:.9f}')
+            lines.append(f'{name}_count{{phase="{phase}"}} {count}')
+
+        for counter, value in counters:
+            lines.append(f"# TYPE {self.namespace}_{counter}_total counter")
+            lines.append(f"{self.namespace}_{counter}_total {value}")
+
+        for gauge, value in sorted((gauges or {}).items()):
+            lines.append(f"# TYPE {self.namespace}_{gauge} gauge")
+            lines.append(f"{self.namespace}_{gauge} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+class ServerTiming:
+    """
+    Collects the phases timed during a request, for the Server-Timing header
+    """
+
+    @staticmethod
+    def start():
+        """Start collecting timings for the current request"""
+        _request_timings.set([])
+
+    @staticmethod
+    def stop():
+        """Stop collecting timings, dropping any collected"""
+        _request_timings.set(None)
+
+    @staticmethod
+    def header() -> Optional[str]:
+        """
+        Stop collecting, returning the Server-Timing header value if
+        anything was timed. Durations are in milliseconds
+        """
+        timings = _request_timings.get()
+        ServerTiming.stop()
+
+        if not timings:
+            return None
+
+        return ", ".join(
+            f"{phase};dur={seconds * 1000:.3f}" for phase, seconds in timings
+        )
@@ -0,0 +1,351 @@
+"""
+Serving the backend from several worker processes. The app is built, its
+schema created and its caches warmed once, then the workers are forked from
+it and share those pages. A local dispatcher in front of them sends every
+request for a game to the same worker, picked by hashing the game UUID, so
+the game's lock and spectators stay in one process:
+
+    python -m src.backend.prefork --workers 4 --port 5001
+
+Requests without a game UUID, like create_game and metrics, go to the
+workers in turn. Each worker keeps its own metrics, and the dispatcher adds
+the worker that served a request as the X-Worker header. Workers are not
+restarted, if one exits the launcher stops, leaving restarts to whatever
+supervises it.
+"""
+
+import argparse
+import hashlib
+import http.client
+import itertools
+import json
+import os
+import signal
+import socket
+import sys
+import threading
+import traceback
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlsplit
+
+from flask import Flask
+from werkzeug.serving import make_server
+
+from src.backend.app import create_app, db, init_db
+from src.backend.encoding import GameEncoder
+from src.backend.startup import StartupTimer, preload
+from src.games.twenty_forty_eight.game import Game, GameConfig
+
+# Headers about one connection, which are not passed on to the other side
+HOP_HEADERS = {
+    "connection",
+    "keep-alive",
+    "proxy-connection",
+    "te",
+    "trailer",
+    "transfer-encoding",
+    "upgrade",
+}
+# Bytes copied at a time from a worker's response, sent as soon as they are
+# read so streamed responses like spectate_game are not held back
+CHUNK_SIZE = 65536
+
+
+class WorkerAffinity:
+    """
+    Picks the worker for each request, the same one for every request for
+    a game
+
+    Args:
+        workers: The number of workers
+    """
+
+    def __init__(self, workers: int):
+        assert workers > 0, "At least one worker is needed"
+        self.workers = workers
+        self._turns = itertools.count()
+
+    def worker_for(self, game_uuid: Optional[uuid.UUID]) -> int:
+        """The worker for a game, or the next worker in turn without one"""
+        if game_uuid is None:
+            return next(self._turns) % self.workers
+
+        # Hashed, as UUIDs from clients need not be random
+        digest = hashlib.blake2b(game_uuid.bytes, digest_size=8).digest()
+        return int.from_bytes(digest, "little") % self.workers
+
+    @staticmethod
+    def game_uuid_of(path: str, content_type: str, body: bytes) -> Optional[uuid.UUID]:
+        """
+        The game UUID a request is for, from the game_uuid query parameter
+        or JSON body. None when there is none, or it is malformed, in
+        which case whichever worker gets the request rejects it
+        """
+        game_uuid = parse_qs(urlsplit(path).query).get("game_uuid", [None])[0]
+
+        if game_uuid is None and body and content_type.startswith("application/json"):
+            try:
+                request_json = json.loads(body)
+            except ValueError:
+                return None
+
+            if isinstance(request_json, dict):
+                game_uuid = request_json.get("game_uuid")
+
+        if not isinstance(game_uuid, str):
+            return None
+
+        try:
+            return uuid.UUID(game_uuid)
+        except ValueError:
+            return None
+
+
+class DispatchHandler(BaseHTTPRequestHandler):
+    """
+    Passes a request on to the worker for its game, and the response back.
+    Connections are closed after each response, so streamed responses need
+    no length
+    """
+
+    server: "Dispatcher"
+
+    def dispatch(self):
+        """Forward the request and copy back the response as it arrives"""
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+
+        game_uuid = WorkerAffinity.game_uuid_of(
+            self.path, self.headers.get("Content-Type", ""), body
+        )
+        worker = self.server.affinity.worker_for(game_uuid)
+
+        headers = {
+            name: value
+            for name, value in self.headers.items()
+            if name.lower() not in HOP_HEADERS
+        }
+        connection = http.client.HTTPConnection(
+            self.server.host, self.server.worker_ports[worker]
+        )
+        try:
+            connection.request(self.command, self.path, body, headers)
+            response = connection.getresponse()
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            self.send_error(502, f"Worker {worker} is not responding")
+            return
+
+        try:
+            # The worker's own Server and Date headers are passed on
+            self.send_response_only(response.status, response.reason)
+            for name, value in response.getheaders():
+                if name.lower() not in HOP_HEADERS:
+                    self.send_header(name, value)
+            self.send_header("X-Worker", str(worker))
+            self.end_headers()
+
+            while chunk := response.read1(CHUNK_SIZE):
+                self.wfile.write(chunk)
+                self.wfile.flush()
+        except (OSError, http.client.HTTPException):
+            # The client or worker went away mid-response, e.g. a spectator
+            # closing the stream, so there is no one left to tell
+            pass
+        finally:
+            connection.close()
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_OPTIONS = dispatch
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """The workers log requests, the dispatcher does not repeat them"""
+
+
+class Dispatcher(ThreadingHTTPServer):
+    """
+    The local HTTP server in front of the workers
+
+    Args:
+        address: The host and port to serve on
+        host: The host the workers serve on
+        worker_ports: The port of each worker
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], host: str, worker_ports: list[int]):
+        super().__init__(address, DispatchHandler)
+        self.host = host
+        self.worker_ports = worker_ports
+        self.affinity = WorkerAffinity(len(worker_ports))
+
+
+class WorkerPool:
+    """
+    Worker processes forked from a built app, each serving it on its own
+    port. The sockets are bound before forking, so the workers accept
+    requests as soon as they are started
+
+    Args:
+        app: The app to serve
+        workers: The number of workers
+        host: The host the workers serve on, only the dispatcher needs to
+            reach them
+    """
+
+    def __init__(self, app: Flask, workers: int, host: str = "127.0.0.1"):
+        assert hasattr(os, "fork"), "Forking workers is not supported here"
+        assert workers > 0, "At least one worker is needed"
+        self.app = app
+        self.host = host
+        self.sockets: list[socket.socket] = []
+        for _worker in range(workers):
+            self.sockets.append(socket.create_server((host, 0)))
+
+        self.ports = [worker_socket.getsockname()[1] for worker_socket in self.sockets]
+        self.pids: list[int] = []
+
+    def start(self):
+        """Fork the workers, before the calling process starts any threads"""
+        # Connections opened so far must not be shared with the workers
+        with self.app.app_context():
+            db.engine.dispose()
+
+        for worker_socket in self.sockets:
+            pid = os.fork()
+            if pid == 0:
+                self._serve(worker_socket)
+
+            self.pids.append(pid)
+
+    def _serve(self, worker_socket: socket.socket):
+        """Serve the app from a worker, never returning"""
+        try:
+            # Stopped by the launcher, even on Ctrl-C
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+            server = make_server(
+                self.host,
+                worker_socket.getsockname()[1],
+                self.app,
+                threaded=True,
+                fd=worker_socket.fileno(),
+            )
+            server.serve_forever()
+        except BaseException:  # pylint: disable=broad-exception-caught
+            traceback.print_exc()
+        finally:
+            # Serving only ends on errors, and the worker must not carry on
+            # running the launcher's code
+            os._exit(1)  # pylint: disable=protected-access
+
+    def wait(self) -> tuple[int, int]:
+        """Wait for any worker to exit, returning its pid and exit status"""
+        pid, status = os.wait()
+        if pid in self.pids:
+            self.pids.remove(pid)
+
+        return pid, os.waitstatus_to_exitcode(status)
+
+    def stop(self):
+        """Stop the workers still running and wait for them"""
+        for pid in self.pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+        for pid in self.pids:
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+
+        self.pids = []
+        for worker_socket in self.sockets:
+            worker_socket.close()
+
+
+def warm_up(app: Flask, timer: Optional[StartupTimer] = None):
+    """
+    Do the work every worker would otherwise repeat on its first requests,
+    so the workers are forked with it done
+    """
+    timer = timer or StartupTimer()
+    preload(timer)
+
+    with timer.phase("init_db"):
+        init_db(app)
+
+    with timer.phase("warm_up"):
+        # Builds a game, filling the encoding caches for the default config
+        GameEncoder.encode_game(Game(GameConfig()))
+
+
+def serve(
+    app: Flask,
+    workers: int,
+    host: str = "127.0.0.1",
+    port: int = 5001,
+) -> int:
+    """
+    Warm the app up, fork the workers and dispatch requests to them until
+    interrupted or a worker exits. Returns the exit status for the launcher
+    """
+    timer = StartupTimer()
+    warm_up(app, timer)
+
+    pool = WorkerPool(app, workers)
+    pool.start()
+
+    dispatcher = Dispatcher((host, port), pool.host, pool.ports)
+    dispatch_thread = threading.Thread(target=dispatcher.serve_forever, daemon=True)
+    dispatch_thread.start()
+    print(timer.report(), file=sys.stderr)
+    print(
+        f"Dispatching to {workers} workers on http://{host}:{dispatcher.server_port}",
+        file=sys.stderr,
+    )
+
+    def terminate(_signum, _frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, terminate)
+    status = 0
+    try:
+        pid, exit_code = pool.wait()
+        print(f"Worker {pid} exited with {exit_code}, stopping", file=sys.stderr)
+        status = 1
+    except KeyboardInterrupt:
+        pass
+    finally:
+        # Signals sent to the whole process group arrive more than once
+        signal.signal(signal.SIGTERM, signal.SIG_IGN)
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        dispatcher.shutdown()
+        dispatcher.server_close()
+        pool.stop()
+
+    return status
+
+
+def main(args: Optional[list[str]] = None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes, by default one per core",
+    )
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=5001)
+    options = parser.parse_args(args)
+
+    sys.exit(serve(create_app(), options.workers, options.host, options.port))
+
+
+if __name__ == "__main__":
+    main()
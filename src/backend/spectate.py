@@ -0,0 +1,179 @@
+"""
+Live spectating of games over server-sent events. Each slide is encoded once
+and fanned out to every spectator of the game, rather than every spectator
+polling get_game and loading the game from the database.
+
+Spectators only see slides played by the same process, so every request
+for a game should be routed to the same worker.
+"""
+
+import asyncio
+import queue
+import threading
+import uuid
+from typing import AsyncIterator, Iterator, Optional, Union
+
+from src.backend.encoding import GameEncoder
+
+HEARTBEAT = ": heartbeat\n\n"
+EVICTED = "event: evicted\ndata: {}\n\n"
+
+
+def encode_event(event: str, data: dict) -> str:
+    """Encode a server-sent event frame, with the same JSON as responses"""
+    return f"event: {event}\ndata: {GameEncoder.encode(data)}\n\n"
+
+
+class Subscription:
+    """
+    A spectator of one game, buffering events until they are sent. If the
+    buffer fills up the spectator is too slow, and is evicted by the hub
+
+    Args:
+        buffer_size: The most events held for the spectator
+        heartbeat: Seconds without an event before sending a heartbeat
+    """
+
+    def __init__(self, buffer_size: int, heartbeat: float):
+        self.events: queue.Queue = queue.Queue(buffer_size)
+        self.heartbeat = heartbeat
+        self.evicted = False
+
+    def offer(self, frame: str) -> bool:
+        """Buffer an event, returning false if the buffer is full"""
+        try:
+            self.events.put_nowait(frame)
+        except queue.Full:
+            return False
+
+        return True
+
+    def frames(self) -> Iterator[str]:
+        """
+        Yields event frames as they arrive, and heartbeats while idle,
+        until the spectator is evicted
+        """
+        while not self.evicted:
+            try:
+                yield self.events.get(timeout=self.heartbeat)
+            except queue.Empty:
+                yield HEARTBEAT
+
+        yield EVICTED
+
+
+class AsyncSubscription(Subscription):
+    """
+    A Subscription for async servers, which must only be used from the
+    event loop it was created on
+    """
+
+    # pylint: disable=super-init-not-called
+    def __init__(self, buffer_size: int, heartbeat: float):
+        self.events: asyncio.Queue = asyncio.Queue(buffer_size)
+        self.heartbeat = heartbeat
+        self.evicted = False
+
+    def offer(self, frame: str) -> bool:
+        try:
+            self.events.put_nowait(frame)
+        except asyncio.QueueFull:
+            return False
+
+        return True
+
+    async def async_frames(self) -> AsyncIterator[str]:
+        """See Subscription.frames"""
+        while not self.evicted:
+            try:
+                yield await asyncio.wait_for(self.events.get(), self.heartbeat)
+            except asyncio.TimeoutError:
+                yield HEARTBEAT
+
+        yield EVICTED
+
+
+class SpectatorHub:
+    """
+    Fans events for each game out to its spectators
+
+    Args:
+        buffer_size: The most events buffered per spectator before it is evicted
+        heartbeat: Seconds without an event before a spectator gets a heartbeat
+    """
+
+    def __init__(self, buffer_size: int = 64, heartbeat: float = 15):
+        self.buffer_size = buffer_size
+        self.heartbeat = heartbeat
+        self.subscriptions: dict[uuid.UUID, list[Subscription]] = {}
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def subscribe(
+        self, game_uuid: uuid.UUID, asynchronous: bool = False
+    ) -> Union[Subscription, AsyncSubscription]:
+        """Start spectating a game"""
+        subscription_type = AsyncSubscription if asynchronous else Subscription
+        subscription = subscription_type(self.buffer_size, self.heartbeat)
+
+        with self.lock:
+            self.subscriptions.setdefault(game_uuid, []).append(subscription)
+
+        return subscription
+
+    def unsubscribe(self, game_uuid: uuid.UUID, subscription: Subscription):
+        """Stop spectating a game, if the subscription was not already evicted"""
+        with self.lock:
+            subscriptions = self.subscriptions.get(game_uuid, [])
+            if subscription in subscriptions:
+                subscriptions.remove(subscription)
+
+            if not subscriptions:
+                self.subscriptions.pop(game_uuid, None)
+
+    def has_subscribers(self, game_uuid: uuid.UUID) -> bool:
+        """Whether anyone is spectating a game, to skip building unwanted events"""
+        return game_uuid in self.subscriptions
+
+    def publish(self, game_uuid: uuid.UUID, event: str, data: dict) -> int:
+        """
+        Send an event to every spectator of a game, encoding it only once.
+        Spectators whose buffer is full are evicted.
+
+        Returns:
+            int: The number of spectators the event was sent to
+        """
+        with self.lock:
+            subscriptions = list(self.subscriptions.get(game_uuid, []))
+
+        if not subscriptions:
+            return 0
+
+        frame = encode_event(event, data)
+        slow: list[Subscription] = []
+        for subscription in subscriptions:
+            if not subscription.offer(frame):
+                slow.append(subscription)
+
+        for subscription in slow:
+            self.evict(game_uuid, subscription)
+
+        return len(subscriptions) - len(slow)
+
+    def evict(self, game_uuid: uuid.UUID, subscription: Subscription):
+        """Drop a spectator that cannot keep up"""
+        subscription.evicted = True
+        self.unsubscribe(game_uuid, subscription)
+
+        with self.lock:
+            self.evictions += 1
+
+    def spectator_count(self, game_uuid: Optional[uuid.UUID] = None) -> int:
+        """The number of spectators of a game, or of every game"""
+        with self.lock:
+            if game_uuid is not None:
+                return len(self.subscriptions.get(game_uuid, []))
+
+            return sum(
+                len(subscriptions) for subscriptions in self.subscriptions.values()
+            )
@@ -0,0 +1,121 @@
+"""
+Startup timing for the backends. create_app records how long each step of
+building the app takes, and the subsystems the backend imports can be timed
+one at a time from a fresh interpreter:
+
+    python -m src.backend.startup
+
+Heavy modules only some requests need, like NumPy for playing games, are
+imported on first use. Servers forking workers after loading the app can
+preload them first, so every worker shares the pages instead.
+"""
+
+import argparse
+import importlib
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+# Imported in this order, so each is timed without the ones before it
+SUBSYSTEMS: list[tuple[str, list[str]]] = [
+    ("web", ["flask", "flask_cors"]),
+    ("database", ["sqlalchemy", "flask_sqlalchemy"]),
+    ("games", ["src.games.twenty_forty_eight.game"]),
+    ("backend", ["src.backend.app"]),
+    ("numpy", ["numpy", "src.tiled_tools.common.grid"]),
+]
+
+# Imported on first use rather than when the backend is imported
+LAZY_MODULES = ["numpy", "src.tiled_tools.common.grid"]
+
+
+class StartupTimer:
+    """
+    Seconds spent in each named phase of starting up, in the order the
+    phases first ran
+    """
+
+    def __init__(self):
+        self.phases: dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a block as a phase, adding to any earlier time of the phase"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.phases[name] = self.phases.get(name, 0.0) + elapsed
+
+    def import_modules(self, name: str, modules: list[str]):
+        """Import modules as a phase. Modules already imported cost nothing"""
+        with self.phase(name):
+            for module in modules:
+                importlib.import_module(module)
+
+    def total(self) -> float:
+        """Seconds spent in every phase"""
+        return sum(self.phases.values())
+
+    def report(self) -> str:
+        """A line per phase, with its time in milliseconds"""
+        width = max((len(name) for name in self.phases), default=0)
+        lines = [
+            f"{name:<{width}} {seconds * 1000:8.1f} ms"
+            for name, seconds in self.phases.items()
+        ]
+        lines.append(f"{'total':<{width}} {self.total() * 1000:8.1f} ms")
+
+        return "\n".join(lines)
+
+
+def preload(timer: Optional[StartupTimer] = None):
+    """
+    Import the modules the backend otherwise imports on first use. Call
+    before forking workers, so they are imported once and shared
+    """
+    timer = timer or StartupTimer()
+    timer.import_modules("preload", LAZY_MODULES)
+
+
+def measure_startup(
+    subsystems: Optional[list[tuple[str, list[str]]]] = None,
+    init_schema: bool = False,
+) -> StartupTimer:
+    """
+    Time importing each subsystem, then building the Flask app and, if asked,
+    creating the schema. Only meaningful in a fresh interpreter
+    """
+    timer = StartupTimer()
+    for name, modules in subsystems or SUBSYSTEMS:
+        timer.import_modules(name, modules)
+
+    # Imported by name, as the backend imports this module for StartupTimer
+    backend = importlib.import_module("src.backend.app")
+
+    # create_app times its own phases
+    app = backend.create_app()
+    for name, seconds in backend.services(app).startup.phases.items():
+        timer.phases[f"create_app.{name}"] = seconds
+
+    if init_schema:
+        with timer.phase("init_db"):
+            backend.init_db(app)
+
+    return timer
+
+
+def main(args: Optional[list[str]] = None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--init-db", action="store_true", help="Also time creating the schema"
+    )
+    options = parser.parse_args(args)
+
+    print(measure_startup(init_schema=options.init_db).report())
+
+
+if __name__ == "__main__":
+    main()
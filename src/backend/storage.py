@@ -0,0 +1,175 @@
+"""
+Database engine tuning for the backends. A storage profile holds the pool
+sizing, SQLite pragmas and statement caching for an engine, picked by name
+from the app config along with the database URI, e.g.
+
+    FLASK_SQLALCHEMY_DATABASE_URI=postgresql+psycopg2://... FLASK_STORAGE_PROFILE=postgres
+"""
+
+import os
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from sqlalchemy import Engine, event
+from sqlalchemy.engine import make_url
+
+
+# pylint: disable=too-many-instance-attributes
+@dataclass
+class StorageProfile:
+    """
+    Engine settings for one kind of deployment. SQLite pragma settings are
+    ignored for other databases, None leaves the database default in place
+    """
+
+    # Connections kept open, and extra connections allowed under load
+    pool_size: int = 5
+    max_overflow: int = 10
+    # Seconds to wait for a connection before failing
+    pool_timeout: float = 30
+    # Seconds before a connection is replaced, -1 to never replace them
+    pool_recycle: int = -1
+    # Check connections are alive before use, for databases behind a network
+    pool_pre_ping: bool = False
+    # Compiled SQL kept by SQLAlchemy and, where the driver supports it,
+    # prepared statements kept per connection
+    statement_cache_size: int = 500
+    # WAL lets readers carry on while a slide is written
+    journal_mode: Optional[str] = "WAL"
+    # NORMAL is safe with WAL, only the last commits can be lost on power loss
+    synchronous: Optional[str] = "NORMAL"
+    mmap_size: Optional[int] = 2**28
+    # Milliseconds a connection waits on a locked database before failing
+    busy_timeout: Optional[int] = 5000
+    extra_engine_options: dict[str, Any] = field(default_factory=dict)
+
+
+STORAGE_PROFILES: dict[str, StorageProfile] = {
+    "sqlite": StorageProfile(),
+    # Every commit reaches the disk before returning
+    "sqlite_durable": StorageProfile(synchronous="FULL"),
+    # The SQLite defaults, as before profiles existed
+    "sqlite_default": StorageProfile(
+        journal_mode=None, synchronous=None, mmap_size=None, busy_timeout=None
+    ),
+    "postgres": StorageProfile(
+        pool_size=10,
+        max_overflow=20,
+        pool_recycle=1800,
+        pool_pre_ping=True,
+        journal_mode=None,
+        synchronous=None,
+        mmap_size=None,
+        busy_timeout=None,
+    ),
+}
+
+
+class StorageHelper:
+    """
+    Methods for configuring engines from a storage profile
+    """
+
+    @staticmethod
+    def profile(name: str) -> StorageProfile:
+        """Returns the storage profile with the given name"""
+        assert name in STORAGE_PROFILES, f"Unknown storage profile {name}"
+        return STORAGE_PROFILES[name]
+
+    @staticmethod
+    def engine_options(database_uri: str, profile: StorageProfile) -> dict[str, Any]:
+        """
+        Returns the create_engine keyword arguments for a database and profile,
+        usable as SQLALCHEMY_ENGINE_OPTIONS
+        """
+        url = make_url(database_uri)
+        options: dict[str, Any] = {"query_cache_size": profile.statement_cache_size}
+        connect_args: dict[str, Any] = {}
+
+        if url.get_backend_name() == "sqlite":
+            connect_args["cached_statements"] = profile.statement_cache_size
+        elif url.get_driver_name() == "asyncpg":
+            connect_args["statement_cache_size"] = profile.statement_cache_size
+
+        # In memory SQLite databases share a single connection, so have no pool
+        if not StorageHelper.is_memory_database(database_uri):
+            options.update(
+                pool_size=profile.pool_size,
+                max_overflow=profile.max_overflow,
+                pool_timeout=profile.pool_timeout,
+                pool_recycle=profile.pool_recycle,
+                pool_pre_ping=profile.pool_pre_ping,
+            )
+
+        if connect_args:
+            options["connect_args"] = connect_args
+
+        options.update(profile.extra_engine_options)
+        return options
+
+    @staticmethod
+    def is_memory_database(database_uri: str) -> bool:
+        """Whether the URI is for an in memory SQLite database"""
+        url = make_url(database_uri)
+        return url.get_backend_name() == "sqlite" and url.database in (
+            None,
+            "",
+            ":memory:",
+        )
+
+    @staticmethod
+    def instance_uri(database_uri: str, instance_path: str) -> str:
+        """
+        Returns the URI with a relative SQLite path made relative to the app's
+        instance folder, creating the folder, as Flask-SQLAlchemy does for
+        app.py. Other URIs are returned unchanged
+        """
+        url = make_url(database_uri)
+        if (
+            url.get_backend_name() != "sqlite"
+            or StorageHelper.is_memory_database(database_uri)
+            or url.database.startswith("file:")
+            or os.path.isabs(url.database)
+        ):
+            return database_uri
+
+        os.makedirs(instance_path, exist_ok=True)
+        return url.set(
+            database=os.path.join(instance_path, url.database)
+        ).render_as_string(hide_password=False)
+
+    @staticmethod
+    def pragmas(profile: StorageProfile) -> list[str]:
+        """Returns the SQLite pragma statements for a profile"""
+        settings = {
+            "journal_mode": profile.journal_mode,
+            "synchronous": profile.synchronous,
+            "mmap_size": profile.mmap_size,
+            "busy_timeout": profile.busy_timeout,
+        }
+
+        return [
+            f"PRAGMA {name}={value}"
+            for name, value in settings.items()
+            if value is not None
+        ]
+
+    @staticmethod
+    def apply_pragmas(engine: Engine, profile: StorageProfile):
+        """
+        Runs the profile's pragmas on every new connection of a SQLite engine,
+        does nothing for other databases. For async engines pass engine.sync_engine
+        """
+        if engine.dialect.name != "sqlite":
+            return
+
+        pragmas = StorageHelper.pragmas(profile)
+        if not pragmas:
+            return
+
+        @event.listens_for(engine, "connect")
+        def set_pragmas(dbapi_connection, _connection_record):
+            cursor = dbapi_connection.cursor()
+            for pragma in pragmas:
+                cursor.execute(pragma)
+            cursor.close()
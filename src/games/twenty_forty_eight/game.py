@@ -7,16 +7,19 @@ filling the board.
 Original: https://play2048.co/
 """
 
+import hashlib
 import json
 import random
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Optional
-
-import numpy as np
+from typing import TYPE_CHECKING, Any, Optional
 
 from src.tiled_tools.common.custom_typing import AnyNumber, is_numeric
-from src.tiled_tools.common.grid import Grid
+
+# NumPy, through Grid, is imported when the first game is built, so code
+# only parsing configs or directions starts without it
+if TYPE_CHECKING:
+    from src.tiled_tools.common.grid import Grid
 
 
 # pylint: disable=too-many-instance-attributes
@@ -121,7 +124,7 @@ class TileHelper:
     """
 
     @staticmethod
-    def build_grid_with_value(value: int, size: int) -> Grid:
+    def build_grid_with_value(value: int, size: int) -> "Grid":
         """
         Builds a grid of tiles with a given value
 
@@ -132,6 +135,9 @@ class TileHelper:
         Returns:
             Grid: A grid of tiles with the given value
         """
+        # pylint: disable-next=import-outside-toplevel
+        from src.tiled_tools.common.grid import Grid
+
         tiles = [
             [Tile(value=value, momentum=SlideDirection.NONE) for _i in range(size)]
             for _j in range(size)
@@ -241,9 +247,18 @@ class Game:
         self.init_mode = False
         self.latest_spawn_locations = spawn_locations
 
-    def play_turn(self, direction: SlideDirection) -> SlideResult:
+    def play_turn(
+        self,
+        direction: SlideDirection,
+        spawns: Optional[list[tuple[int, int, int]]] = None,
+    ) -> SlideResult:
         """
         Play a turn of the game, returning the result of the turn
+
+        Args:
+            direction: The direction to slide the tiles
+            spawns: Tiles to spawn as (c, r, value) instead of random ones,
+                used to replay a turn recorded with latest_spawns
         """
         self.slide_tiles(direction)
 
@@ -251,7 +266,10 @@ class Game:
         if self.board_full():
             return SlideResult.BOARD_FULL
 
-        spawn_result = self.spawn_new_tiles()
+        if spawns is None:
+            spawn_result = self.spawn_new_tiles()
+        else:
+            spawn_result = self.place_spawns(spawns)
         self.latest_spawn_result = spawn_result
         if not spawn_result:
             if self.config.spawn_kill:
@@ -404,6 +422,27 @@ class Game:
 
         return spawned_all
 
+    def place_spawns(self, spawns: list[tuple[int, int, int]]) -> bool:
+        """
+        Places previously spawned tiles, given as (c, r, value). Returns
+        true if every tile the config asks for was placed, like spawn_new_tiles
+        """
+        self.latest_spawn_locations = []
+        for c, r, value in spawns:
+            self.grid.set(c, r, Tile(value=value))
+            self.latest_spawn_locations.append((c, r))
+
+        return len(spawns) == self.config.spawn_tile_count
+
+    def latest_spawns(self) -> list[tuple[int, int, int]]:
+        """
+        Returns the tiles spawned by the latest turn as (c, r, value),
+        enough to replay the turn without the random draws
+        """
+        return [
+            (c, r, self.grid.get(c, r).value) for c, r in self.latest_spawn_locations
+        ]
+
     def board_full(self):
         """
         Checks if the board is full
@@ -481,6 +520,8 @@ class Game:
         Returns the value of the new tile, either the root tile value or
         its square, depending on the mutation probability
         """
+        import numpy as np  # pylint: disable=import-outside-toplevel
+
         root_tile_value = self.config.root_tile_value
         should_mutate = np.random.rand() < self.config.mutation_probability
         mutated_value = root_tile_value * root_tile_value
@@ -499,13 +540,42 @@ class Game:
         """
         return json.dumps(self.to_dict())
 
+    def grid_values(self) -> list[list[int]]:
+        """
+        Returns the tile values of the grid, row by row
+        """
+        return [[tile.value for tile in row] for row in self.grid.tolist()]
+
+    def changed_tiles(self, previous: list[list[int]]) -> list[tuple[int, int, int]]:
+        """
+        Returns the tiles whose value differs from a previous grid_values,
+        as (c, r, value)
+        """
+        return [
+            (c, r, value)
+            for r, row in enumerate(self.grid_values())
+            for c, value in enumerate(row)
+            if value != previous[r][c]
+        ]
+
+    def checksum(self) -> str:
+        """
+        Returns a short checksum of the grid and score, so a client applying
+        deltas can tell it is out of sync. The first 16 hex digits of the
+        SHA-256 of the compact json of {"grid": grid, "score": score}
+        """
+        state = json.dumps(
+            {"grid": self.grid_values(), "score": self.score}, separators=(",", ":")
+        )
+        return hashlib.sha256(state.encode()).hexdigest()[:16]
+
     def to_dict(self) -> dict[str, Any]:
         """
         Converts the game to a dict
         """
         return {
             "config": self.config.__dict__,
-            "grid": [[tile.value for tile in row] for row in self.grid.tolist()],
+            "grid": self.grid_values(),
             "score": self.score,
             "movement_matrix": self.movement_matrix,
             "latest_spawn_result": self.latest_spawn_result,
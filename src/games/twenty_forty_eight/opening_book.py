@@ -0,0 +1,487 @@
+# pylint: disable=too-few-public-methods
+"""
+Opening books for 2048. The first plies of every game are the most explored,
+so they are searched once offline for a config and the best move of each
+canonical board is written to a hash table on disk. The table is memory
+mapped, so processes share it through the OS cache and a lookup is a hash
+and a probe or two:
+
+    python -m src.games.twenty_forty_eight.opening_book --config '{"grid_size": 4}' \\
+        --plies 2 --depth 2 --output 4x4.book
+
+    book = OpeningBook.open("4x4.book")
+    direction = book.lookup(game.grid_values())
+    if direction is None:
+        search = BoardSearch(game.config)
+        direction = search.best_move(search.encode(game.grid_values()), depth=2)
+
+The book follows its own moves, branching on every spawn, so it covers every
+board a player following the book can reach in the first plies.
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import random
+import sys
+import time
+from typing import Iterator, Optional, Union
+
+import numpy as np
+
+from src.games.twenty_forty_eight.game import Game, GameConfig, SlideDirection
+from src.games.twenty_forty_eight.simulate import DIRECTIONS, CornerPolicy, Policy
+from src.games.twenty_forty_eight.symmetry import SymmetryHelper
+
+BOOK_FILE_MAGIC = b"TILEDBOOK\x01"
+BOOK_FILE_ALIGNMENT = 64
+# Tables are at most half full, so probes stay short
+BOOK_LOAD_FACTOR = 0.5
+
+# Boards are tuples of tile codes, row by row: 0 for empty and k for a tile
+# of root_tile_value ** k
+Board = tuple[int, ...]
+
+
+class BoardSearch:
+    """
+    Expectimax search over boards of tile codes, following the rules of Game:
+    every direction can be played, even one moving nothing, and every turn
+    spawns spawn_tile_count tiles one after another
+
+    Args:
+        config: The config of the games searched
+    """
+
+    def __init__(self, config: GameConfig):
+        self.config = config
+        self.size = config.grid_size
+        # Flat indexes of each row or column, from the edge tiles slide towards
+        self.lines = self._build_lines(config.grid_size)
+        self._line_cache: dict[Board, tuple[Board, int]] = {}
+        self._value_cache: dict[tuple[Board, int], float] = {}
+
+    @staticmethod
+    def _build_lines(size: int) -> dict[SlideDirection, list[list[int]]]:
+        rows = [[r * size + c for c in range(size)] for r in range(size)]
+        columns = [[r * size + c for r in range(size)] for c in range(size)]
+
+        return {
+            SlideDirection.LEFT: rows,
+            SlideDirection.RIGHT: [row[::-1] for row in rows],
+            SlideDirection.UP: columns,
+            SlideDirection.DOWN: [column[::-1] for column in columns],
+        }
+
+    def encode(self, values: list[list[int]]) -> Optional[Board]:
+        """The board of tile values, or None if a value is not a power of the root"""
+        root = self.config.root_tile_value
+        codes = []
+        for row in values:
+            for value in row:
+                if value == 0:
+                    codes.append(0)
+                    continue
+
+                code = round(math.log(value, root))
+                if code < 1 or root**code != value:
+                    return None
+
+                codes.append(code)
+
+        return tuple(codes)
+
+    def decode(self, board: Board) -> list[list[int]]:
+        """The tile values of a board, row by row"""
+        root = self.config.root_tile_value
+        values = [root**code if code else 0 for code in board]
+
+        return [values[r * self.size : (r + 1) * self.size] for r in range(self.size)]
+
+    def _slide_line(self, line: Board) -> tuple[Board, int]:
+        cached = self._line_cache.get(line)
+        if cached is not None:
+            return cached
+
+        tiles = [code for code in line if code]
+        slid = []
+        gained = 0
+        i = 0
+        while i < len(tiles):
+            if i + 1 < len(tiles) and tiles[i] == tiles[i + 1]:
+                slid.append(tiles[i] + 1)
+                gained += self.config.root_tile_value ** (tiles[i] + 1)
+                i += 2
+            else:
+                slid.append(tiles[i])
+                i += 1
+
+        result = (tuple(slid + [0] * (len(line) - len(slid))), gained)
+        self._line_cache[line] = result
+
+        return result
+
+    def slide(self, board: Board, direction: SlideDirection) -> tuple[Board, int]:
+        """The board after sliding, and the score gained"""
+        slid = list(board)
+        gained = 0
+        for line in self.lines[direction]:
+            new_line, line_gained = self._slide_line(tuple(board[i] for i in line))
+            gained += line_gained
+            for i, code in zip(line, new_line):
+                slid[i] = code
+
+        return tuple(slid), gained
+
+    def spawn_codes(self, starting: bool = False) -> list[tuple[int, float]]:
+        """The codes a new tile may have, with their probabilities"""
+        mutation = self.config.mutation_probability
+        if starting and not self.config.mutation_at_start:
+            mutation = 0
+
+        return [(code, p) for code, p in [(1, 1 - mutation), (2, mutation)] if p > 0]
+
+    def spawn_outcomes(
+        self, board: Board, count: int, starting: bool = False
+    ) -> Iterator[tuple[Board, float, bool]]:
+        """
+        Every board after spawning count tiles one after another, with its
+        probability, and whether every tile could be placed. Equal boards
+        reached in different orders are yielded separately
+        """
+        if count == 0:
+            yield board, 1.0, True
+            return
+
+        empty = [i for i, code in enumerate(board) if code == 0]
+        if not empty:
+            yield board, 1.0, False
+            return
+
+        for i in empty:
+            for code, p in self.spawn_codes(starting):
+                spawned = board[:i] + (code,) + board[i + 1 :]
+                for outcome, q, placed in self.spawn_outcomes(
+                    spawned, count - 1, starting
+                ):
+                    yield outcome, p * q / len(empty), placed
+
+    def starting_boards(self) -> Iterator[Board]:
+        """Every board a new game can start with"""
+        empty = (0,) * self.size**2
+        for board, _p, _placed in self.spawn_outcomes(
+            empty, self.config.starting_tile_count, starting=True
+        ):
+            yield board
+
+    def heuristic(self, board: Board) -> float:
+        """
+        Value of a slid board at the search horizon, before its spawns,
+        rewarding room to keep playing: each empty tile is worth a merge of
+        two mutated tiles
+        """
+        return board.count(0) * self.config.root_tile_value**3
+
+    def spawn_distribution(self, board: Board) -> dict[Board, float]:
+        """
+        The distinct boards spawning can give after a slide, with their
+        probabilities. Boards where spawn_kill ends the game are left out
+        """
+        distribution: dict[Board, float] = {}
+        for outcome, p, placed in self.spawn_outcomes(
+            board, self.config.spawn_tile_count
+        ):
+            if not placed and self.config.spawn_kill:
+                continue
+
+            distribution[outcome] = distribution.get(outcome, 0.0) + p
+
+        return distribution
+
+    def expected_value(self, board: Board, depth: int) -> float:
+        """The expected value of a slid board, searching depth more plies"""
+        if 0 not in board:
+            # A full board after sliding ends the turn, see Game.play_turn
+            return 0.0
+
+        if depth == 0:
+            return self.heuristic(board)
+
+        return sum(
+            p * self.value(outcome, depth)
+            for outcome, p in self.spawn_distribution(board).items()
+        )
+
+    def value(self, board: Board, depth: int) -> float:
+        """The expected score of the best move, searching depth plies"""
+        cached = self._value_cache.get((board, depth))
+        if cached is not None:
+            return cached
+
+        best = max(
+            gained + self.expected_value(slid, depth - 1)
+            for slid, gained in (
+                self.slide(board, direction) for direction in DIRECTIONS
+            )
+        )
+        self._value_cache[(board, depth)] = best
+
+        return best
+
+    def best_move(self, board: Board, depth: int = 1) -> SlideDirection:
+        """The direction with the highest expected value, searching depth plies"""
+        assert depth >= 1, "Search at least one ply"
+        best_value = -1.0
+        best = SlideDirection.NONE
+
+        for direction in DIRECTIONS:
+            slid, gained = self.slide(board, direction)
+            value = gained + self.expected_value(slid, depth - 1)
+            if value > best_value:
+                best_value = value
+                best = direction
+
+        return best
+
+    def clear_cache(self):
+        """Forget searched values, which grow with every board searched"""
+        self._value_cache.clear()
+
+
+class OpeningBook:
+    """
+    Best moves of canonical boards, in an open addressing hash table of
+    fixed size slots. Each slot holds the board's tile codes and the move,
+    with SlideDirection.NONE marking an empty slot
+
+    Args:
+        config: The config the book was searched for
+        slots: The table, a structured array of "board" and "move"
+        header: Details of the search, kept in the file
+    """
+
+    def __init__(self, config: GameConfig, slots: np.ndarray, header: dict):
+        self.config = config
+        self.slots = slots
+        self.header = header
+        self.search = BoardSearch(config)
+
+    @staticmethod
+    def slot_dtype(cells: int) -> np.dtype:
+        """The dtype of a slot for boards of cells tiles"""
+        return np.dtype([("board", np.uint8, (cells,)), ("move", np.uint8)])
+
+    @staticmethod
+    def slot_index(key: bytes, capacity: int) -> int:
+        """
+        The first slot to probe for a board. Stable across processes, unlike
+        hash(), since the table is shared through a file
+        """
+        digest = hashlib.blake2b(key, digest_size=8).digest()
+        return int.from_bytes(digest, "little") % capacity
+
+    @classmethod
+    def from_moves(
+        cls, config: GameConfig, moves: dict[Board, SlideDirection], header: dict
+    ) -> "OpeningBook":
+        """A book of the best move for each canonical board"""
+        cells = config.grid_size**2
+        capacity = max(1, 2 ** math.ceil(math.log2(len(moves) / BOOK_LOAD_FACTOR + 1)))
+        slots = np.zeros(capacity, dtype=cls.slot_dtype(cells))
+
+        for board, move in moves.items():
+            key = bytes(board)
+            index = cls.slot_index(key, capacity)
+            while slots[index]["move"] != SlideDirection.NONE.value:
+                index = (index + 1) % capacity
+
+            slots[index]["board"] = board
+            slots[index]["move"] = move.value
+
+        return cls(config, slots, {**header, "entries": len(moves)})
+
+    def __len__(self) -> int:
+        return self.header["entries"]
+
+    def matches(self, config: GameConfig) -> bool:
+        """Whether the book was searched for a config"""
+        return json.loads(config.to_json()) == json.loads(self.config.to_json())
+
+    def lookup_board(self, board: Board) -> Optional[SlideDirection]:
+        """The book move for a board of tile codes, None if it is not in the book"""
+        canonical, symmetry = SymmetryHelper.canonicalize(
+            np.array(board, dtype=np.uint8).reshape((self.search.size, -1))
+        )
+        key = canonical.tobytes()
+        capacity = len(self.slots)
+        index = self.slot_index(key, capacity)
+
+        for _probe in range(capacity):
+            slot = self.slots[index]
+            if slot["move"] == SlideDirection.NONE.value:
+                return None
+
+            if slot["board"].tobytes() == key:
+                move = SlideDirection(int(slot["move"]))
+                return SymmetryHelper.unmap_direction(move, symmetry)
+
+            index = (index + 1) % capacity
+
+        return None
+
+    def lookup(self, values: list[list[int]]) -> Optional[SlideDirection]:
+        """The book move for a grid of tile values, None if it is not in the book"""
+        assert (
+            len(values) == self.config.grid_size
+        ), f"Book is for {self.config.grid_size}x{self.config.grid_size} boards"
+
+        board = self.search.encode(values)
+        if board is None or max(board) > 255:
+            return None
+
+        return self.lookup_board(board)
+
+    def save(self, path: Union[str, os.PathLike]):
+        """
+        Save the book to a file that can be memory mapped with open, laid out
+        like Grid.save: a header, padded so the slots start aligned
+        """
+        header = json.dumps(
+            {
+                **self.header,
+                "config": json.loads(self.config.to_json()),
+                "capacity": len(self.slots),
+                "dtype": np.lib.format.dtype_to_descr(self.slots.dtype),
+            }
+        ).encode("utf-8")
+
+        prefix_size = len(BOOK_FILE_MAGIC) + 4 + len(header)
+        header += b" " * (-prefix_size % BOOK_FILE_ALIGNMENT)
+
+        with open(path, "wb") as book_file:
+            book_file.write(BOOK_FILE_MAGIC)
+            book_file.write(len(header).to_bytes(4, "little"))
+            book_file.write(header)
+            book_file.write(np.ascontiguousarray(self.slots).tobytes())
+
+    @classmethod
+    def open(cls, path: Union[str, os.PathLike]) -> "OpeningBook":
+        """
+        Open a saved book as a read only memory map, so slots are only read
+        from disk when probed
+
+        Raises:
+          AssertionError: If the file is not a saved book.
+        """
+        with open(path, "rb") as book_file:
+            magic = book_file.read(len(BOOK_FILE_MAGIC))
+            assert magic == BOOK_FILE_MAGIC, f"{path} is not a saved opening book"
+
+            header_size = int.from_bytes(book_file.read(4), "little")
+            header = json.loads(book_file.read(header_size).decode("utf-8"))
+
+        slots = np.memmap(
+            path,
+            dtype=np.lib.format.descr_to_dtype(header["dtype"]),
+            mode="r",
+            offset=len(BOOK_FILE_MAGIC) + 4 + header_size,
+            shape=(header["capacity"],),
+        )
+
+        return cls(GameConfig(**header["config"]), slots, header)
+
+
+def canonical_boards(boards: set[Board], size: int) -> set[Board]:
+    """The canonical boards of a set of boards, canonicalized as one batch"""
+    if not boards:
+        return set()
+
+    canonical, _symmetries = SymmetryHelper.canonicalize_batch(
+        np.array(sorted(boards), dtype=np.uint8).reshape((len(boards), size, size))
+    )
+
+    return {tuple(board) for board in canonical.reshape(len(boards), -1).tolist()}
+
+
+def build_book(config: GameConfig, plies: int, depth: int) -> OpeningBook:
+    """
+    Search the best move of every board reachable in the first plies while
+    following the book, searching depth plies from each
+    """
+    assert plies >= 1, "A book needs at least one ply"
+    search = BoardSearch(config)
+    moves: dict[Board, SlideDirection] = {}
+    level = canonical_boards(set(search.starting_boards()), search.size)
+
+    for ply in range(plies):
+        reached: set[Board] = set()
+        for board in sorted(level):
+            move = search.best_move(board, depth)
+            moves[board] = move
+
+            if ply == plies - 1:
+                continue
+
+            slid, _gained = search.slide(board, move)
+            reached.update(search.spawn_distribution(slid))
+
+        # Values depend only on the board, but keeping every one for the
+        # whole build would hold most of the search tree in memory
+        search.clear_cache()
+        level = canonical_boards(reached, search.size) - moves.keys()
+
+    return OpeningBook.from_moves(config, moves, {"plies": plies, "depth": depth})
+
+
+class BookPolicy(Policy):
+    """
+    Plays the book move when there is one, and the corner policy otherwise.
+    The book is read from the path in the OPENING_BOOK environment variable,
+    so it can be simulated as "src.games.twenty_forty_eight.opening_book:BookPolicy"
+    """
+
+    _books: dict[str, OpeningBook] = {}
+
+    def __init__(self, rng: random.Random):
+        super().__init__(rng)
+        path = os.environ["OPENING_BOOK"]
+        if path not in self._books:
+            self._books[path] = OpeningBook.open(path)
+
+        self.book = self._books[path]
+        self.fallback = CornerPolicy(rng)
+
+    def choose(self, game: Game) -> SlideDirection:
+        if self.book.matches(game.config):
+            move = self.book.lookup(game.grid_values())
+            if move is not None:
+                return move
+
+        return self.fallback.choose(game)
+
+
+def main(args: Optional[list[str]] = None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--config", type=json.loads, default={})
+    parser.add_argument("--plies", type=int, default=2, help="Plies the book covers")
+    parser.add_argument("--depth", type=int, default=1, help="Plies searched per board")
+    parser.add_argument("--output", required=True)
+    options = parser.parse_args(args)
+
+    config = GameConfig(**options.config)
+    start = time.perf_counter()
+    book = build_book(config, options.plies, options.depth)
+    book.save(options.output)
+
+    print(
+        f"{len(book)} boards in {len(book.slots)} slots, "
+        f"searched in {time.perf_counter() - start:.2f}s",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,378 @@
+# pylint: disable=too-few-public-methods
+"""
+Headless simulation of 2048 games, outside the backend. Plays N games per
+config with a policy across a process pool, streaming a result per game to
+JSONL or CSV as games finish.
+
+    python -m src.games.twenty_forty_eight.simulate --games 1000 --policy corner \\
+        --config '{"grid_size": 5}' --config '{"grid_size": 6}' --output results.jsonl
+
+Policies are "random", "greedy", "corner", or any Policy subclass given as
+"module:Class".
+"""
+
+import argparse
+import csv
+import importlib
+import json
+import multiprocessing
+import random
+import sys
+import time
+from contextlib import nullcontext
+from dataclasses import asdict, dataclass, fields
+from typing import Iterable, Iterator, Optional, TextIO
+
+import numpy as np
+
+from src.games.twenty_forty_eight.game import (
+    Game,
+    GameConfig,
+    SlideDirection,
+    SlideResult,
+)
+from src.tiled_tools.common.profiling import PhaseCounters, Profile
+
+DIRECTIONS = [
+    SlideDirection.UP,
+    SlideDirection.RIGHT,
+    SlideDirection.DOWN,
+    SlideDirection.LEFT,
+]
+
+
+class Policy:
+    """
+    Chooses the slide to play. Subclass and pass as "module:Class" to
+    simulate with a custom policy
+
+    Args:
+        rng: Random number generator, seeded per game
+    """
+
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+
+    def choose(self, game: Game) -> SlideDirection:
+        """Returns the direction to slide"""
+        raise NotImplementedError
+
+
+class PolicyHelper:
+    """
+    Methods useful for writing policies
+    """
+
+    @staticmethod
+    def preview(game: Game, direction: SlideDirection) -> tuple[bool, int]:
+        """
+        Returns whether sliding in a direction would move any tile, and the
+        score it would gain, without changing the game
+        """
+        score = game.score
+        if direction in [SlideDirection.UP, SlideDirection.DOWN]:
+            new_values, _movement = game.slide_each_column(direction)
+        else:
+            new_values, _movement = game.slide_each_row(direction)
+
+        # Sliding adds merges to the score as it goes, so put it back
+        gained = game.score - score
+        game.score = score
+
+        return new_values != game.grid_values(), gained
+
+
+class RandomPolicy(Policy):
+    """Slides in a random direction"""
+
+    def choose(self, game: Game) -> SlideDirection:
+        return self.rng.choice(DIRECTIONS)
+
+
+class GreedyPolicy(Policy):
+    """Slides in the direction scoring the most, breaking ties randomly"""
+
+    def choose(self, game: Game) -> SlideDirection:
+        best_gain = -1
+        best: list[SlideDirection] = []
+
+        for direction in DIRECTIONS:
+            moves, gained = PolicyHelper.preview(game, direction)
+            if not moves:
+                continue
+
+            if gained > best_gain:
+                best_gain = gained
+                best = [direction]
+            elif gained == best_gain:
+                best.append(direction)
+
+        return self.rng.choice(best or DIRECTIONS)
+
+
+class CornerPolicy(Policy):
+    """
+    Keeps the largest tiles in the bottom left corner, sliding down or left
+    where possible, then right, and up only as a last resort
+    """
+
+    PREFERENCE = [
+        SlideDirection.DOWN,
+        SlideDirection.LEFT,
+        SlideDirection.RIGHT,
+        SlideDirection.UP,
+    ]
+
+    def choose(self, game: Game) -> SlideDirection:
+        for direction in self.PREFERENCE:
+            moves, _gained = PolicyHelper.preview(game, direction)
+            if moves:
+                return direction
+
+        return SlideDirection.UP
+
+
+POLICIES: dict[str, type[Policy]] = {
+    "random": RandomPolicy,
+    "greedy": GreedyPolicy,
+    "corner": CornerPolicy,
+}
+
+
+def load_policy(name: str) -> type[Policy]:
+    """Returns a built-in policy by name, or a Policy class given as module:Class"""
+    if name in POLICIES:
+        return POLICIES[name]
+
+    assert ":" in name, f"Unknown policy {name}, expected one of {list(POLICIES)}"
+    module_name, class_name = name.split(":", 1)
+    policy = getattr(importlib.import_module(module_name), class_name)
+    assert issubclass(policy, Policy), f"{name} is not a Policy"
+
+    return policy
+
+
+def canonical_config(config: GameConfig) -> str:
+    """The config as JSON with sorted keys, equal for equal configs"""
+    return json.dumps(asdict(config), sort_keys=True)
+
+
+# pylint: disable=too-many-instance-attributes
+@dataclass
+class SimulationResult:
+    """The outcome of one simulated game"""
+
+    # The index of the config within the run, and the whole config as
+    # canonical JSON, which identifies it across runs
+    config: int
+    game_config: str
+    game: int
+    seed: int
+    score: int
+    highest_tile: int
+    moves: int
+    end_result: Optional[str]
+    won: bool
+
+
+@dataclass
+class SimulationTask:
+    """One game to simulate, picklable for the process pool"""
+
+    config_index: int
+    config: dict
+    game_index: int
+    seed: int
+    policy: str
+    max_moves: int
+
+
+def play_game(
+    task: SimulationTask, counters: Optional[PhaseCounters] = None
+) -> SimulationResult:
+    """
+    Plays a game to the end, or until it is won like in the backend. Both
+    random modules are seeded so a game can be replayed from its seed
+    """
+    random.seed(task.seed)
+    np.random.seed(task.seed % 2**32)
+
+    config = GameConfig(**task.config)
+    game = Game(config)
+    policy = load_policy(task.policy)(random.Random(task.seed))
+
+    moves = 0
+    result: Optional[SlideResult] = None
+    won = False
+    while moves < task.max_moves and game.can_play():
+        result = game.play_turn(policy.choose(game))
+        moves += 1
+
+        if game.get_highest_tile() >= config.win_tile_value:
+            won = True
+            break
+
+    if counters is not None:
+        counters.increment("games")
+        counters.increment("slides", moves)
+
+    return SimulationResult(
+        config=task.config_index,
+        game_config=canonical_config(config),
+        game=task.game_index,
+        seed=task.seed,
+        score=game.score,
+        highest_tile=game.get_highest_tile(),
+        moves=moves,
+        end_result=result.name if result else None,
+        won=won,
+    )
+
+
+def build_tasks(
+    configs: list[dict], games: int, policy: str, seed: int, max_moves: int
+) -> Iterator[SimulationTask]:
+    """Every game to simulate, with a distinct seed per game"""
+    for config_index, config in enumerate(configs):
+        for game_index in range(games):
+            yield SimulationTask(
+                config_index,
+                config,
+                game_index,
+                seed + config_index * games + game_index,
+                policy,
+                max_moves,
+            )
+
+
+class ResultWriter:
+    """
+    Writes results as JSONL or CSV, flushing each so results can be
+    followed while the simulation runs
+    """
+
+    FIELDS = [field.name for field in fields(SimulationResult)]
+
+    def __init__(self, output: TextIO, output_format: str = "jsonl"):
+        assert output_format in ["jsonl", "csv"], f"Unknown format {output_format}"
+        self.output = output
+        self.csv_writer = None
+
+        if output_format == "csv":
+            self.csv_writer = csv.DictWriter(output, fieldnames=self.FIELDS)
+            self.csv_writer.writeheader()
+
+    def write(self, result: SimulationResult):
+        """Write a single result"""
+        if self.csv_writer is not None:
+            self.csv_writer.writerow(asdict(result))
+        else:
+            self.output.write(json.dumps(asdict(result)) + "\n")
+
+        self.output.flush()
+
+
+def simulate(
+    tasks: Iterable[SimulationTask],
+    task_count: int,
+    workers: int = 0,
+    counters: Optional[PhaseCounters] = None,
+) -> Iterator[SimulationResult]:
+    """
+    Yields results as games finish, in no particular order. 0 workers plays
+    in this process, which keeps profiling and counters meaningful. Tasks
+    are consumed as the pool needs them, task_count only sizes its chunks
+    """
+    if workers == 0:
+        for task in tasks:
+            yield play_game(task, counters)
+        return
+
+    chunksize = max(1, min(64, task_count // (workers * 4)))
+    with multiprocessing.Pool(workers) as pool:
+        for result in pool.imap_unordered(play_game, tasks, chunksize):
+            if counters is not None:
+                counters.increment("games")
+                counters.increment("slides", result.moves)
+
+            yield result
+
+
+def open_output(path: str):
+    """Opens the results file, or stdout for "-", as a context manager"""
+    if path == "-":
+        return nullcontext(sys.stdout)
+
+    # pylint: disable=consider-using-with
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+def main(args: Optional[list[str]] = None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--games", type=int, default=100, help="Games per config")
+    parser.add_argument(
+        "--config",
+        action="append",
+        type=json.loads,
+        help="GameConfig fields as JSON, repeat for more configs",
+    )
+    parser.add_argument("--policy", default="random")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=multiprocessing.cpu_count(),
+        help="Processes to play games in, 0 plays in this process",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-moves", type=int, default=100_000)
+    parser.add_argument("--output", default="-", help="Path for results, - for stdout")
+    parser.add_argument("--format", choices=["jsonl", "csv"], default=None)
+    parser.add_argument(
+        "--profile",
+        help="Write collapsed stacks to this path, plays in this process",
+    )
+    options = parser.parse_args(args)
+
+    configs = options.config or [{}]
+    # Check every config is valid before starting any games
+    for config in configs:
+        GameConfig(**config)
+
+    output_format = options.format or (
+        "csv" if options.output.endswith(".csv") else "jsonl"
+    )
+    workers = 0 if options.profile else options.workers
+    tasks = build_tasks(
+        configs, options.games, options.policy, options.seed, options.max_moves
+    )
+
+    with open_output(options.output) as output_file:
+        writer = ResultWriter(output_file, output_format)
+        start = time.perf_counter()
+
+        with Profile(options.profile) as profile:
+            for result in simulate(
+                tasks, options.games * len(configs), workers, profile.counters
+            ):
+                writer.write(result)
+
+        elapsed = time.perf_counter() - start
+
+    counts = profile.counters.counts
+    print(
+        f"{counts['games']} games, {counts['slides']} slides in {elapsed:.2f}s "
+        f"({counts['games'] / elapsed:.1f} games/s, "
+        f"{counts['slides'] / elapsed:.0f} slides/s) with {workers or 1} "
+        f"{'workers' if workers > 1 else 'worker'}",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    # Run as -m, this module is __main__, and its Policy is not the one that
+    # policies given as module:Class subclass, so run the imported module
+    # pylint: disable-next=import-self
+    from src.games.twenty_forty_eight import simulate as simulate_module
+
+    simulate_module.main()
@@ -0,0 +1,163 @@
+"""
+Summaries of simulation results, built while streaming so million game
+sweeps fit in constant memory. Summaries of separate runs or workers merge.
+
+    python -m src.games.twenty_forty_eight.stats results.jsonl more_results.csv
+"""
+
+import argparse
+import csv
+import json
+from typing import Iterator, Optional, Union
+
+from src.games.twenty_forty_eight.simulate import SimulationResult
+from src.tiled_tools.common.statistics import Histogram, QuantileSketch, RunningMoments
+
+QUANTILES = [0.5, 0.9, 0.99]
+
+
+class ConfigStatistics:
+    """
+    Statistics of every game played with one config
+
+    Args:
+        relative_accuracy: The largest relative error of the score and moves quantiles
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.games = 0
+        self.wins = 0
+        self.score = RunningMoments()
+        self.moves = RunningMoments()
+        self.score_quantiles = QuantileSketch(relative_accuracy)
+        self.moves_quantiles = QuantileSketch(relative_accuracy)
+        # Highest tile value of each game
+        self.highest_tiles = Histogram()
+
+    def add(self, result: SimulationResult):
+        """Include the result of a game"""
+        self.games += 1
+        self.wins += int(result.won)
+        self.score.add(result.score)
+        self.moves.add(result.moves)
+        self.score_quantiles.add(result.score)
+        self.moves_quantiles.add(result.moves)
+        self.highest_tiles.add(result.highest_tile)
+
+    def merge(self, other: "ConfigStatistics"):
+        """Include every game of another summary"""
+        self.games += other.games
+        self.wins += other.wins
+        self.score.merge(other.score)
+        self.moves.merge(other.moves)
+        self.score_quantiles.merge(other.score_quantiles)
+        self.moves_quantiles.merge(other.moves_quantiles)
+        self.highest_tiles.merge(other.highest_tiles)
+
+    def win_rate(self) -> float:
+        """The fraction of games won"""
+        return self.wins / self.games if self.games else 0.0
+
+    def to_dict(self) -> dict:
+        """The summary as plain values"""
+        return {
+            "games": self.games,
+            "win_rate": self.win_rate(),
+            "score": {
+                "mean": self.score.mean,
+                "std": self.score.std(),
+                "min": self.score.min,
+                "max": self.score.max,
+                "quantiles": self.score_quantiles.quantiles(QUANTILES),
+            },
+            "moves": {
+                "mean": self.moves.mean,
+                "std": self.moves.std(),
+                "min": self.moves.min,
+                "max": self.moves.max,
+                "quantiles": self.moves_quantiles.quantiles(QUANTILES),
+            },
+            "highest_tiles": self.highest_tiles.to_dict(),
+        }
+
+
+class SimulationStatistics:
+    """
+    Statistics of simulation results, kept per config. Configs are told
+    apart by their contents, as config indexes only hold within one run
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.relative_accuracy = relative_accuracy
+        # By the canonical JSON of the config
+        self.configs: dict[str, ConfigStatistics] = {}
+
+    def add(self, result: SimulationResult):
+        """Include the result of a game"""
+        if result.game_config not in self.configs:
+            self.configs[result.game_config] = ConfigStatistics(self.relative_accuracy)
+
+        self.configs[result.game_config].add(result)
+
+    def merge(self, other: "SimulationStatistics"):
+        """Include every game of another summary"""
+        for config, statistics in other.configs.items():
+            if config not in self.configs:
+                self.configs[config] = ConfigStatistics(self.relative_accuracy)
+
+            self.configs[config].merge(statistics)
+
+    def to_dict(self) -> list[dict]:
+        """The summary of each config, along with the config"""
+        return [
+            {"config": json.loads(config), **statistics.to_dict()}
+            for config, statistics in sorted(self.configs.items())
+        ]
+
+
+def parse_result(row: dict[str, Union[str, int, bool, None]]) -> SimulationResult:
+    """A result from a JSONL object or CSV row, where every value is a string"""
+    end_result = row["end_result"]
+
+    return SimulationResult(
+        config=int(row["config"]),
+        game_config=str(row["game_config"]),
+        game=int(row["game"]),
+        seed=int(row["seed"]),
+        score=int(row["score"]),
+        highest_tile=int(row["highest_tile"]),
+        moves=int(row["moves"]),
+        end_result=end_result if end_result not in ("", None) else None,
+        won=row["won"] in (True, "True", "true"),
+    )
+
+
+def read_results(path: str) -> Iterator[SimulationResult]:
+    """Streams the results written by the simulate CLI, as JSONL or CSV"""
+    with open(path, encoding="utf-8", newline="") as results:
+        if path.endswith(".csv"):
+            for row in csv.DictReader(results):
+                yield parse_result(row)
+        else:
+            for line in results:
+                if line.strip():
+                    yield parse_result(json.loads(line))
+
+
+def main(args: Optional[list[str]] = None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("paths", nargs="+", help="JSONL or CSV simulation results")
+    parser.add_argument("--relative-accuracy", type=float, default=0.01)
+    options = parser.parse_args(args)
+
+    statistics = SimulationStatistics(options.relative_accuracy)
+    for path in options.paths:
+        for result in read_results(path):
+            statistics.add(result)
+
+    print(json.dumps(statistics.to_dict(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
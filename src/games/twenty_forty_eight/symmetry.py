@@ -0,0 +1,171 @@
+"""
+The eight symmetries of a square 2048 board. Rotating or reflecting a board
+and the direction slid gives the same result rotated or reflected, so caches
+keyed on boards, like solver transposition tables or opening books, can key
+on a canonical board instead and hold up to 8x fewer entries:
+
+    canonical, symmetry = SymmetryHelper.canonicalize(game.grid_values())
+    best = table.get(canonical.tobytes())
+    if best is not None:
+        direction = SymmetryHelper.unmap_direction(best, symmetry)
+"""
+
+from enum import Enum
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from src.games.twenty_forty_eight.game import SlideDirection
+
+# Each direction as the (row, column) step a tile takes sliding that way
+DIRECTION_STEPS = {
+    SlideDirection.UP: (-1, 0),
+    SlideDirection.RIGHT: (0, 1),
+    SlideDirection.DOWN: (1, 0),
+    SlideDirection.LEFT: (0, -1),
+}
+
+
+class Symmetry(Enum):
+    """
+    A rotation or reflection of the board. The value counts quarter turns
+    counterclockwise, plus 4 when the board is transposed after turning
+    """
+
+    IDENTITY = 0
+    ROTATE_90 = 1
+    ROTATE_180 = 2
+    ROTATE_270 = 3
+    TRANSPOSE = 4
+    FLIP_HORIZONTAL = 5
+    ANTI_TRANSPOSE = 6
+    FLIP_VERTICAL = 7
+
+
+SYMMETRIES = list(Symmetry)
+
+
+class SymmetryHelper:
+    """
+    Methods for applying symmetries to boards and directions. Boards are
+    arrays of tile values indexed [row][column], and any leading axes are
+    treated as a batch of boards
+    """
+
+    @staticmethod
+    def apply(boards: ArrayLike, symmetry: Symmetry) -> np.ndarray:
+        """The boards rotated or reflected by a symmetry"""
+        boards = np.asarray(boards)
+        assert boards.shape[-1] == boards.shape[-2], "Boards must be square"
+
+        transformed = np.rot90(boards, symmetry.value % 4, axes=(-2, -1))
+        if symmetry.value >= 4:
+            transformed = np.swapaxes(transformed, -2, -1)
+
+        return transformed
+
+    @staticmethod
+    def invert(symmetry: Symmetry) -> Symmetry:
+        """The symmetry undoing another"""
+        if symmetry.value >= 4:
+            # Every reflection undoes itself
+            return symmetry
+
+        return Symmetry((4 - symmetry.value) % 4)
+
+    @staticmethod
+    def map_direction(direction: SlideDirection, symmetry: Symmetry) -> SlideDirection:
+        """
+        The direction to slide the transformed board, to match sliding the
+        original board in a direction
+        """
+        return DIRECTION_MAPS[symmetry][direction]
+
+    @staticmethod
+    def unmap_direction(
+        direction: SlideDirection, symmetry: Symmetry
+    ) -> SlideDirection:
+        """
+        The direction to slide the original board, to match sliding the
+        transformed board in a direction
+        """
+        return DIRECTION_MAPS[SymmetryHelper.invert(symmetry)][direction]
+
+    @staticmethod
+    def canonicalize(board: ArrayLike) -> tuple[np.ndarray, Symmetry]:
+        """
+        The canonical board among the symmetries of a board, and the symmetry
+        turning the board into it. Boards sharing a canonical board are
+        equivalent under some rotation or reflection
+        """
+        canonical, symmetries = SymmetryHelper.canonicalize_batch(
+            np.asarray(board)[np.newaxis]
+        )
+
+        return canonical[0], SYMMETRIES[symmetries[0]]
+
+    @staticmethod
+    def canonicalize_batch(boards: ArrayLike) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Canonicalizes a batch of boards shaped (boards, size, size). Returns
+        the canonical boards, and the value of the Symmetry applied to each.
+        The canonical board is the lexicographically smallest, row by row, of
+        the eight, picking the lowest symmetry on ties
+        """
+        boards = np.asarray(boards)
+        assert boards.ndim == 3, "Expected a batch shaped (boards, size, size)"
+        count = boards.shape[0]
+
+        # Shaped (symmetries, boards, cells)
+        variants = np.stack(
+            [
+                SymmetryHelper.apply(boards, symmetry).reshape(count, -1)
+                for symmetry in SYMMETRIES
+            ]
+        )
+
+        # Narrow the candidates for each board one cell at a time, so the
+        # work is per cell rather than per board
+        candidates = np.ones(variants.shape[:2], dtype=bool)
+        ceiling = (
+            np.iinfo(variants.dtype).max if variants.dtype.kind in "iu" else np.inf
+        )
+        for cell in range(variants.shape[2]):
+            values = np.where(candidates, variants[:, :, cell], ceiling)
+            candidates &= values == values.min(axis=0)
+
+        symmetries = candidates.argmax(axis=0)
+        canonical = variants[symmetries, np.arange(count)].reshape(boards.shape)
+
+        return canonical, symmetries
+
+    @staticmethod
+    def canonical_key(board: ArrayLike) -> bytes:
+        """A hashable key shared by every symmetry of a board"""
+        canonical, _symmetry = SymmetryHelper.canonicalize(board)
+        return np.ascontiguousarray(canonical).tobytes()
+
+
+def _build_direction_maps() -> dict[Symmetry, dict[SlideDirection, SlideDirection]]:
+    # Turning counterclockwise takes a step (row, column) to (-column, row),
+    # and transposing takes it to (column, row)
+    step_directions = {step: direction for direction, step in DIRECTION_STEPS.items()}
+    maps = {}
+
+    for symmetry in SYMMETRIES:
+        direction_map = {SlideDirection.NONE: SlideDirection.NONE}
+        for direction, (row, column) in DIRECTION_STEPS.items():
+            for _turn in range(symmetry.value % 4):
+                row, column = -column, row
+
+            if symmetry.value >= 4:
+                row, column = column, row
+
+            direction_map[direction] = step_directions[(row, column)]
+
+        maps[symmetry] = direction_map
+
+    return maps
+
+
+DIRECTION_MAPS = _build_direction_maps()
@@ -3,6 +3,12 @@ This file will hold services and functionality around
 dimensions and measurements in the game.
 """
 
+from dataclasses import dataclass
+from typing import Optional, Union
+
+import numpy as np
+from numpy.typing import ArrayLike
+
 from src.tiled_tools.common.custom_typing import AnyNumber
 
 
@@ -45,3 +51,315 @@ class Size:
             and self.height == other.height
             and self.depth == other.depth
         )
+
+
+class SizeArray:
+    """
+    Many sizes stored as columns of widths, heights and depths, so areas,
+    volumes and comparisons over a whole cut list are vectorized.
+
+    Args:
+      widths (ArrayLike): The width of each size.
+      heights (ArrayLike): The height of each size.
+      depths (ArrayLike): The depth of each size. Defaults to None, which is 1
+      for every size, as with Size.
+    """
+
+    # Keys accepted by argsort and sorted
+    SORT_KEYS = ("width", "height", "depth", "area", "volume", "longest_side")
+
+    def __init__(
+        self,
+        widths: ArrayLike,
+        heights: ArrayLike,
+        depths: Optional[ArrayLike] = None,
+    ):
+        self.widths = np.asarray(widths)
+        self.heights = np.asarray(heights)
+        self.depths = (
+            np.ones_like(self.widths) if depths is None else np.asarray(depths)
+        )
+
+        assert (
+            self.widths.shape == self.heights.shape == self.depths.shape
+        ), "Widths, heights and depths must have the same length"
+
+    @classmethod
+    def from_sizes(cls, sizes: list[Size]) -> "SizeArray":
+        """
+        Build a SizeArray from a list of sizes.
+
+        Args:
+          sizes (list[Size]): The sizes to store.
+        """
+        return cls(
+            [size.width for size in sizes],
+            [size.height for size in sizes],
+            [size.depth for size in sizes],
+        )
+
+    def to_sizes(self) -> list[Size]:
+        """
+        Return the sizes as a list of Size objects.
+        """
+        return [
+            Size(width, height, depth)
+            for width, height, depth in zip(
+                self.widths.tolist(), self.heights.tolist(), self.depths.tolist()
+            )
+        ]
+
+    def area(self) -> np.ndarray:
+        """
+        Return the area of each size, assuming 2D.
+        """
+        return self.widths * self.heights
+
+    def volume(self) -> np.ndarray:
+        """
+        Return the volume of each size.
+        """
+        return self.widths * self.heights * self.depths
+
+    def total_area(self) -> AnyNumber:
+        """
+        Return the combined area of every size.
+        """
+        return self.area().sum()
+
+    def equals(self, size: Size) -> np.ndarray:
+        """
+        Return a mask of which sizes are equal to the given size.
+
+        Args:
+          size (Size): The size to compare against.
+        """
+        return (
+            (self.widths == size.width)
+            & (self.heights == size.height)
+            & (self.depths == size.depth)
+        )
+
+    def fits_within(self, size: Size, allow_rotation: bool = False) -> np.ndarray:
+        """
+        Return a mask of which sizes fit inside the given size.
+
+        Args:
+          size (Size): The containing size, e.g. a stock sheet.
+          allow_rotation (bool): Whether width and height may be swapped.
+          Defaults to False.
+        """
+        depth_fits = self.depths <= size.depth
+        fits = (self.widths <= size.width) & (self.heights <= size.height)
+
+        if allow_rotation:
+            fits |= (self.heights <= size.width) & (self.widths <= size.height)
+
+        return fits & depth_fits
+
+    def _sort_values(self, key: str) -> np.ndarray:
+        """
+        Return the values to sort by for a key in SORT_KEYS.
+        """
+        assert key in self.SORT_KEYS, f"Cannot sort by {key}"
+
+        if key == "area":
+            return self.area()
+        if key == "volume":
+            return self.volume()
+        if key == "longest_side":
+            return np.maximum(self.widths, self.heights)
+
+        return getattr(self, f"{key}s")
+
+    def argsort(self, key: str = "area", descending: bool = False) -> np.ndarray:
+        """
+        Return the indices that would sort the sizes. Ties keep their order.
+
+        Args:
+          key (str): One of SORT_KEYS. Defaults to "area".
+          descending (bool): Largest first. Defaults to False.
+        """
+        values = self._sort_values(key)
+
+        if descending:
+            values = -values
+
+        return np.argsort(values, kind="stable")
+
+    def sorted(self, key: str = "area", descending: bool = False) -> "SizeArray":
+        """
+        Return a sorted copy of the sizes.
+
+        Args:
+          key (str): One of SORT_KEYS. Defaults to "area".
+          descending (bool): Largest first. Defaults to False.
+        """
+        return self[self.argsort(key, descending)]
+
+    def __getitem__(
+        self, index: Union[int, np.ndarray, slice]
+    ) -> Union[Size, "SizeArray"]:
+        """
+        Get a single Size, or a SizeArray for a slice, mask or index array.
+
+        Args:
+          index (int|slice|np.ndarray): The sizes to get.
+        """
+        if isinstance(index, (int, np.integer)):
+            return Size(
+                self.widths[index].item(),
+                self.heights[index].item(),
+                self.depths[index].item(),
+            )
+
+        return SizeArray(self.widths[index], self.heights[index], self.depths[index])
+
+    def __len__(self) -> int:
+        return len(self.widths)
+
+    def __eq__(self, other: "SizeArray") -> bool:
+        return (
+            np.array_equal(self.widths, other.widths)
+            and np.array_equal(self.heights, other.heights)
+            and np.array_equal(self.depths, other.depths)
+        )
+
+    def __str__(self) -> str:
+        return f"SizeArray({len(self)} sizes)"
+
+    def __repr__(self) -> str:
+        return str(self)
+
+
+@dataclass
+class Packing:
+    """
+    Where each piece was placed by a packing routine. Arrays are indexed in
+    the same order as the pieces that were packed.
+    """
+
+    # Position of the lower left corner of each piece on its sheet
+    x: np.ndarray
+    y: np.ndarray
+    # Whether the piece was turned 90 degrees, swapping width and height
+    rotated: np.ndarray
+    # Index of the stock sheet each piece is on, -1 if it could not fit at all
+    sheet: np.ndarray
+    sheet_count: int
+
+    def unplaced(self) -> np.ndarray:
+        """
+        Return the indices of the pieces that are too large for the stock.
+        """
+        return np.nonzero(self.sheet < 0)[0]
+
+    def utilization(self, pieces: SizeArray, stock: Size) -> float:
+        """
+        Return the fraction of the used sheets covered by placed pieces.
+
+        Args:
+          pieces (SizeArray): The pieces that were packed.
+          stock (Size): The stock sheet they were packed onto.
+        """
+        if self.sheet_count == 0:
+            return 0.0
+
+        placed_area = pieces.area()[self.sheet >= 0].sum()
+        return float(placed_area / (stock.area() * self.sheet_count))
+
+
+# pylint: disable=too-few-public-methods
+class SizePacker:
+    """
+    Methods for laying pieces out on stock sheets.
+    """
+
+    # pylint: disable=too-many-locals
+    @staticmethod
+    def shelf_pack(
+        pieces: SizeArray,
+        stock: Size,
+        allow_rotation: bool = True,
+        kerf: AnyNumber = 0,
+    ) -> Packing:
+        """
+        Pack pieces onto as many stock sheets as needed, using first fit
+        decreasing height shelves. Each shelf spans the width of the sheet, so
+        every layout can be cut with guillotine cuts: first across the sheet
+        between shelves, then between the pieces on each shelf.
+
+        Args:
+          pieces (SizeArray): The pieces to place.
+          stock (Size): The size of each stock sheet.
+          allow_rotation (bool): Whether pieces may be turned 90 degrees.
+          Defaults to True.
+          kerf (AnyNumber): Material lost to each cut, left between pieces and
+          shelves. Defaults to 0.
+        """
+        widths = pieces.widths.astype(float)
+        heights = pieces.heights.astype(float)
+        rotated = np.zeros(len(pieces), dtype=bool)
+
+        if allow_rotation:
+            # Lay pieces flat, so shelves are as low as possible, unless
+            # only the upright orientation fits on the sheet
+            flat_fits = (np.maximum(widths, heights) <= stock.width) & (
+                np.minimum(widths, heights) <= stock.height
+            )
+            upright_fits = (widths <= stock.width) & (heights <= stock.height)
+            rotated = np.where(flat_fits, heights > widths, ~upright_fits)
+            widths, heights = (
+                np.where(rotated, heights, widths),
+                np.where(rotated, widths, heights),
+            )
+
+        fits = (
+            (widths <= stock.width)
+            & (heights <= stock.height)
+            & (pieces.depths <= stock.depth)
+        )
+
+        x = np.zeros(len(pieces))
+        y = np.zeros(len(pieces))
+        sheet = np.full(len(pieces), -1)
+
+        # Every piece opens at most one shelf, so the shelf arrays never grow
+        shelf_sheet = np.zeros(len(pieces), dtype=int)
+        shelf_y = np.zeros(len(pieces))
+        shelf_height = np.zeros(len(pieces))
+        shelf_used = np.zeros(len(pieces))
+        shelf_count = 0
+        sheet_count = 0
+        sheet_used = 0.0
+
+        for i in np.argsort(-heights, kind="stable"):
+            if not fits[i]:
+                continue
+
+            width = widths[i]
+            open_shelves = np.nonzero(
+                (shelf_used[:shelf_count] + width <= stock.width)
+                & (shelf_height[:shelf_count] >= heights[i])
+            )[0]
+
+            if len(open_shelves):
+                shelf = open_shelves[0]
+            else:
+                if sheet_count == 0 or sheet_used + heights[i] > stock.height:
+                    sheet_count += 1
+                    sheet_used = 0.0
+
+                shelf = shelf_count
+                shelf_count += 1
+                shelf_sheet[shelf] = sheet_count - 1
+                shelf_y[shelf] = sheet_used
+                shelf_height[shelf] = heights[i]
+                sheet_used += heights[i] + kerf
+
+            x[i] = shelf_used[shelf]
+            y[i] = shelf_y[shelf]
+            sheet[i] = shelf_sheet[shelf]
+            shelf_used[shelf] += width + kerf
+
+        return Packing(x, y, rotated & fits, sheet, sheet_count)
@@ -0,0 +1,400 @@
+"""
+Spatial indexes over carver geometry, for answering "which pieces are near
+this point" or "which boxes overlap this one" without scanning every piece.
+Pieces are given as Vector positions (the minimum corner of each piece),
+optionally with a Size extent, and are stored as arrays rather than objects.
+"""
+
+import heapq
+import itertools
+from typing import Optional, Union
+
+import numpy as np
+
+from .measurements import Size
+from .vector import Vector, VectorArray
+
+Positions = Union[VectorArray, list[Vector], np.ndarray]
+Point = Union[Vector, list, np.ndarray]
+
+
+class SpatialIndex:
+    """
+    Base class for spatial indexes, holding the positions and extents of
+    every piece and the exact filtering shared by all implementations.
+    Subclasses only need to find candidates for a range or k-nearest query.
+
+    Args:
+      positions (VectorArray|list[Vector]): The position of each piece, as
+      its minimum corner.
+      sizes (list[Size]): The extent of each piece, only the first d of width,
+      height and depth are used for d dimensional positions. Defaults to None,
+      where every piece is treated as a point.
+    """
+
+    def __init__(self, positions: Positions, sizes: Optional[list[Size]] = None):
+        if isinstance(positions, VectorArray):
+            points = positions.vectors
+        elif isinstance(positions, list):
+            points = np.array([vector.tolist() for vector in positions])
+        else:
+            points = positions
+
+        self.points = np.asarray(points, dtype=float)
+
+        if self.points.size == 0 and self.points.ndim != 2:
+            self.points = self.points.reshape(0, 0)
+
+        assert self.points.ndim == 2, "Expected one position per row"
+        dimension = self.points.shape[1]
+
+        if sizes is None:
+            self.extents = np.zeros_like(self.points)
+        else:
+            assert len(sizes) == len(self.points), "Expected one size per position"
+            self.extents = np.array(
+                [[size.width, size.height, size.depth][:dimension] for size in sizes],
+                dtype=float,
+            ).reshape(len(self.points), dimension)
+
+        # Bounding box of the positions, used to stop expanding searches
+        self.lower = self.points.min(axis=0) if len(self.points) else None
+        self.upper = self.points.max(axis=0) if len(self.points) else None
+
+        # Used to widen box queries, so only minimum corners need to be indexed
+        self.max_extent = (
+            self.extents.max(axis=0) if len(self.extents) else np.zeros(dimension)
+        )
+
+    def dimension(self) -> int:
+        """
+        Return the dimension of the indexed positions.
+        """
+        return self.points.shape[1]
+
+    def _point(self, point: Point) -> np.ndarray:
+        """
+        Return a query point as a float array.
+        """
+        if isinstance(point, Vector):
+            point = point.vector
+
+        return np.asarray(point, dtype=float)
+
+    def _range_candidates(self, low: np.ndarray, high: np.ndarray) -> np.ndarray:
+        """
+        Return the indices of at least every position inside the closed box
+        from low to high. May include extra positions.
+        """
+        raise NotImplementedError
+
+    def k_nearest(self, center: Point, k: int) -> np.ndarray:
+        """
+        Return the indices of the k positions closest to the center, nearest
+        first. Returns fewer if the index holds fewer than k pieces.
+
+        Args:
+          center (Vector): The point to measure from.
+          k (int): The number of positions to return.
+        """
+        raise NotImplementedError
+
+    def range_query(self, low: Point, high: Point) -> np.ndarray:
+        """
+        Return the indices of the positions inside the closed box from low
+        to high, in increasing order.
+
+        Args:
+          low (Vector): The minimum corner of the box.
+          high (Vector): The maximum corner of the box.
+        """
+        low = self._point(low)
+        high = self._point(high)
+        candidates = self._range_candidates(low, high)
+        points = self.points[candidates]
+        inside = np.all((points >= low) & (points <= high), axis=1)
+
+        return np.sort(candidates[inside])
+
+    def radius_query(self, center: Point, radius: float) -> np.ndarray:
+        """
+        Return the indices of the positions within a distance of the center,
+        in increasing order.
+
+        Args:
+          center (Vector): The point to measure from.
+          radius (float): The maximum distance, inclusive.
+        """
+        center = self._point(center)
+        candidates = self._range_candidates(center - radius, center + radius)
+        offsets = self.points[candidates] - center
+        inside = np.einsum("ij,ij->i", offsets, offsets) <= radius * radius
+
+        return np.sort(candidates[inside])
+
+    def box_overlap(self, min_corner: Point, size: Size) -> np.ndarray:
+        """
+        Return the indices of the pieces whose boxes overlap the given box,
+        in increasing order. Boxes that only touch on an edge do not overlap.
+
+        Args:
+          min_corner (Vector): The minimum corner of the box.
+          size (Size): The extent of the box.
+        """
+        low = self._point(min_corner)
+        high = low + np.array([size.width, size.height, size.depth])[: len(low)]
+
+        # A piece can only overlap if its minimum corner is within the largest
+        # extent of the query box
+        candidates = self._range_candidates(low - self.max_extent, high)
+        mins = self.points[candidates]
+        maxs = mins + self.extents[candidates]
+        overlapping = np.all((mins < high) & (maxs > low), axis=1)
+
+        return np.sort(candidates[overlapping])
+
+    def _nearest_of(self, candidates: np.ndarray, center: np.ndarray, k: int):
+        """
+        Return the k candidates closest to the center, nearest first, along
+        with the distance to the furthest one returned.
+        """
+        offsets = self.points[candidates] - center
+        distances = np.einsum("ij,ij->i", offsets, offsets)
+        closest = np.argsort(distances, kind="stable")[:k]
+
+        furthest = np.sqrt(distances[closest[-1]]) if len(closest) else 0.0
+        return candidates[closest], furthest
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({len(self)} pieces)"
+
+    def __str__(self) -> str:
+        return self.__repr__()
+
+
+class UniformGridIndex(SpatialIndex):
+    """
+    Buckets positions into a uniform grid of cells, keyed by cell coordinate.
+    Best when pieces are spread fairly evenly and queries are around the size
+    of a cell.
+
+    Args:
+      positions (VectorArray|list[Vector]): The position of each piece.
+      sizes (list[Size]): The extent of each piece. Defaults to None.
+      cell_size (float): The width of each cell. Defaults to None, which picks a
+      size giving roughly one piece per cell.
+    """
+
+    def __init__(
+        self,
+        positions: Positions,
+        sizes: Optional[list[Size]] = None,
+        cell_size: Optional[float] = None,
+    ):
+        super().__init__(positions, sizes)
+
+        if cell_size is None:
+            cell_size = self._default_cell_size()
+
+        assert cell_size > 0, "Cells must have a positive size"
+        self.cell_size = cell_size
+        self.cells: dict[tuple[int, ...], np.ndarray] = {}
+
+        if len(self.points) == 0:
+            return
+
+        # Sort by cell, then split the sorted indices wherever the cell changes
+        cell_coords = np.floor(self.points / cell_size).astype(np.int64)
+        order = np.lexsort(cell_coords.T[::-1])
+        sorted_coords = cell_coords[order]
+        changes = np.any(sorted_coords[1:] != sorted_coords[:-1], axis=1)
+        starts = np.concatenate(([0], np.nonzero(changes)[0] + 1))
+        ends = np.append(starts[1:], len(order))
+
+        for start, end in zip(starts, ends):
+            self.cells[tuple(sorted_coords[start].tolist())] = order[start:end]
+
+    def _default_cell_size(self) -> float:
+        """
+        Return a cell size giving roughly one piece per cell.
+        """
+        if len(self.points) == 0:
+            return 1.0
+
+        spans = np.ptp(self.points, axis=0)
+        largest = float(spans.max())
+
+        if largest == 0:
+            return 1.0
+
+        return largest / max(len(self.points) ** (1 / self.dimension()), 1)
+
+    def _range_candidates(self, low: np.ndarray, high: np.ndarray) -> np.ndarray:
+        if not self.cells:
+            return np.empty(0, dtype=np.int64)
+
+        low_cell = np.floor(low / self.cell_size).astype(np.int64)
+        high_cell = np.floor(high / self.cell_size).astype(np.int64)
+        cell_count = np.prod(high_cell - low_cell + 1)
+
+        if cell_count > len(self.cells):
+            # Cheaper to check every occupied cell than every cell in range
+            buckets = [
+                indices
+                for key, indices in self.cells.items()
+                if np.all((low_cell <= key) & (key <= high_cell))
+            ]
+        else:
+            ranges = [range(lo, hi + 1) for lo, hi in zip(low_cell, high_cell)]
+            buckets = [
+                self.cells[key]
+                for key in itertools.product(*ranges)
+                if key in self.cells
+            ]
+
+        if not buckets:
+            return np.empty(0, dtype=np.int64)
+
+        return np.concatenate(buckets)
+
+    def k_nearest(self, center: Point, k: int) -> np.ndarray:
+        center = self._point(center)
+        radius = self.cell_size
+
+        # Any radius past the furthest corner of the bounding box reaches every piece
+        if len(self.points):
+            corner = np.maximum(
+                np.abs(center - self.lower), np.abs(center - self.upper)
+            )
+            span = float(np.linalg.norm(corner))
+        else:
+            span = 0.0
+
+        while True:
+            candidates = self.radius_query(center, radius)
+
+            if len(candidates) >= k or radius >= span:
+                nearest, furthest = self._nearest_of(candidates, center, k)
+
+                # Closer pieces outside the radius are impossible once the
+                # kth nearest is inside it
+                if furthest <= radius or radius >= span:
+                    return nearest
+
+            radius *= 2
+
+
+class KDTreeIndex(SpatialIndex):
+    """
+    A balanced k-d tree stored implicitly in a single permutation array,
+    each segment of which is split at its median along alternating axes.
+    Handles clustered pieces better than a uniform grid.
+
+    Args:
+      positions (VectorArray|list[Vector]): The position of each piece.
+      sizes (list[Size]): The extent of each piece. Defaults to None.
+      leaf_size (int): Segments this small are scanned directly rather than
+      split further. Defaults to 16.
+    """
+
+    def __init__(
+        self,
+        positions: Positions,
+        sizes: Optional[list[Size]] = None,
+        leaf_size: int = 16,
+    ):
+        super().__init__(positions, sizes)
+
+        assert leaf_size > 0, "Leaves must hold at least one piece"
+        self.leaf_size = leaf_size
+        self.order = np.arange(len(self.points))
+
+        self._build(0, len(self.points), 0)
+
+    def _build(self, low: int, high: int, depth: int):
+        """
+        Partition the segment of the order from low to high around its median,
+        then build each half.
+        """
+        if high - low <= self.leaf_size:
+            return
+
+        axis = depth % self.dimension()
+        mid = (low + high) // 2
+        segment = self.order[low:high]
+        partition = np.argpartition(self.points[segment, axis], mid - low)
+        self.order[low:high] = segment[partition]
+
+        self._build(low, mid, depth + 1)
+        self._build(mid + 1, high, depth + 1)
+
+    def _range_candidates(self, low: np.ndarray, high: np.ndarray) -> np.ndarray:
+        found = []
+        segments = [(0, len(self.points), 0)]
+
+        while segments:
+            start, end, depth = segments.pop()
+
+            if end - start <= self.leaf_size:
+                found.append(self.order[start:end])
+                continue
+
+            axis = depth % self.dimension()
+            mid = (start + end) // 2
+            pivot = self.points[self.order[mid], axis]
+            found.append(self.order[mid : mid + 1])
+
+            if low[axis] <= pivot:
+                segments.append((start, mid, depth + 1))
+            if high[axis] >= pivot:
+                segments.append((mid + 1, end, depth + 1))
+
+        if not found:
+            return np.empty(0, dtype=np.int64)
+
+        return np.concatenate(found)
+
+    def k_nearest(self, center: Point, k: int) -> np.ndarray:
+        center = self._point(center)
+        # A max heap of (-squared distance, index) holding the best k so far
+        best: list[tuple[float, int]] = []
+
+        def consider(indices: np.ndarray):
+            offsets = self.points[indices] - center
+            distances = np.einsum("ij,ij->i", offsets, offsets)
+
+            for distance, index in zip(distances.tolist(), indices.tolist()):
+                if len(best) < k:
+                    heapq.heappush(best, (-distance, index))
+                elif distance < -best[0][0]:
+                    heapq.heapreplace(best, (-distance, index))
+
+        def search(start: int, end: int, depth: int):
+            if end - start <= self.leaf_size:
+                consider(self.order[start:end])
+                return
+
+            axis = depth % self.dimension()
+            mid = (start + end) // 2
+            consider(self.order[mid : mid + 1])
+
+            offset = center[axis] - self.points[self.order[mid], axis]
+            near, far = ((start, mid), (mid + 1, end))
+            if offset > 0:
+                near, far = far, near
+
+            search(near[0], near[1], depth + 1)
+
+            # The far side can only hold closer points if the splitting plane is
+            # closer than the current kth nearest
+            if len(best) < k or offset * offset < -best[0][0]:
+                search(far[0], far[1], depth + 1)
+
+        if k > 0:
+            search(0, len(self.points), 0)
+
+        ordered = sorted(best, key=lambda item: (-item[0], item[1]))
+        return np.array([index for _distance, index in ordered], dtype=np.int64)
@@ -3,7 +3,7 @@ Helpful class for Vector and matrix operations.
 """
 
 
-from typing import Union
+from typing import Optional, Union
 
 import numpy as np
 
@@ -24,17 +24,73 @@ class Vector:
         """
         self.vector = np.array(initial_list)
 
+    @classmethod
+    def wrap(cls, array: np.ndarray) -> "Vector":
+        """
+        Wrap an existing numpy array without copying it, changes to the
+        vector will be visible in the array and vice versa.
+
+        Args:
+          array (np.ndarray): A one dimensional array.
+        """
+        vector = cls.__new__(cls)
+        vector.vector = array
+
+        return vector
+
     def magnitude(self) -> AnyNumber:
         """
         Return the magnitude of the vector.
         """
         return np.sqrt(self.dot(self))
 
-    def normalize(self) -> "Vector":
+    def normalize(self, out: Optional["Vector"] = None) -> "Vector":
         """
         Normalize the vector.
+
+        Args:
+          out (Vector): A vector to write the result into instead of allocating
+          a new one, it must have a float dtype. May be this vector.
+        """
+        if out is None:
+            return Vector.wrap(self.vector / self.magnitude())
+
+        np.divide(self.vector, self.magnitude(), out=out.vector)
+        return out
+
+    def add(
+        self, other: Union["Vector", AnyNumber], out: Optional["Vector"] = None
+    ) -> "Vector":
         """
-        return Vector(self.vector / self.magnitude())
+        Add a vector or a scalar to this one.
+
+        Args:
+          other (Vector|AnyNumber): The vector or scalar to add to this one.
+          out (Vector): A vector to write the result into instead of allocating
+          a new one. May be this vector.
+        """
+        if out is None:
+            return Vector.wrap(self.vector + _operand(other))
+
+        np.add(self.vector, _operand(other), out=out.vector)
+        return out
+
+    def sub(
+        self, other: Union["Vector", AnyNumber], out: Optional["Vector"] = None
+    ) -> "Vector":
+        """
+        Subtract a vector or a scalar from this one.
+
+        Args:
+          other (Vector|AnyNumber): The vector or scalar to subtract from this one.
+          out (Vector): A vector to write the result into instead of allocating
+          a new one. May be this vector.
+        """
+        if out is None:
+            return Vector.wrap(self.vector - _operand(other))
+
+        np.subtract(self.vector, _operand(other), out=out.vector)
+        return out
 
     def dot(self, other: "Vector") -> AnyNumber:
         """
@@ -89,10 +145,7 @@ class Vector:
         Args:
           other (Vector|AnyNumber): The vector or scalar to add to this one.
         """
-        if is_numeric(other):
-            return Vector(self.vector + other)
-
-        return Vector(self.vector + other.vector)
+        return self.add(other)
 
     def __sub__(self, other: Union["Vector", AnyNumber]) -> "Vector":
         """
@@ -101,10 +154,7 @@ class Vector:
         Args:
           other (Vector): The vector or scalar to subtract from this one.
         """
-        if is_numeric(other):
-            return Vector(self.vector - other)
-
-        return Vector(self.vector - other.vector)
+        return self.sub(other)
 
     def __mul__(self, other: Union["Vector", AnyNumber]) -> Union["Vector", AnyNumber]:
         """
@@ -114,10 +164,10 @@ class Vector:
         Args:
           other (Vector): The vector or scalar to multiply this one by.
         """
-        if is_numeric(other):
-            return Vector(self.vector * other)
+        if isinstance(other, Vector):
+            return float(self.dot(other))
 
-        return float(self.dot(other))
+        return Vector.wrap(self.vector * _operand(other))
 
     def __truediv__(self, other: Union["Vector", AnyNumber]) -> "Vector":
         """
@@ -126,10 +176,7 @@ class Vector:
         Args:
           other (Vector): The vector or scalar to divide this one by.
         """
-        if is_numeric(other):
-            return Vector(self.vector / other)
-
-        return Vector(self.vector / other.vector)
+        return Vector.wrap(self.vector / _operand(other))
 
     def __floordiv__(self, other: Union["Vector", AnyNumber]) -> "Vector":
         """
@@ -138,10 +185,62 @@ class Vector:
         Args:
           other (Vector): The vector or scalar to floor divide this one by.
         """
-        if is_numeric(other):
-            return Vector(self.vector // other)
+        return Vector.wrap(self.vector // _operand(other))
+
+    def _apply_in_place(self, ufunc: np.ufunc, other: Union["Vector", AnyNumber]):
+        """
+        Apply a numpy ufunc with this vector as the output. Falls back to
+        replacing the array when the result cannot be stored in the current
+        dtype, e.g. dividing an integer vector.
+        """
+        operand = _operand(other)
+
+        try:
+            ufunc(self.vector, operand, out=self.vector)
+        except TypeError:
+            self.vector = ufunc(self.vector, operand)
+
+        return self
+
+    def __iadd__(self, other: Union["Vector", AnyNumber]) -> "Vector":
+        """
+        Add a vector or a scalar to this one, in place.
+
+        Args:
+          other (Vector|AnyNumber): The vector or scalar to add to this one.
+        """
+        return self._apply_in_place(np.add, other)
+
+    def __isub__(self, other: Union["Vector", AnyNumber]) -> "Vector":
+        """
+        Subtract a vector or a scalar from this one, in place.
+
+        Args:
+          other (Vector|AnyNumber): The vector or scalar to subtract from this one.
+        """
+        return self._apply_in_place(np.subtract, other)
+
+    def __imul__(self, other: AnyNumber) -> "Vector":
+        """
+        Multiply the vector by a scalar, in place. Multiplying by a vector
+        still returns the dot product.
+
+        Args:
+          other (AnyNumber): The scalar to multiply this one by.
+        """
+        if isinstance(other, Vector):
+            return NotImplemented
+
+        return self._apply_in_place(np.multiply, other)
+
+    def __itruediv__(self, other: Union["Vector", AnyNumber]) -> "Vector":
+        """
+        Divide the vector by a vector or a scalar, in place.
 
-        return Vector(self.vector // other.vector)
+        Args:
+          other (Vector|AnyNumber): The vector or scalar to divide this one by.
+        """
+        return self._apply_in_place(np.true_divide, other)
 
     def angle_between(self, other: "Vector") -> AnyNumber:
         """
@@ -177,6 +276,262 @@ class Vector:
         return len(self.vector)
 
 
+def _operand(other: Union[Vector, AnyNumber, np.ndarray]):
+    """
+    Return the value to broadcast against a vector's array for an arithmetic
+    operator. Plain floats, ints and arrays are checked first, as they are the
+    common case and checking against the Number ABC is comparatively slow.
+    """
+    if type(other) in (float, int, np.ndarray) or is_numeric(other):
+        return other
+
+    return other.vector
+
+
+class VectorArray:
+    """
+    Many vectors of the same dimension stored as the rows of a single
+    (N, d) numpy array, with batched versions of the Vector operations.
+    Operators broadcast, so a VectorArray can be combined with another of
+    the same length, a single Vector, or a scalar.
+    """
+
+    def __init__(self, initial_list: Union[list[list[AnyNumber]], np.ndarray]):
+        """
+        Initialize a VectorArray, given a list of lists or a 2D array
+
+        Args:
+          initial_list (list): A list of N lists, each of d AnyNumbers.
+        """
+        self.vectors = np.array(initial_list)
+
+        if self.vectors.size == 0:
+            self.vectors = self.vectors.reshape(0, 0)
+
+        assert self.vectors.ndim == 2, "Expected a list of vectors"
+
+    @classmethod
+    def wrap(cls, array: np.ndarray) -> "VectorArray":
+        """
+        Wrap an existing (N, d) numpy array without copying it.
+
+        Args:
+          array (np.ndarray): A two dimensional array, one vector per row.
+        """
+        vector_array = cls.__new__(cls)
+        vector_array.vectors = array
+
+        return vector_array
+
+    @classmethod
+    def from_vectors(cls, vectors: list[Vector]) -> "VectorArray":
+        """
+        Stack a list of vectors into a VectorArray. The vectors are copied,
+        as they each own separate memory.
+
+        Args:
+          vectors (list[Vector]): Vectors of the same dimension.
+        """
+        return cls.wrap(np.stack([vector.vector for vector in vectors]))
+
+    def to_vectors(self) -> list[Vector]:
+        """
+        Return a Vector for each row. The vectors are views of the rows,
+        so no data is copied and changes are shared.
+        """
+        return [Vector.wrap(row) for row in self.vectors]
+
+    def dimension(self) -> int:
+        """
+        Return the dimension of each vector.
+        """
+        return self.vectors.shape[1]
+
+    def magnitude(self) -> np.ndarray:
+        """
+        Return the magnitude of each vector, as an array of length N.
+        """
+        return np.sqrt(np.einsum("ij,ij->i", self.vectors, self.vectors))
+
+    def normalize(self) -> "VectorArray":
+        """
+        Normalize each vector.
+        """
+        return VectorArray.wrap(self.vectors / self.magnitude()[:, np.newaxis])
+
+    def dot(self, other: Union["VectorArray", Vector]) -> np.ndarray:
+        """
+        Return the row-wise dot product with another VectorArray of the
+        same length, or of every vector with a single Vector.
+
+        Args:
+          other (VectorArray|Vector): The vectors to dot these with.
+        """
+        if isinstance(other, Vector):
+            return self.vectors @ other.vector
+
+        return np.einsum("ij,ij->i", self.vectors, other.vectors)
+
+    def angle_between(self, other: Union["VectorArray", Vector]) -> np.ndarray:
+        """
+        Return the row-wise angle with another VectorArray of the same
+        length, or of every vector with a single Vector.
+
+        Args:
+          other (VectorArray|Vector): The vectors to calculate the angles to.
+        """
+        cosines = self.dot(other) / (self.magnitude() * other.magnitude())
+
+        # Rounding can push the cosine of parallel vectors just past 1
+        return np.arccos(np.clip(cosines, -1, 1))
+
+    def pairwise_dot(self, other: Optional["VectorArray"] = None) -> np.ndarray:
+        """
+        Return the (N, M) matrix of dot products between every vector here and
+        every vector in other, or between these vectors if other is None.
+
+        Args:
+          other (VectorArray): The M vectors to dot these with.
+        """
+        other = self if other is None else other
+
+        return self.vectors @ other.vectors.T
+
+    def pairwise_angles(self, other: Optional["VectorArray"] = None) -> np.ndarray:
+        """
+        Return the (N, M) matrix of angles between every vector here and
+        every vector in other, or between these vectors if other is None.
+
+        Args:
+          other (VectorArray): The M vectors to calculate the angles to.
+        """
+        other = self if other is None else other
+        norms = np.outer(self.magnitude(), other.magnitude())
+
+        return np.arccos(np.clip(self.pairwise_dot(other) / norms, -1, 1))
+
+    def _operand(self, other: Union["VectorArray", Vector, AnyNumber, np.ndarray]):
+        """
+        Return the array to broadcast against for an arithmetic operator.
+        """
+        if isinstance(other, VectorArray):
+            return other.vectors
+
+        if isinstance(other, Vector):
+            return other.vector
+
+        return other
+
+    def __add__(self, other: Union["VectorArray", Vector, AnyNumber]) -> "VectorArray":
+        """
+        Add vectors, a single vector or a scalar to every vector.
+
+        Args:
+          other (VectorArray|Vector|AnyNumber): The value to add.
+        """
+        return VectorArray.wrap(self.vectors + self._operand(other))
+
+    def __sub__(self, other: Union["VectorArray", Vector, AnyNumber]) -> "VectorArray":
+        """
+        Subtract vectors, a single vector or a scalar from every vector.
+
+        Args:
+          other (VectorArray|Vector|AnyNumber): The value to subtract.
+        """
+        return VectorArray.wrap(self.vectors - self._operand(other))
+
+    def __mul__(
+        self, other: Union["VectorArray", Vector, AnyNumber, np.ndarray]
+    ) -> Union["VectorArray", np.ndarray]:
+        """
+        Multiply every vector by a scalar, or by one scalar per vector when
+        given an array of length N. Like Vector, multiplying by vectors
+        returns the dot products.
+
+        Args:
+          other (VectorArray|Vector|AnyNumber|np.ndarray): The value to multiply by.
+        """
+        if isinstance(other, (VectorArray, Vector)):
+            return self.dot(other)
+
+        return VectorArray.wrap(self.vectors * self._scalars(other))
+
+    def __truediv__(
+        self, other: Union["VectorArray", Vector, AnyNumber, np.ndarray]
+    ) -> "VectorArray":
+        """
+        Divide element-wise by vectors, or by a scalar or one scalar per vector.
+
+        Args:
+          other (VectorArray|Vector|AnyNumber|np.ndarray): The value to divide by.
+        """
+        if isinstance(other, (VectorArray, Vector)):
+            return VectorArray.wrap(self.vectors / self._operand(other))
+
+        return VectorArray.wrap(self.vectors / self._scalars(other))
+
+    def _scalars(self, other: Union[AnyNumber, np.ndarray]):
+        """
+        Reshape an array of one scalar per vector so it broadcasts over rows.
+        """
+        if isinstance(other, np.ndarray) and other.ndim == 1:
+            return other[:, np.newaxis]
+
+        return other
+
+    def __getitem__(self, index: int) -> Vector:
+        """
+        Get a single vector, as a view of its row.
+
+        Args:
+          index (int): The index of the vector to get.
+        """
+        return Vector.wrap(self.vectors[index])
+
+    def __setitem__(self, index: int, value: Union[Vector, list[AnyNumber]]):
+        """
+        Set a single vector.
+
+        Args:
+          index (int): The index of the vector to set.
+          value (Vector|list): The vector to set it to.
+        """
+        self.vectors[index] = self._operand(value)
+
+    def __eq__(self, other: Union["VectorArray", list[list[AnyNumber]]]) -> bool:
+        """
+        Check if two VectorArrays are equal.
+
+        Args:
+          other (VectorArray|list): The VectorArray or list to compare this one to.
+        """
+        return np.array_equal(self.vectors, np.asarray(self._operand(other)))
+
+    def tolist(self) -> list[list[AnyNumber]]:
+        """
+        Return the vectors as a list of lists.
+        """
+        return self.vectors.tolist()
+
+    def __len__(self) -> int:
+        """
+        Return the number of vectors.
+        """
+        return len(self.vectors)
+
+    def __repr__(self) -> str:
+        """
+        Return a string representation of the vectors.
+        """
+        return f"VectorArray({self.vectors.tolist()})"
+
+    def __str__(self) -> str:
+        """
+        Return a string representation of the vectors.
+        """
+        return self.__repr__()
+
+
 class VectorGenerator:
     """
     Static class for generating vectors, for convenience.
@@ -8,6 +8,9 @@ from typing import Any, Union
 
 AnyNumber = Union[int, float, Number]
 
+# Checked by exact type before falling back to the Number ABC, which is slow
+_PLAIN_NUMBERS = (int, float)
+
 
 def is_numeric(value: Any) -> bool:
     """
@@ -19,4 +22,7 @@ def is_numeric(value: Any) -> bool:
     Returns:
       bool: True if the value is numeric, False otherwise.
     """
-    return isinstance(value, (int, float, Number))
+    if type(value) in _PLAIN_NUMBERS:
+        return True
+
+    return isinstance(value, Number)
@@ -3,13 +3,14 @@ Classes, services and functions for working with graphs,
 nodes and edges.
 """
 
-from typing import Optional
-
-import numpy as np
+from typing import Hashable, Optional
 
 from src.tiled_tools.common.custom_typing import AnyNumber
 
-from .constants import ALPHABET, ID_SIZE
+from .ids import IdAllocator, RandomIdAllocator
+
+# Shared by nodes and edges unless replaced on either class
+DEFAULT_ID_ALLOCATOR = RandomIdAllocator()
 
 
 class Node:
@@ -17,18 +18,23 @@ class Node:
     A node is a point in a graph.
     """
 
-    def __init__(self, value=None, ident: str = ""):
+    __slots__ = ("_id", "value")
+
+    # Replace to change how IDs are generated, e.g. with a CounterIdAllocator
+    id_allocator: IdAllocator = DEFAULT_ID_ALLOCATOR
+
+    def __init__(self, value=None, ident: Hashable = ""):
         # This is helpful for search, but not necessary and there are no
         # restrictions on the ID being unique if you set it yourself.
         if ident == "":
-            self._id = "".join(np.random.choice(ALPHABET, size=ID_SIZE))
+            self._id = self.id_allocator.next_id()
         else:
             self._id = ident
 
         self.value = value
 
     @property
-    def id(self) -> str:
+    def id(self) -> Hashable:
         """
         Unique identifier for the node, for use in search.
         """
@@ -52,11 +58,20 @@ class Edge:
     An edge is a connection between two nodes.
     """
 
+    __slots__ = ("_id", "node1", "node2", "length")
+
+    # Replace to change how IDs are generated, e.g. with a CounterIdAllocator
+    id_allocator: IdAllocator = DEFAULT_ID_ALLOCATOR
+
     def __init__(
-        self, node1: Node, node2: Optional[Node], length: AnyNumber, ident: str = ""
+        self,
+        node1: Node,
+        node2: Optional[Node],
+        length: AnyNumber,
+        ident: Hashable = "",
     ):
         if ident == "":
-            self._id = np.random.choice(ALPHABET, size=ID_SIZE)
+            self._id = self.id_allocator.next_id()
         else:
             self._id = ident
 
@@ -65,7 +80,7 @@ class Edge:
         self.length = length
 
     @property
-    def id(self) -> str:
+    def id(self) -> Hashable:
         """
         Unique identifier for the edge, for use in search.
         """
@@ -78,8 +93,9 @@ class Edge:
         return self.__repr__()
 
     def __hash__(self) -> int:
-        sorted_ids = sorted([self.node1.id, self.node2.id])
-        return hash((sorted_ids[0], sorted_ids[1]))
+        # Unordered, so both directions of an edge hash the same. A frozenset
+        # also works when node IDs from different allocators are not comparable
+        return hash(frozenset((self.node1.id, self.node2.id)))
 
 
 class Graph:
@@ -102,7 +118,7 @@ class Graph:
         """
         return [edge for edge in self.edges if node in (edge.node1, edge.node2)]
 
-    def get_edge(self, ident: str) -> Optional[Edge]:
+    def get_edge(self, ident: Hashable) -> Optional[Edge]:
         """
         Get an edge by its id, if it exists.
         """
@@ -118,7 +134,7 @@ class Graph:
 
         return all_nodes
 
-    def get_node(self, ident: str) -> Optional[Node]:
+    def get_node(self, ident: Hashable) -> Optional[Node]:
         """
         Get a node by its id.
         """
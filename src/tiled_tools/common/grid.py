@@ -4,11 +4,23 @@ which is used to represent a grid of objects in the game. It was designed
 with search in mind, but can also be used as a matrix for other purposes.
 """
 
+import json
+import os
+import weakref
 from enum import Enum
-from typing import Any
+from typing import Any, Union
 
 import numpy as np
-from numpy.typing import ArrayLike
+from numpy.typing import ArrayLike, DTypeLike
+
+# Saved grids start with these bytes, followed by the header length
+# and a json header describing the cells
+GRID_FILE_MAGIC = b"TILEDGRID\x01"
+# Cell data is aligned so the memory map can be read with any dtype
+GRID_FILE_ALIGNMENT = 64
+# Bytes of cells copied at a time when saving a grid that is not contiguous,
+# such as a view, so saving never holds a second full copy in memory
+GRID_FILE_CHUNK_SIZE = 2**24
 
 
 class GridType(Enum):
@@ -35,6 +47,7 @@ class WrapDirection(Enum):
     TORUS = 3  # Both horizontal and vertical
 
 
+# pylint: disable=too-many-public-methods
 class Grid:
     """
     A grid of objects in the game.
@@ -45,6 +58,7 @@ class Grid:
         inital_list: ArrayLike,
         grid_type: GridType = GridType.TABLE,
         wrap_direction: WrapDirection = WrapDirection.NONE,
+        dtype: DTypeLike = None,
     ):
         """
 
@@ -54,16 +68,93 @@ class Grid:
           grid_type (GridType): The type of the grid. Default is GridType.TABLE.
           wrap_direction (WrapDirection): The wrap direction of the grid. Default is
           WrapDirection.NONE.
+          dtype (DTypeLike): The numpy dtype to store the cells as. Default is None,
+          which lets numpy infer it, falling back to objects. Passing a numeric or
+          structured dtype (e.g. [("value", np.int64), ("momentum", np.int8)])
+          keeps the cells in contiguous memory rather than as Python objects.
         """
 
-        self.grid = np.array(inital_list)
+        self.grid = np.array(inital_list, dtype=dtype)
 
-        self.grid_width = len(inital_list[0])
-        self.grid_height = len(inital_list)
+        self.grid_height, self.grid_width = self.grid.shape[:2]
 
         self.grid_type = grid_type
         self.wrap_direction = wrap_direction
 
+        # Set when the buffer is shared with another grid through a
+        # copy-on-write copy, the first write will then take a private copy.
+        self._copy_on_write = False
+        # The grids writing to the same buffer through views and fields, as
+        # one list shared by all of them
+        self._sharers = [weakref.ref(self)]
+
+    @classmethod
+    def _from_array(
+        cls,
+        array: np.ndarray,
+        grid_type: GridType,
+        wrap_direction: WrapDirection,
+        copy_on_write: bool = False,
+    ) -> "Grid":
+        """
+        Wrap an existing numpy array without copying it, bypassing __init__ so
+        subclasses with different constructor signatures are preserved.
+        """
+        grid = cls.__new__(cls)
+        grid.grid = array
+        grid.grid_height, grid.grid_width = array.shape[:2]
+        grid.grid_type = grid_type
+        grid.wrap_direction = wrap_direction
+        grid._copy_on_write = copy_on_write
+        grid._sharers = [weakref.ref(grid)]
+
+        return grid
+
+    def _ensure_writable(self):
+        """
+        Take a private copy of the underlying array if it is still shared
+        through a copy-on-write copy.
+        """
+        if self._copy_on_write:
+            self.grid = self.grid.copy()
+            self._copy_on_write = False
+
+            # Grids sharing the old buffer no longer share this one
+            self._sharers[:] = [ref for ref in self._sharers if ref() is not self]
+            self._sharers = [weakref.ref(self)]
+
+    def _share_with(self, grid: "Grid") -> "Grid":
+        """
+        Record that a view or field writes to the same buffer as this grid.
+        """
+        self._sharers.append(weakref.ref(grid))
+        grid._sharers = self._sharers  # pylint: disable=protected-access
+
+        return grid
+
+    def _is_shared(self) -> bool:
+        """
+        Return whether another live grid can write to this grid's buffer.
+        """
+        for ref in self._sharers:
+            grid = ref()
+            if grid is not None and grid is not self:
+                return True
+
+        return False
+
+    def __getstate__(self) -> dict:
+        # Weak references cannot be pickled, and an unpickled grid has its
+        # own buffer anyway
+        state = self.__dict__.copy()
+        del state["_sharers"]
+
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._sharers = [weakref.ref(self)]
+
     def get_grid_type(self) -> GridType:
         """
         Return the type of the grid.
@@ -82,6 +173,127 @@ class Grid:
         """
         self.wrap_direction = wrap_direction
 
+    @property
+    def dtype(self) -> np.dtype:
+        """
+        Return the numpy dtype of the cells.
+        """
+        return self.grid.dtype
+
+    def is_structured(self) -> bool:
+        """
+        Return whether the cells have multiple named fields.
+        """
+        return self.grid.dtype.names is not None
+
+    def field(self, name: str) -> "Grid":
+        """
+        Return a single field of a structured grid as its own grid. The
+        returned grid shares memory with this one, so writes are visible
+        in both.
+
+        Args:
+          name (str): The name of the field, as given in the structured dtype.
+
+        Raises:
+          AssertionError: If the grid is not structured
+        """
+        assert self.is_structured(), "Only structured grids have fields"
+
+        # The field view has to write through to this grid
+        self._ensure_writable()
+
+        return self._share_with(
+            self._from_array(self.grid[name], self.grid_type, self.wrap_direction)
+        )
+
+    def save(self, path: Union[str, os.PathLike]):
+        """
+        Save the grid to a file that can be memory mapped with open_memmap.
+        The file holds a small header with the size, grid type, wrap direction
+        and dtype, followed by the raw cell data.
+
+        Args:
+          path (str): The path of the file to write.
+
+        Raises:
+          AssertionError: If the grid holds Python objects, which have no raw
+          representation.
+        """
+        assert not self.grid.dtype.hasobject, "Cannot save a grid of objects"
+
+        header = json.dumps(
+            {
+                "width": self.width,
+                "height": self.height,
+                "grid_type": self.grid_type.value,
+                "wrap_direction": self.wrap_direction.value,
+                "dtype": np.lib.format.dtype_to_descr(self.grid.dtype),
+            }
+        ).encode("utf-8")
+
+        # Pad the header with spaces, so the cell data starts on an aligned offset
+        prefix_size = len(GRID_FILE_MAGIC) + 4 + len(header)
+        padding = -prefix_size % GRID_FILE_ALIGNMENT
+        header += b" " * padding
+
+        with open(path, "wb") as grid_file:
+            grid_file.write(GRID_FILE_MAGIC)
+            grid_file.write(len(header).to_bytes(4, "little"))
+            grid_file.write(header)
+            if self.grid.flags.c_contiguous:
+                self.grid.tofile(grid_file)
+            else:
+                row_size = max(1, self.width * self.grid.dtype.itemsize)
+                rows = max(1, GRID_FILE_CHUNK_SIZE // row_size)
+                for row in range(0, self.height, rows):
+                    np.ascontiguousarray(self.grid[row : row + rows]).tofile(grid_file)
+
+    @classmethod
+    def open_memmap(cls, path: Union[str, os.PathLike], mode: str = "r") -> "Grid":
+        """
+        Open a grid saved with save as a memory map, so the cells are only
+        read from disk when accessed. Several processes can open the same file
+        and share the pages through the OS cache.
+
+        Args:
+          path (str): The path of the file to open.
+          mode (str): "r" for read-only, "r+" to write changes back to the file,
+          or "c" for copy-on-write changes that are never written back.
+          Default is "r".
+
+        Raises:
+          AssertionError: If the file is not a saved grid.
+        """
+        with open(path, "rb") as grid_file:
+            magic = grid_file.read(len(GRID_FILE_MAGIC))
+            assert magic == GRID_FILE_MAGIC, f"{path} is not a saved grid"
+
+            header_size = int.from_bytes(grid_file.read(4), "little")
+            header = json.loads(grid_file.read(header_size).decode("utf-8"))
+
+        cells = np.memmap(
+            path,
+            dtype=np.lib.format.descr_to_dtype(header["dtype"]),
+            mode=mode,
+            offset=len(GRID_FILE_MAGIC) + 4 + header_size,
+            shape=(header["height"], header["width"]),
+        )
+
+        return cls._from_array(
+            cells,
+            GridType(header["grid_type"]),
+            WrapDirection(header["wrap_direction"]),
+        )
+
+    def flush(self):
+        """
+        Write any changes to a memory mapped grid back to its file. Does
+        nothing for grids held in memory.
+        """
+        if isinstance(self.grid, np.memmap):
+            self.grid.flush()
+
     def get_grid(self) -> np.ndarray:
         """
         Return the grid as a numpy array.
@@ -94,11 +306,109 @@ class Grid:
         """
         return [row.tolist() for row in self.grid]
 
-    def copy(self) -> "Grid":
+    def copy(self, copy_on_write: bool = False) -> "Grid":
         """
-        Return a copy of the grid.
-        """
-        return Grid(self.tolist(), self.grid_type, self.wrap_direction)
+        Return a copy of the grid. The copy is shallow, cells holding objects
+        will reference the same objects as the original grid.
+
+        Args:
+          copy_on_write (bool): If True, the copy shares the underlying array
+          with this grid until either of them is written to through set,
+          set_row or set_col. Useful when taking many snapshots that are
+          rarely modified, such as during search. Views and fields taken
+          earlier can still write to the array, so while any are alive the
+          copy is a real one. So is the copy of a writable memory mapped
+          grid, which has to keep writing to its file. Default is False.
+        """
+        writable_memmap = isinstance(self.grid, np.memmap) and self.grid.flags.writeable
+        if not copy_on_write or writable_memmap or self._is_shared():
+            return self._from_array(
+                self.grid.copy(), self.grid_type, self.wrap_direction
+            )
+
+        # Both sides must copy before writing, otherwise a write to the
+        # original would leak into the snapshot.
+        shared = self.grid.view()
+        shared.flags.writeable = False
+        self.grid = shared
+        self._copy_on_write = True
+
+        return self._from_array(
+            shared, self.grid_type, self.wrap_direction, copy_on_write=True
+        )
+
+    def view(self, col: int, row: int, width: int, height: int) -> "Grid":
+        """
+        Return a rectangular window of the grid that shares the underlying
+        array, so writes to the view are visible in this grid and vice versa.
+
+        On wrapped axes the starting coordinate may be given out of bounds and
+        is wrapped around, but the window itself cannot cross the seam, as that
+        would not be representable without copying. The view only keeps the
+        wrap direction for axes it spans completely, as a partial window does
+        not connect to its opposite edge.
+
+        Args:
+          col (int): The leftmost column of the window.
+          row (int): The top row of the window.
+          width (int): The number of columns in the window.
+          height (int): The number of rows in the window.
+
+        Raises:
+          AssertionError: If the window does not fit inside the grid, or a
+          hex view would start on an odd column.
+        """
+        wrap_horizontal = self.wrap_direction in (
+            WrapDirection.HORIZONTAL,
+            WrapDirection.TORUS,
+        )
+        wrap_vertical = self.wrap_direction in (
+            WrapDirection.VERTICAL,
+            WrapDirection.TORUS,
+        )
+
+        if wrap_horizontal:
+            col %= self.width
+        if wrap_vertical:
+            row %= self.height
+
+        assert width > 0 and height > 0, "A view must have a positive size"
+        assert (
+            0 <= col and col + width <= self.width
+        ), f"Columns {col} to {col + width} are outside of the grid"
+        assert (
+            0 <= row and row + height <= self.height
+        ), f"Rows {row} to {row + height} are outside of the grid"
+
+        # Hex neighbors depend on the parity of the column, so shifting by
+        # an odd number of columns would change the shape of the grid
+        assert (
+            self.grid_type != GridType.HEX or col % 2 == 0
+        ), "Hex grid views must start on an even column"
+
+        keep_horizontal = wrap_horizontal and width == self.width
+        keep_vertical = wrap_vertical and height == self.height
+
+        if keep_horizontal and keep_vertical:
+            wrap_direction = WrapDirection.TORUS
+        elif keep_horizontal:
+            wrap_direction = WrapDirection.HORIZONTAL
+        elif keep_vertical:
+            wrap_direction = WrapDirection.VERTICAL
+        else:
+            wrap_direction = WrapDirection.NONE
+
+        # The view has to write through to this grid, so it cannot share a
+        # buffer that is still copy-on-write
+        self._ensure_writable()
+
+        return self._share_with(
+            self._from_array(
+                self.grid[row : row + height, col : col + width],
+                self.grid_type,
+                wrap_direction,
+            )
+        )
 
     @property
     def width(self) -> int:
@@ -122,7 +432,7 @@ class Grid:
             col (int): The column of the cell to get.
             row (int): The row of the cell to get.
         """
-        return self.grid[row][col]
+        return self.grid[row, col]
 
     def set(self, col: int, row: int, value: Any):
         """
@@ -133,7 +443,8 @@ class Grid:
             row (int): The row of the cell to set.
             value (Any): The value to set the cell to.
         """
-        self.grid[row][col] = value
+        self._ensure_writable()
+        self.grid[row, col] = value
 
     def get_row(self, row: int) -> list[Any]:
         """
@@ -151,12 +462,14 @@ class Grid:
         """
         Set the values in a given row.
         """
+        self._ensure_writable()
         self.grid[row] = values
 
     def set_col(self, col: int, values: list[Any]):
         """
         Set the values in a given column.
         """
+        self._ensure_writable()
         self.grid[:, col] = values
 
     def get_adjacent(self, col: int, row: int) -> list[Any]:
@@ -230,9 +543,12 @@ class HexGrid(Grid):
     """
 
     def __init__(
-        self, inital_list: ArrayLike, wrap_direction: WrapDirection = WrapDirection.NONE
+        self,
+        inital_list: ArrayLike,
+        wrap_direction: WrapDirection = WrapDirection.NONE,
+        dtype: DTypeLike = None,
     ):
-        super().__init__(inital_list, GridType.HEX, wrap_direction)
+        super().__init__(inital_list, GridType.HEX, wrap_direction, dtype)
 
 
 # pylint: disable=too-few-public-methods
@@ -246,16 +562,48 @@ class GridGenerator:
         size: int,
         grid_type: GridType = GridType.TABLE,
         wrap_direction: WrapDirection = WrapDirection.NONE,
+        dtype: DTypeLike = float,
     ) -> Grid:
         """
         Return an identity grid of a given size.
 
         Args:
           size (int): The size of the grid to initialize.
+          dtype (DTypeLike): The dtype of the cells. Default is float.
         """
-        grid = np.zeros((size, size))
-        for i in range(size):
-            grid[i][i] = 1
+        grid = np.identity(size, dtype=dtype)
+
+        return Grid(grid, grid_type, wrap_direction)
+
+    # pylint: disable=too-many-arguments
+    @staticmethod
+    def filled(
+        width: int,
+        height: int,
+        fill_value: Any,
+        *,
+        dtype: DTypeLike = None,
+        grid_type: GridType = GridType.TABLE,
+        wrap_direction: WrapDirection = WrapDirection.NONE,
+    ) -> Grid:
+        """
+        Return a grid with every cell set to the same value.
+
+        Args:
+          width (int): The width of the grid.
+          height (int): The height of the grid.
+          fill_value (Any): The value of each cell, a tuple for structured dtypes.
+          Objects are not copied, so every cell will reference the same object.
+          dtype (DTypeLike): The dtype of the cells. Default is None, which lets
+          numpy infer it from the fill value. Required for structured dtypes.
+        """
+        if dtype is None:
+            dtype = np.asarray(fill_value).dtype
+
+        # np.full would broadcast a tuple across the columns of a structured
+        # grid, instead of treating it as a single record
+        grid = np.empty((height, width), dtype=dtype)
+        grid[...] = fill_value
 
         return Grid(grid, grid_type, wrap_direction)
 
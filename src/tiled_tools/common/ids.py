@@ -0,0 +1,116 @@
+# pylint: disable=too-few-public-methods
+"""
+Allocators for the identifiers of nodes, edges and anything else that
+needs a cheap unique ID. Generating IDs one at a time through numpy is slow
+enough to dominate building large graphs, so these avoid numpy entirely.
+"""
+
+import itertools
+import os
+import threading
+from typing import Callable, Hashable
+
+from .constants import ALPHABET, ID_SIZE
+
+# Each byte is mapped to a character of the alphabet. Bytes past the largest
+# multiple of the alphabet size are dropped, so every character is equally likely.
+_ALPHABET_BYTES = "".join(ALPHABET.tolist()).encode("ascii")
+_USABLE_BYTES = 256 - 256 % len(_ALPHABET_BYTES)
+_BYTE_TABLE = bytes(_ALPHABET_BYTES[i % len(_ALPHABET_BYTES)] for i in range(256))
+_REJECTED_BYTES = bytes(range(_USABLE_BYTES, 256))
+
+
+class IdAllocator:
+    """
+    An abstract allocator that defines the interface for all ID allocators
+    """
+
+    def next_id(self) -> Hashable:
+        """
+        Returns a new identifier
+        """
+        raise NotImplementedError
+
+    def __call__(self) -> Hashable:
+        return self.next_id()
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}()"
+
+    def __str__(self) -> str:
+        return self.__repr__()
+
+
+class CounterIdAllocator(IdAllocator):
+    """
+    Allocates increasing integers, the cheapest option when IDs only need
+    to be unique within a single process.
+
+    Args:
+        start (int): The first ID to allocate. Defaults to 0.
+    """
+
+    def __init__(self, start: int = 0):
+        # next() on itertools.count is atomic, so no lock is needed
+        self.counter = itertools.count(start)
+
+    def next_id(self) -> int:
+        return next(self.counter)
+
+
+class RandomIdAllocator(IdAllocator):
+    """
+    Allocates random strings from the ALPHABET constant, reading random bytes
+    from the OS in batches rather than once per ID.
+
+    Args:
+        size (int): The length of each ID. Defaults to ID_SIZE.
+        batch_size (int): How many IDs to generate per read. Defaults to 1024.
+    """
+
+    def __init__(self, size: int = ID_SIZE, batch_size: int = 1024):
+        self.size = size
+        self.batch_size = batch_size
+        self.pool = ""
+        self.position = 0
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        """
+        Replace the pool with a new batch of random characters
+        """
+        needed = self.size * self.batch_size
+        characters = b""
+
+        while len(characters) < needed:
+            raw = os.urandom(needed - len(characters) + 16)
+            characters += raw.translate(_BYTE_TABLE, _REJECTED_BYTES)
+
+        self.pool = characters[:needed].decode("ascii")
+        self.position = 0
+
+    def next_id(self) -> str:
+        with self.lock:
+            if self.position >= len(self.pool):
+                self._refill()
+
+            start = self.position
+            self.position += self.size
+
+            return self.pool[start : self.position]
+
+
+class FunctionIdAllocator(IdAllocator):
+    """
+    Allocates IDs by calling a function provided by the caller, for example
+    to reuse IDs from an external store.
+
+    Args:
+        factory (Callable): Called with no arguments for every new ID.
+    """
+
+    def __init__(self, factory: Callable[[], Hashable]):
+        self.factory = factory
+
+    def next_id(self) -> Hashable:
+        return self.factory()
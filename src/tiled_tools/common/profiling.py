@@ -0,0 +1,172 @@
+"""
+Built-in profiling for long runs, like map generation or batches of game
+simulations. A sampling profiler records the call stack of the profiled
+thread from a background thread, which is cheap enough to leave on for a
+whole run, and writes collapsed stacks for flamegraph tools:
+
+    with Profile("collapse.folded") as profile:
+        wfc = WaveFunctionCollapse(ruleset, grid, ratios, counters=profile.counters)
+        wfc.collapse()
+
+    print(profile.counters.report())
+"""
+
+import sys
+import threading
+import time
+from collections import Counter
+from types import FrameType
+from typing import Optional
+
+
+class PhaseCounters:
+    """
+    Counts of the work done during a run, e.g. cells observed or slides,
+    reported as totals and rates per second since the counters were created
+    """
+
+    def __init__(self):
+        self.counts: Counter = Counter()
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+
+    def increment(self, name: str, amount: int = 1):
+        """Increase a counter"""
+        self.counts[name] += amount
+
+    def stop(self):
+        """Stop the clock, so rates no longer change"""
+        self.end = time.perf_counter()
+
+    def elapsed(self) -> float:
+        """Seconds from creation until stopped, or until now"""
+        end = self.end if self.end is not None else time.perf_counter()
+        return end - self.start
+
+    def rates(self) -> dict[str, float]:
+        """Each counter per second"""
+        elapsed = self.elapsed() or float("inf")
+        return {name: count / elapsed for name, count in self.counts.items()}
+
+    def report(self) -> str:
+        """A line per counter, with its total and rate"""
+        rates = self.rates()
+        lines = [f"elapsed: {self.elapsed():.3f}s"]
+        for name, count in sorted(self.counts.items()):
+            lines.append(f"{name}: {count} ({rates[name]:.1f}/s)")
+
+        return "\n".join(lines)
+
+
+class SamplingProfiler:
+    """
+    Samples the call stack of a thread at a fixed interval, from a
+    background thread. Stacks are kept collapsed, as "outer;...;inner" to
+    the number of samples seen
+
+    Args:
+        interval: Seconds between samples
+        thread_id: The thread to sample, defaults to the thread starting the profiler
+    """
+
+    def __init__(self, interval: float = 0.005, thread_id: Optional[int] = None):
+        self.interval = interval
+        self.thread_id = thread_id
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stopping = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start sampling in a background thread"""
+        assert self._sampler is None, "Profiler already started"
+
+        if self.thread_id is None:
+            self.thread_id = threading.get_ident()
+
+        self._stopping.clear()
+        self._sampler = threading.Thread(
+            target=self._sample_loop, name="sampling-profiler", daemon=True
+        )
+        self._sampler.start()
+
+    def stop(self):
+        """Stop sampling, waiting for the background thread to finish"""
+        if self._sampler is None:
+            return
+
+        self._stopping.set()
+        self._sampler.join()
+        self._sampler = None
+
+    def _sample_loop(self):
+        while not self._stopping.wait(self.interval):
+            # pylint: disable=protected-access
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+
+            self.stacks[self.collapse_frame(frame)] += 1
+            self.samples += 1
+
+    @staticmethod
+    def collapse_frame(frame: FrameType) -> str:
+        """The stack of a frame as "outer;...;inner", each as module:function"""
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            module = frame.f_globals.get("__name__", "?")
+            names.append(f"{module}:{code.co_name}")
+            frame = frame.f_back
+
+        return ";".join(reversed(names))
+
+    def collapsed(self) -> str:
+        """The samples in collapsed stack format, one "stack count" per line"""
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self.stacks.most_common()
+        )
+
+    def write_collapsed(self, path: str):
+        """Write the collapsed stacks, for flamegraph.pl or speedscope"""
+        with open(path, "w", encoding="utf-8") as output:
+            output.write(self.collapsed())
+
+    def __enter__(self) -> "SamplingProfiler":
+        self.start()
+        return self
+
+    def __exit__(self, *_args):
+        self.stop()
+        return False
+
+
+class Profile:
+    """
+    Profiles a block, sampling it if given a path for the collapsed stacks,
+    and counting phases either way
+
+    Args:
+        output: Path to write collapsed stacks to, None to skip sampling
+        interval: Seconds between samples
+    """
+
+    def __init__(self, output: Optional[str] = None, interval: float = 0.005):
+        self.output = output
+        self.profiler = SamplingProfiler(interval) if output else None
+        self.counters = PhaseCounters()
+
+    def __enter__(self) -> "Profile":
+        self.counters = PhaseCounters()
+        if self.profiler is not None:
+            self.profiler.start()
+
+        return self
+
+    def __exit__(self, *_args):
+        self.counters.stop()
+        if self.profiler is not None:
+            self.profiler.stop()
+            self.profiler.write_collapsed(self.output)
+
+        return False
@@ -0,0 +1,283 @@
+"""
+A sparse alternative to the Grid class, for very large worlds that are mostly
+empty. Cells are stored in fixed-size square chunks that are only allocated
+the first time a cell inside them is set to something other than the fill
+value, so memory grows with the populated area rather than the bounding box.
+"""
+
+from typing import Any, Iterator
+
+import numpy as np
+from numpy.typing import DTypeLike
+
+from .grid import Grid, GridHelper, GridType, WrapDirection
+
+
+# pylint: disable=too-many-instance-attributes
+class SparseGrid:
+    """
+    A grid with the same interface as Grid, backed by chunks allocated on
+    first write.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        fill_value: Any = 0,
+        *,
+        dtype: DTypeLike = None,
+        chunk_size: int = 64,
+        grid_type: GridType = GridType.TABLE,
+        wrap_direction: WrapDirection = WrapDirection.NONE,
+    ):
+        """
+
+        Args:
+          width (int): The width of the grid.
+          height (int): The height of the grid.
+          fill_value (Any): The value of every cell that has not been set. Default is 0.
+          dtype (DTypeLike): The dtype of the cells. Default is None, which lets
+          numpy infer it from the fill value.
+          chunk_size (int): The width and height of each chunk. Default is 64.
+          grid_type (GridType): The type of the grid. Default is GridType.TABLE.
+          wrap_direction (WrapDirection): The wrap direction of the grid. Default is
+          WrapDirection.NONE.
+        """
+        assert width > 0 and height > 0, "A grid must have a positive size"
+        assert chunk_size > 0, "Chunks must have a positive size"
+
+        self.grid_width = width
+        self.grid_height = height
+        self.fill_value = fill_value
+        self.cell_dtype = (
+            np.asarray(fill_value).dtype if dtype is None else np.dtype(dtype)
+        )
+        self.chunk_size = chunk_size
+
+        self.grid_type = grid_type
+        self.wrap_direction = wrap_direction
+
+        # Keyed by (chunk column, chunk row)
+        self.chunks: dict[tuple[int, int], np.ndarray] = {}
+
+    def get_grid_type(self) -> GridType:
+        """
+        Return the type of the grid.
+        """
+        return self.grid_type
+
+    def get_wrap_direction(self) -> WrapDirection:
+        """
+        Return the wrap direction of the grid.
+        """
+        return self.wrap_direction
+
+    def set_wrap_direction(self, wrap_direction: WrapDirection):
+        """
+        Set the wrap direction of the grid.
+        """
+        self.wrap_direction = wrap_direction
+
+    @property
+    def width(self) -> int:
+        """
+        Return the width of the grid.
+        """
+        return self.grid_width
+
+    @property
+    def height(self) -> int:
+        """
+        Return the height of the grid.
+        """
+        return self.grid_height
+
+    @property
+    def dtype(self) -> np.dtype:
+        """
+        Return the numpy dtype of the cells.
+        """
+        return self.cell_dtype
+
+    def _locate(self, col: int, row: int) -> tuple[tuple[int, int], int, int]:
+        """
+        Return the key of the chunk holding a cell, and the position of the
+        cell inside the chunk.
+        """
+        assert (
+            0 <= col < self.width and 0 <= row < self.height
+        ), f"({col}, {row}) is outside of the grid"
+
+        chunk_col, inner_col = divmod(col, self.chunk_size)
+        chunk_row, inner_row = divmod(row, self.chunk_size)
+
+        return (chunk_col, chunk_row), inner_col, inner_row
+
+    def _new_chunk(self) -> np.ndarray:
+        """
+        Return a chunk with every cell set to the fill value.
+        """
+        chunk = np.empty((self.chunk_size, self.chunk_size), dtype=self.cell_dtype)
+        chunk[...] = self.fill_value
+
+        return chunk
+
+    def _fill_array(self) -> np.ndarray:
+        """
+        Return the fill value as a zero dimensional array of the cell dtype,
+        so it can be compared against whole chunks.
+        """
+        return np.asarray(self.fill_value, dtype=self.cell_dtype)
+
+    def get(self, col: int, row: int) -> Any:
+        """
+        Get the value of a cell in the grid.
+
+        Args:
+            col (int): The column of the cell to get.
+            row (int): The row of the cell to get.
+        """
+        key, inner_col, inner_row = self._locate(col, row)
+        chunk = self.chunks.get(key)
+
+        if chunk is None:
+            return self.fill_value
+
+        return chunk[inner_row, inner_col]
+
+    def set(self, col: int, row: int, value: Any):
+        """
+        Set the value of a cell in the grid. Setting an unallocated cell to
+        the fill value does not allocate its chunk.
+
+        Args:
+            col (int): The column of the cell to set.
+            row (int): The row of the cell to set.
+            value (Any): The value to set the cell to.
+        """
+        key, inner_col, inner_row = self._locate(col, row)
+        chunk = self.chunks.get(key)
+
+        if chunk is None:
+            if np.array_equal(value, self.fill_value):
+                return
+
+            chunk = self._new_chunk()
+            self.chunks[key] = chunk
+
+        chunk[inner_row, inner_col] = value
+
+    def get_row(self, row: int) -> list[Any]:
+        """
+        Return a list of values in a given row.
+        """
+        return [self.get(c, row) for c in range(self.width)]
+
+    def get_col(self, col: int) -> list[Any]:
+        """
+        Return a list of values in a given column.
+        """
+        return [self.get(col, r) for r in range(self.height)]
+
+    def set_row(self, row: int, values: list[Any]):
+        """
+        Set the values in a given row.
+        """
+        for c, value in enumerate(values):
+            self.set(c, row, value)
+
+    def set_col(self, col: int, values: list[Any]):
+        """
+        Set the values in a given column.
+        """
+        for r, value in enumerate(values):
+            self.set(col, r, value)
+
+    def get_adjacent(self, col: int, row: int) -> list[Any]:
+        """
+        Return a list of adjacent values to a given cell.
+        """
+        adjacent_coords = self.get_adjacent_coords(col, row)
+
+        return [self.get(c, r) for c, r in adjacent_coords]
+
+    def get_adjacent_coords(self, col: int, row: int) -> list[tuple[int, int]]:
+        """
+        Return a list the adjacent coordinates to a given cell.
+        """
+        adjacent_coords = GridHelper.get_neighbor_coords(self.grid_type, col, row)
+
+        return GridHelper.filter_coords(self, adjacent_coords)
+
+    def populated_chunks(self) -> int:
+        """
+        Return the number of chunks that have been allocated.
+        """
+        return len(self.chunks)
+
+    def iter_chunks(self) -> Iterator[tuple[int, int, np.ndarray]]:
+        """
+        Iterate over the allocated chunks only, yielding the column and row of
+        the top left cell of each chunk and a view of its cells. Chunks on the
+        right and bottom edges are clipped to the grid.
+        """
+        for (chunk_col, chunk_row), chunk in self.chunks.items():
+            col = chunk_col * self.chunk_size
+            row = chunk_row * self.chunk_size
+
+            yield col, row, chunk[: self.height - row, : self.width - col]
+
+    def iter_populated(self) -> Iterator[tuple[int, int, Any]]:
+        """
+        Iterate over every cell in the allocated chunks that differs from
+        the fill value, yielding its column, row and value.
+        """
+        for col, row, chunk in self.iter_chunks():
+            for inner_row, inner_col in zip(*np.nonzero(chunk != self._fill_array())):
+                yield (
+                    col + int(inner_col),
+                    row + int(inner_row),
+                    chunk[inner_row, inner_col],
+                )
+
+    def copy(self) -> "SparseGrid":
+        """
+        Return a copy of the grid, copying only the allocated chunks.
+        """
+        sparse = SparseGrid(
+            self.width,
+            self.height,
+            self.fill_value,
+            dtype=self.cell_dtype,
+            chunk_size=self.chunk_size,
+            grid_type=self.grid_type,
+            wrap_direction=self.wrap_direction,
+        )
+        sparse.chunks = {key: chunk.copy() for key, chunk in self.chunks.items()}
+
+        return sparse
+
+    def to_grid(self) -> Grid:
+        """
+        Return a dense Grid with the same cells. Only sensible for grids
+        small enough to fit in memory.
+        """
+        dense = np.empty((self.height, self.width), dtype=self.cell_dtype)
+        dense[...] = self.fill_value
+
+        for col, row, chunk in self.iter_chunks():
+            height, width = chunk.shape
+            dense[row : row + height, col : col + width] = chunk
+
+        return Grid(dense, self.grid_type, self.wrap_direction)
+
+    def __repr__(self):
+        return (
+            f"SparseGrid({self.width}x{self.height}, "
+            f"{self.populated_chunks()} chunks of {self.chunk_size})"
+        )
+
+    def __str__(self):
+        return self.__repr__()
@@ -0,0 +1,160 @@
+"""
+Streaming statistics, updated one value at a time in constant memory. Every
+accumulator can be merged with another of the same kind, so work split across
+processes can be summarized separately and combined afterwards.
+"""
+
+import math
+from collections import Counter
+from typing import Iterable, Optional
+
+from src.tiled_tools.common.custom_typing import AnyNumber
+
+
+class RunningMoments:
+    """
+    Count, mean, variance, min and max, using Welford's update, which
+    stays accurate where summing squares would lose precision
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        # Sum of squared differences from the mean
+        self.m2 = 0.0
+        self.min: Optional[AnyNumber] = None
+        self.max: Optional[AnyNumber] = None
+
+    def add(self, value: AnyNumber):
+        """Include a value"""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def extend(self, values: Iterable[AnyNumber]):
+        """Include every value"""
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: "RunningMoments"):
+        """Include every value another accumulator has seen (Chan et al.)"""
+        if other.count == 0:
+            return
+
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return
+
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def variance(self, sample: bool = True) -> float:
+        """The sample variance, or the population variance"""
+        denominator = self.count - 1 if sample else self.count
+        if denominator <= 0:
+            return 0.0
+
+        return self.m2 / denominator
+
+    def std(self, sample: bool = True) -> float:
+        """The sample standard deviation, or the population one"""
+        return math.sqrt(self.variance(sample))
+
+
+class Histogram:
+    """
+    Counts of discrete values, like the exponent of a tile
+    """
+
+    def __init__(self):
+        self.counts: Counter = Counter()
+
+    def add(self, value, count: int = 1):
+        """Count a value"""
+        self.counts[value] += count
+
+    def merge(self, other: "Histogram"):
+        """Include every count of another histogram"""
+        self.counts.update(other.counts)
+
+    def total(self) -> int:
+        """The number of values counted"""
+        return sum(self.counts.values())
+
+    def to_dict(self) -> dict:
+        """The counts, ordered by value"""
+        return dict(sorted(self.counts.items()))
+
+
+class QuantileSketch:
+    """
+    Approximate quantiles of non-negative values. Values are counted in
+    buckets growing geometrically, so any quantile is within the relative
+    accuracy of the true value, in memory logarithmic in the range of values
+    (the DDSketch approach)
+
+    Args:
+        relative_accuracy: The largest relative error of a quantile
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        assert 0 < relative_accuracy < 1, "Relative accuracy must be in (0, 1)"
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets: Counter = Counter()
+        self.zeros = 0
+        self.count = 0
+
+    def add(self, value: AnyNumber):
+        """Include a value"""
+        assert value >= 0, "Only non-negative values are supported"
+        self.count += 1
+
+        if value == 0:
+            self.zeros += 1
+        else:
+            self.buckets[math.ceil(math.log(value) / self.log_gamma)] += 1
+
+    def merge(self, other: "QuantileSketch"):
+        """Include every value another sketch has seen, at the same accuracy"""
+        assert (
+            self.relative_accuracy == other.relative_accuracy
+        ), "Sketches must have the same relative accuracy to merge"
+        self.buckets.update(other.buckets)
+        self.zeros += other.zeros
+        self.count += other.count
+
+    def quantile(self, q: float) -> Optional[float]:
+        """The approximate value at quantile q in [0, 1], None if empty"""
+        assert 0 <= q <= 1, "Quantile must be in [0, 1]"
+        if self.count == 0:
+            return None
+
+        rank = q * (self.count - 1)
+        if rank < self.zeros:
+            return 0.0
+
+        seen = self.zeros
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                # The value with the least relative error to the whole bucket
+                return 2 * self.gamma**index / (self.gamma + 1)
+
+        return None
+
+    def quantiles(self, qs: Iterable[float]) -> dict[float, Optional[float]]:
+        """Several quantiles at once"""
+        return {q: self.quantile(q) for q in qs}
@@ -3,6 +3,7 @@ from enum import Enum
 from typing import Optional
 
 from src.tiled_tools.common.grid import Grid, WrapDirection
+from src.tiled_tools.common.profiling import PhaseCounters
 from src.tiled_tools.common.queues import Queue
 
 from .map import ISLAND_RULESET, TileRuleSet, TileType
@@ -68,11 +69,14 @@ class WaveFunctionCollapse:
         grid: Grid,
         desired_ratios: dict[TileType, float],
         neighbor_depth: int = 1,
+        counters: Optional[PhaseCounters] = None,
     ):
         self.ruleset = ruleset
         self.grid = grid
         self.desired_ratios = desired_ratios
         self.neighbor_depth = neighbor_depth
+        # Counts cells observed and propagation steps, when profiling
+        self.counters = counters
 
     def collapse(self):
         """
@@ -97,6 +101,9 @@ class WaveFunctionCollapse:
 
         cell.collapse(observed)
 
+        if self.counters is not None:
+            self.counters.increment("cells_observed")
+
     def remove_global_contrary_states(self):
         """
         This is not much of a problem on the 2D grid, but may be on
@@ -136,6 +143,9 @@ class WaveFunctionCollapse:
             to_collapsed = collapsing.pop()
             visited.add(to_collapsed)
 
+            if self.counters is not None:
+                self.counters.increment("propagation_steps")
+
             collapsed_cell = self.grid.get(*to_collapsed)
 
             for c, r in self.grid.get_adjacent_coords(*to_collapsed):
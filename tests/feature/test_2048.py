@@ -2,16 +2,31 @@
 
 import json
 import unittest
+import uuid
 
-from src.backend.app import app, db
+from src.backend.app import (
+    GameError,
+    GameErrorCode,
+    GameModel2048,
+    GameMove2048,
+    GameObject2048,
+    create_app,
+    db,
+    init_db,
+    services,
+)
+from src.backend.concurrency import LockStripes
+from src.games.twenty_forty_eight.game import GameConfig
+
+app = create_app({"TESTING": True})
 
 
 class TestBackend(unittest.TestCase):
     def setUp(self) -> None:
-        app.config["TESTING"] = True
-        with app.app_context():
-            db.create_all()
+        init_db(app)
 
+        self.context = app.app_context()
+        self.context.push()
         self.client = app.test_client()
 
     def test_new_game_persistence(self):
@@ -49,7 +64,191 @@ class TestBackend(unittest.TestCase):
         self.assertEqual(slide_response.status_code, 200)
         self.assertTrue(slide_response_dict["game"])
 
-    def tearDown(self):
+    def test_delta_slide(self):
+        game_uuid = str(GameObject2048().game_uuid)
+        game = self.client.get("/get_game/v1", query_string={"game_uuid": game_uuid})
+        grid = game.json["game"]["grid"]
+        score = game.json["game"]["score"]
+
+        slide_response = self.client.post(
+            "/perform_slide/v1",
+            json={
+                "game_uuid": game_uuid,
+                "slide_direction": "down",
+                "response_mode": "delta",
+            },
+        )
+        delta = slide_response.json["delta"]
+        self.assertEqual(slide_response.status_code, 200)
+        self.assertNotIn("game", slide_response.json)
+
+        for c, r, value in delta["changed"]:
+            grid[r][c] = value
+
+        saved_game = GameObject2048(game_uuid).game
+        self.assertEqual(saved_game.grid_values(), grid)
+        self.assertEqual(saved_game.score, score + delta["score_delta"])
+        self.assertEqual(saved_game.checksum(), delta["checksum"])
+        self.assertEqual(
+            [list(location) for location in saved_game.latest_spawn_locations],
+            delta["spawn_locations"],
+        )
+
+        bad_response = self.client.post(
+            "/perform_slide/v1",
+            json={
+                "game_uuid": game_uuid,
+                "slide_direction": "down",
+                "response_mode": "patch",
+            },
+        )
+        self.assertEqual(bad_response.status_code, 400)
+
+    def test_game_not_found(self):
+        game_uuid = str(uuid.uuid4())
+
+        response = self.client.get(
+            "/get_game/v1", query_string={"game_uuid": game_uuid}
+        )
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(
+            response.json["error"], f"Game with UUID {game_uuid} not found"
+        )
+
+        response = self.client.post(
+            "/perform_slide/v1", json={"game_uuid": game_uuid, "slide_direction": "up"}
+        )
+        self.assertEqual(response.status_code, 404)
+
+        response = self.client.get(
+            "/spectate_game/v1", query_string={"game_uuid": game_uuid}
+        )
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(
+            services(app).spectators.spectator_count(uuid.UUID(game_uuid)), 0
+        )
+
+    def test_spectate(self):
+        game_uuid = str(GameObject2048().game_uuid)
+        stream = self.client.get(
+            "/spectate_game/v1", query_string={"game_uuid": game_uuid}, buffered=False
+        )
+        self.assertEqual(stream.mimetype, "text/event-stream")
+
+        slide_response = self.client.post(
+            "/perform_slide/v1",
+            json={"game_uuid": game_uuid, "slide_direction": "left"},
+        )
+
+        frames = iter(stream.response)
+        game_event = next(frames).decode()
+        slide_event = next(frames).decode()
+        stream.close()
+
+        self.assertTrue(game_event.startswith("event: game\n"))
+        self.assertTrue(slide_event.startswith("event: slide\n"))
+        slide_data = json.loads(slide_event.splitlines()[1][len("data: ") :])
+        self.assertEqual(slide_data["version"], 1)
+        self.assertEqual(slide_data["game"], slide_response.json["game"])
+        self.assertEqual(
+            services(app).spectators.spectator_count(uuid.UUID(game_uuid)), 0
+        )
+
+    def test_metrics(self):
+        app.config["SERVER_TIMING"] = True
+        game_uuid = str(GameObject2048().game_uuid)
+
+        slide_response = self.client.post(
+            "/perform_slide/v1",
+            json={"game_uuid": game_uuid, "slide_direction": "left"},
+        )
+        app.config["SERVER_TIMING"] = False
+
+        server_timing = slide_response.headers["Server-Timing"]
+        for phase in ["db_load", "game_load", "play_turn", "save_game", "encode"]:
+            self.assertIn(f"{phase};dur=", server_timing)
+
+        metrics_response = self.client.get("/metrics")
+        self.assertEqual(metrics_response.mimetype, "text/plain")
+        self.assertIn(
+            'tiled_games_phase_seconds_count{phase="play_turn"}',
+            metrics_response.text,
+        )
+        self.assertIn("tiled_games_slides_total", metrics_response.text)
+        self.assertIn("tiled_games_startup_database_seconds", metrics_response.text)
+
+        get_response = self.client.get(
+            "/get_game/v1", query_string={"game_uuid": game_uuid}
+        )
+        self.assertNotIn("Server-Timing", get_response.headers)
+
+    def test_concurrent_save_conflict(self):
+        game_uuid = GameObject2048().game_uuid
+        first = GameObject2048(game_uuid)
+        second = GameObject2048(game_uuid)
+        save_conflicts = services(app).save_conflicts
+        conflicts = save_conflicts.value
+
+        first.save_game()
+        self.assertEqual(first.version, 1)
+
+        with self.assertRaises(GameError) as context:
+            second.save_game()
+
+        self.assertEqual(context.exception.error_code, GameErrorCode.VERSION_CONFLICT)
+        self.assertEqual(save_conflicts.value, conflicts + 1)
+        # Counted per app
+        other_app = create_app({"SQLALCHEMY_DATABASE_URI": "sqlite://"})
+        self.assertEqual(services(other_app).save_conflicts.value, 0)
+
+        # Reloading picks up the latest version, so saving works again
+        second.load_game()
+        second.save_game()
+        self.assertEqual(second.version, 2)
+
+    def test_move_log_replay(self):
+        app.config["GAME_SNAPSHOT_INTERVAL"] = 4
+        game_uuid = GameObject2048(config=GameConfig(grid_size=6)).game_uuid
+
+        for direction in ["up", "left", "down", "right", "up", "left"]:
+            slide_response = self.client.post(
+                "/perform_slide/v1",
+                json={"game_uuid": str(game_uuid), "slide_direction": direction},
+            )
+            self.assertEqual(slide_response.status_code, 200)
+
+        # The 4th move wrote a snapshot, loading replays the 2 moves after it
         with app.app_context():
-            db.session.remove()
-            db.drop_all()
+            saved_game = db.session.get(GameModel2048, game_uuid)
+            self.assertEqual(saved_game.version, 6)
+            self.assertEqual(saved_game.snapshot_version, 4)
+            moves = db.session.execute(
+                db.select(GameMove2048.seq).where(GameMove2048.game_id == game_uuid)
+            ).scalars()
+            self.assertListEqual(sorted(moves), [1, 2, 3, 4, 5, 6])
+
+        get_response = self.client.get(
+            "/get_game/v1", query_string={"game_uuid": str(game_uuid)}
+        )
+        self.assertEqual(get_response.json["game"], slide_response.json["game"])
+
+    def tearDown(self):
+        app.config["GAME_SNAPSHOT_INTERVAL"] = 32
+
+        db.session.remove()
+        db.drop_all()
+        self.context.pop()
+
+
+class TestLockStripes(unittest.TestCase):
+    def test_lock_for(self):
+        game_uuid = uuid.uuid4()
+        game_locks = services(app).game_locks
+        self.assertIs(game_locks.lock_for(game_uuid), game_locks.lock_for(game_uuid))
+
+        stripes = LockStripes(4)
+        self.assertEqual(len(stripes), 4)
+        self.assertIn(stripes.lock_for(game_uuid), stripes.locks)
+
+        with LockStripes(0).lock_for(game_uuid):
+            pass
@@ -0,0 +1,98 @@
+# pylint: disable=missing-docstring,line-too-long
+
+import os
+import tempfile
+import unittest
+import uuid
+
+from src.backend.asgi_app import app
+
+
+class TestAsgiBackend(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        database_path = os.path.join(self.directory.name, "backend.db")
+        app.config["ASYNC_DATABASE_URI"] = f"sqlite+aiosqlite:///{database_path}"
+        app.config["TESTING"] = True
+
+        self.test_app = app.test_app()
+        await self.test_app.startup()
+        self.client = self.test_app.test_client()
+
+    async def test_new_game_persistence(self):
+        response = await self.client.post("/create_game/v1", json={"grid_size": 5})
+        response_dict = await response.get_json()
+        game_uuid = response_dict["game_uuid"]
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(game_uuid)
+        self.assertEqual(response_dict["game"]["config"]["grid_size"], 5)
+
+        new_response = await self.client.get(
+            "/get_game/v1", query_string={"game_uuid": game_uuid}
+        )
+        new_response_dict = await new_response.get_json()
+
+        self.assertEqual(new_response.status_code, 200)
+        self.assertEqual(new_response_dict["game"], response_dict["game"])
+
+    async def test_slide(self):
+        response = await self.client.post("/create_game/v1", json={})
+        game_uuid = (await response.get_json())["game_uuid"]
+
+        slide_response = await self.client.post(
+            "/perform_slide/v1",
+            json={"game_uuid": game_uuid, "slide_direction": "up"},
+        )
+        slide_response_dict = await slide_response.get_json()
+
+        self.assertEqual(slide_response.status_code, 200)
+        self.assertEqual(slide_response_dict["result"], "normal")
+        self.assertTrue(slide_response_dict["game"])
+
+        saved = await self.client.get(
+            "/get_game/v1", query_string={"game_uuid": game_uuid}
+        )
+        self.assertEqual((await saved.get_json())["game"], slide_response_dict["game"])
+
+    async def test_spectate(self):
+        response = await self.client.post("/create_game/v1", json={})
+        game_uuid = (await response.get_json())["game_uuid"]
+
+        async with self.client.request(
+            f"/spectate_game/v1?game_uuid={game_uuid}", method="GET"
+        ) as connection:
+            await connection.send_complete()
+            game_event = (await connection.receive()).decode()
+
+            await self.client.post(
+                "/perform_slide/v1",
+                json={"game_uuid": game_uuid, "slide_direction": "up"},
+            )
+            slide_event = (await connection.receive()).decode()
+            await connection.disconnect()
+
+        self.assertTrue(game_event.startswith("event: game\n"))
+        self.assertTrue(slide_event.startswith("event: slide\n"))
+
+    async def test_bad_requests(self):
+        response = await self.client.post(
+            "/perform_slide/v1", json={"game_uuid": "abc", "slide_direction": "up"}
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            (await response.get_json())["error"], "abc is not a valid UUID"
+        )
+
+        response = await self.client.get(
+            "/get_game/v1", query_string={"game_uuid": str(uuid.uuid4())}
+        )
+        self.assertEqual(response.status_code, 404)
+
+    async def asyncTearDown(self):
+        await self.test_app.shutdown()
+        self.directory.cleanup()
+
+
+if __name__ == "__main__":
+    unittest.main()
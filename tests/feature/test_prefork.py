@@ -0,0 +1,139 @@
+# pylint: disable=missing-docstring
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import unittest
+import uuid
+from collections import Counter
+from urllib.request import Request, urlopen
+
+from src.backend.app import create_app
+from src.backend.prefork import Dispatcher, WorkerAffinity, WorkerPool, warm_up
+
+
+class TestWorkerAffinity(unittest.TestCase):
+    def test_same_worker_per_game(self):
+        affinity = WorkerAffinity(4)
+        games = [uuid.uuid4() for _game in range(400)]
+
+        for game_uuid in games[:20]:
+            self.assertEqual(
+                affinity.worker_for(game_uuid),
+                WorkerAffinity(4).worker_for(uuid.UUID(str(game_uuid).upper())),
+            )
+
+        spread = Counter(affinity.worker_for(game_uuid) for game_uuid in games)
+        self.assertEqual(set(spread), {0, 1, 2, 3})
+        self.assertGreater(min(spread.values()), 50)
+
+    def test_takes_turns_without_game(self):
+        affinity = WorkerAffinity(3)
+
+        self.assertEqual([affinity.worker_for(None) for _i in range(4)], [0, 1, 2, 0])
+
+    def test_game_uuid_of(self):
+        game_uuid = uuid.uuid4()
+        body = json.dumps({"game_uuid": str(game_uuid)}).encode()
+
+        self.assertEqual(
+            WorkerAffinity.game_uuid_of(f"/get_game/v1?game_uuid={game_uuid}", "", b""),
+            game_uuid,
+        )
+        self.assertEqual(
+            WorkerAffinity.game_uuid_of("/perform_slide/v1", "application/json", body),
+            game_uuid,
+        )
+        self.assertIsNone(
+            WorkerAffinity.game_uuid_of("/perform_slide/v1", "text/plain", body)
+        )
+        self.assertIsNone(
+            WorkerAffinity.game_uuid_of("/get_game/v1?game_uuid=nope", "", b"")
+        )
+        self.assertIsNone(
+            WorkerAffinity.game_uuid_of("/perform_slide/v1", "application/json", b"{")
+        )
+
+
+@unittest.skipUnless(hasattr(os, "fork"), "Needs fork")
+class TestPrefork(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        database = os.path.join(cls.directory.name, "prefork.db")
+        app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{database}"})
+        # The workers' request logs
+        logging.getLogger("werkzeug").setLevel(logging.WARNING)
+        warm_up(app)
+
+        cls.pool = WorkerPool(app, 2)
+        cls.pool.start()
+        cls.dispatcher = Dispatcher(("127.0.0.1", 0), cls.pool.host, cls.pool.ports)
+        threading.Thread(target=cls.dispatcher.serve_forever, daemon=True).start()
+        cls.url = f"http://127.0.0.1:{cls.dispatcher.server_port}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.dispatcher.shutdown()
+        cls.dispatcher.server_close()
+        cls.pool.stop()
+        cls.directory.cleanup()
+
+    def post(self, path: str, body: dict):
+        request = Request(
+            self.url + path,
+            data=json.dumps(body).encode(),
+            headers={"Content-Type": "application/json"},
+        )
+        with urlopen(request, timeout=10) as response:
+            return response.headers["X-Worker"], json.load(response)
+
+    def test_game_stays_on_one_worker(self):
+        affinity = WorkerAffinity(2)
+        created_on = set()
+
+        for _game in range(4):
+            worker, created = self.post("/create_game/v1", {})
+            created_on.add(worker)
+            game_uuid = created["game_uuid"]
+            expected = str(affinity.worker_for(uuid.UUID(game_uuid)))
+
+            for direction in ["up", "left", "down"]:
+                worker, slid = self.post(
+                    "/perform_slide/v1",
+                    {"game_uuid": game_uuid, "slide_direction": direction},
+                )
+                self.assertEqual(worker, expected)
+
+            with urlopen(
+                f"{self.url}/get_game/v1?game_uuid={game_uuid}", timeout=10
+            ) as response:
+                self.assertEqual(response.headers["X-Worker"], expected)
+                self.assertEqual(json.load(response)["game"], slid["game"])
+
+        # Games are created by both workers in turn
+        self.assertEqual(created_on, {"0", "1"})
+
+    def test_spectate_streams_through(self):
+        _worker, created = self.post("/create_game/v1", {})
+        game_uuid = created["game_uuid"]
+
+        with urlopen(
+            f"{self.url}/spectate_game/v1?game_uuid={game_uuid}", timeout=10
+        ) as stream:
+            self.assertEqual(stream.readline(), b"event: game\n")
+
+            self.post(
+                "/perform_slide/v1", {"game_uuid": game_uuid, "slide_direction": "up"}
+            )
+            while stream.readline() != b"event: slide\n":
+                pass
+
+            slide = json.loads(stream.readline()[len(b"data: ") :])
+            self.assertEqual(slide["version"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
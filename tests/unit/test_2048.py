@@ -262,6 +262,28 @@ class TestGameOperations(unittest.TestCase):
         self.assertTrue(self.game.latest_spawn_locations)
         self.assertTrue(self.game.latest_spawn_result)
 
+    def test_changed_tiles_and_checksum(self):
+        previous = self.game.grid_values()
+        checksum = self.game.checksum()
+        self.game.play_turn(SlideDirection.UP)
+
+        applied = [list(row) for row in previous]
+        for c, r, value in self.game.changed_tiles(previous):
+            applied[r][c] = value
+
+        self.assertListEqual(applied, self.game.grid_values())
+        self.assertEqual(len(self.game.checksum()), 16)
+        self.assertNotEqual(self.game.checksum(), checksum)
+
+    def test_replay_turn(self):
+        replay = GameHelper.load(self.game.to_json())
+
+        for direction in [SlideDirection.UP, SlideDirection.LEFT, SlideDirection.DOWN]:
+            self.game.play_turn(direction)
+            replay.play_turn(direction, self.game.latest_spawns())
+
+        self.assertEqual(replay.to_dict(), self.game.to_dict())
+
 
 class TestTile(unittest.TestCase):
     def setUp(self):
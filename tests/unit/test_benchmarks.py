@@ -0,0 +1,57 @@
+# pylint: disable=missing-docstring
+
+import random
+import unittest
+
+import numpy as np
+
+from benchmarks.cases import CASES, seed_games
+from benchmarks.runner import compare, run_case
+from src.games.twenty_forty_eight.game import Game, GameConfig
+
+
+class TestBenchmarks(unittest.TestCase):
+    def test_cases_run(self):
+        for case in CASES:
+            case.setup(case.sizes[0])()
+
+    def test_games_are_reproducible(self):
+        config = GameConfig(grid_size=8, mutation_probability=0.5)
+        games = []
+        for seed in [1, 2]:
+            random.seed(seed)
+            np.random.seed(seed)
+            seed_games()
+            games.append(Game(config).to_dict())
+
+        self.assertEqual(games[0], games[1])
+
+    def test_run_case(self):
+        case = next(case for case in CASES if case.name == "PriorityQueue.push")
+        result = run_case(case, 100, repeat=2)
+
+        self.assertEqual(result["name"], "PriorityQueue.push")
+        self.assertEqual(result["size"], 100)
+        self.assertLessEqual(result["min"], result["median"])
+
+    def test_compare(self):
+        baseline = {
+            "results": [
+                {"name": "fast", "size": 1, "min": 1.0},
+                {"name": "slow", "size": 1, "min": 1.0},
+                {"name": "removed", "size": 1, "min": 1.0},
+            ]
+        }
+        current = {
+            "results": [
+                {"name": "fast", "size": 1, "min": 0.5},
+                {"name": "slow", "size": 1, "min": 1.5},
+                {"name": "new", "size": 1, "min": 1.0},
+            ]
+        }
+
+        comparisons = compare(baseline, current, threshold=0.1)
+
+        self.assertListEqual([c["name"] for c in comparisons], ["fast", "slow"])
+        self.assertListEqual([c["regression"] for c in comparisons], [False, True])
+        self.assertAlmostEqual(comparisons[1]["ratio"], 1.5)
@@ -4,7 +4,7 @@ import unittest
 
 import numpy as np
 
-from src.tiled_tools.carver.vector import Vector, VectorGenerator
+from src.tiled_tools.carver.vector import Vector, VectorArray, VectorGenerator
 
 
 class TestVector(unittest.TestCase):
@@ -131,6 +131,44 @@ class TestVector(unittest.TestCase):
         self.assertEqual(sum(v2), 15)
         self.assertEqual(sum(v3), 24)
 
+    def test_in_place(self):
+        v = Vector([1.0, 2.0, 3.0])
+        array = v.vector
+
+        v += Vector([1, 1, 1])
+        v -= 0.5
+        v *= 2
+        v /= Vector([3.0, 5.0, 7.0])
+
+        self.assertIs(v.vector, array)
+        self.assertListEqual(v.tolist(), [1.0, 1.0, 1.0])
+
+        # Integer vectors fall back to a new array when the result is a float
+        ints = Vector([1, 2])
+        ints /= 2
+        self.assertListEqual(ints.tolist(), [0.5, 1.0])
+
+        # Multiplying by a vector is still the dot product
+        dot = Vector([1, 2, 3])
+        dot *= Vector([4, 5, 6])
+        self.assertEqual(dot, 32)
+
+    def test_out(self):
+        v1 = Vector([3.0, 4.0])
+        v2 = Vector([1.0, 1.0])
+        out = VectorGenerator.empty_vector(2)
+
+        self.assertIs(v1.add(v2, out=out), out)
+        self.assertListEqual(out.tolist(), [4.0, 5.0])
+
+        v1.sub(1, out=out)
+        self.assertListEqual(out.tolist(), [2.0, 3.0])
+
+        v1.normalize(out=v1)
+        self.assertListEqual(v1.tolist(), [0.6, 0.8])
+
+        self.assertListEqual((v2 + np.array([1, 2])).tolist(), [2.0, 3.0])
+
     def test_angle_between(self):
         v1 = Vector([1, 0, 0])
         v2 = Vector([0, 1, 0])
@@ -156,6 +194,73 @@ class TestVector(unittest.TestCase):
         self.assertEqual(v3, [4, 5, 6])
 
 
+class TestVectorArray(unittest.TestCase):
+    def setUp(self):
+        self.vectors = VectorArray([[3, 4, 0], [1, 0, 0], [0, 2, 0]])
+
+    def test_init(self):
+        self.assertEqual(len(self.vectors), 3)
+        self.assertEqual(self.vectors.dimension(), 3)
+        self.assertEqual(len(VectorArray([])), 0)
+        self.assertEqual(str(VectorArray([[1, 2]])), "VectorArray([[1, 2]])")
+
+        with self.assertRaises(AssertionError):
+            VectorArray([1, 2, 3])
+
+    def test_magnitude(self):
+        self.assertListEqual(self.vectors.magnitude().tolist(), [5, 1, 2])
+
+    def test_normalize(self):
+        normalized = self.vectors.normalize()
+        self.assertTrue(np.allclose(normalized.magnitude(), 1.0))
+        self.assertTrue(np.allclose(normalized[0].tolist(), [0.6, 0.8, 0]))
+
+    def test_dot(self):
+        other = VectorArray([[1, 1, 1], [2, 0, 0], [0, 0, 5]])
+        self.assertListEqual(self.vectors.dot(other).tolist(), [7, 2, 0])
+        self.assertListEqual(self.vectors.dot(Vector([1, 0, 0])).tolist(), [3, 1, 0])
+        self.assertListEqual((self.vectors * Vector([0, 1, 0])).tolist(), [4, 0, 2])
+
+    def test_angles(self):
+        angles = self.vectors.angle_between(Vector([1, 0, 0]))
+        self.assertTrue(np.allclose(angles, [np.arccos(0.6), 0, np.pi / 2]))
+
+        pairwise = self.vectors.pairwise_angles()
+        self.assertEqual(pairwise.shape, (3, 3))
+        self.assertTrue(np.allclose(np.diag(pairwise), 0))
+        self.assertAlmostEqual(pairwise[1, 2], np.pi / 2)
+
+        self.assertEqual(
+            self.vectors.pairwise_dot(VectorArray([[1, 0, 0]])).shape, (3, 1)
+        )
+
+    def test_arithmetic(self):
+        self.assertEqual(self.vectors + 1, [[4, 5, 1], [2, 1, 1], [1, 3, 1]])
+        self.assertEqual(
+            self.vectors - Vector([1, 0, 0]), [[2, 4, 0], [0, 0, 0], [-1, 2, 0]]
+        )
+        self.assertEqual(
+            self.vectors * np.array([1, 2, 3]), [[3, 4, 0], [2, 0, 0], [0, 6, 0]]
+        )
+        self.assertEqual(self.vectors / 2, [[1.5, 2, 0], [0.5, 0, 0], [0, 1, 0]])
+        self.assertEqual(self.vectors - self.vectors, [[0, 0, 0], [0, 0, 0], [0, 0, 0]])
+
+    def test_vectors(self):
+        vectors = [Vector([1, 2]), Vector([3, 4])]
+        vector_array = VectorArray.from_vectors(vectors)
+        self.assertEqual(vector_array, [[1, 2], [3, 4]])
+
+        rows = vector_array.to_vectors()
+        self.assertEqual(rows[1], Vector([3, 4]))
+
+        # Rows are views, so changes are shared
+        rows[0][0] = 10
+        self.assertEqual(vector_array[0], [10, 2])
+
+        vector_array[1] = Vector([5, 6])
+        self.assertEqual(rows[1], [5, 6])
+
+
 class TestVectorGenerator(unittest.TestCase):
     def setUp(self):
         pass
@@ -0,0 +1,139 @@
+# pylint: disable=missing-docstring
+
+import json
+import random
+import unittest
+import uuid
+
+import numpy as np
+from flask import Flask, jsonify
+
+from src.backend.encoding import GameEncoder, GameJSONProvider
+from src.games.twenty_forty_eight.game import (
+    Game,
+    GameConfig,
+    GameHelper,
+    SlideDirection,
+    SlideResult,
+    Tile,
+)
+
+DIRECTIONS = [
+    SlideDirection.UP,
+    SlideDirection.RIGHT,
+    SlideDirection.DOWN,
+    SlideDirection.LEFT,
+]
+
+
+def compact(value) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"))
+
+
+def played_game(seed: int, config: GameConfig, turns: int) -> Game:
+    random.seed(seed)
+    np.random.seed(seed)
+    game = Game(config)
+    for _turn in range(turns):
+        if not game.can_play():
+            break
+
+        game.play_turn(random.choice(DIRECTIONS))
+
+    return game
+
+
+class TestGameEncoder(unittest.TestCase):
+    def test_matches_to_dict(self):
+        for seed in range(60):
+            config = GameConfig(
+                grid_size=[3, 4, 6, 8][seed % 4],
+                root_tile_value=[2, 3][seed % 2],
+                spawn_kill=seed % 3 == 0,
+            )
+            game = played_game(seed, config, seed)
+
+            self.assertEqual(GameEncoder.encode_game(game), compact(game.to_dict()))
+
+            loaded = GameHelper.load(game.to_json())
+            self.assertEqual(GameEncoder.encode_game(loaded), compact(loaded.to_dict()))
+
+    def test_config_cache_keeps_types(self):
+        as_int = GameConfig(mutation_probability=0)
+        as_float = GameConfig(mutation_probability=0.0)
+
+        self.assertIn('"mutation_probability":0,', GameEncoder.encode_config(as_int))
+        self.assertIn(
+            '"mutation_probability":0.0,', GameEncoder.encode_config(as_float)
+        )
+
+    def test_row_cache_keeps_types(self):
+        int_game = Game(GameConfig(grid_size=3))
+        int_game.set_tiles([[Tile(value) for value in [2, 0, 4]] for _row in range(3)])
+        float_game = Game(GameConfig(grid_size=3))
+        float_game.set_tiles(
+            [[Tile(value) for value in [2.0, 0.0, 4.0]] for _row in range(3)]
+        )
+
+        for game in [int_game, float_game]:
+            self.assertEqual(GameEncoder.encode_game(game), compact(game.to_dict()))
+
+        self.assertIn("[2.0,0.0,4.0]", GameEncoder.encode_game(float_game))
+
+    def test_enums(self):
+        game = Game()
+        game.latest_spawn_result = SlideResult.SPAWN_FILL
+
+        encoded = json.loads(GameEncoder.encode_game(game))
+        self.assertEqual(encoded["latest_spawn_result"], "SPAWN_FILL")
+        self.assertEqual(GameEncoder.encode([SlideDirection.UP]), '["UP"]')
+
+    def test_encode_bodies(self):
+        game = played_game(4, GameConfig(), 5)
+        game_uuid = uuid.uuid4()
+        body = {
+            "result": "normal",
+            "reason": "NORMAL",
+            "game_uuid": game_uuid,
+            "delta": {"changed": [(0, 1, 2)], "score_delta": 4, "checksum": "ab"},
+            "flags": [True, None, 1.5, "é"],
+            "game": game,
+        }
+        expected = {**body, "game_uuid": str(game_uuid), "game": game.to_dict()}
+
+        self.assertEqual(GameEncoder.encode(body), compact(expected))
+
+
+class TestGameJSONProvider(unittest.TestCase):
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.json = GameJSONProvider(self.app)
+        self.game = played_game(7, GameConfig(grid_size=5), 10)
+
+    def test_jsonify_matches_default_provider(self):
+        plain = Flask(__name__)
+
+        with plain.app_context():
+            expected = jsonify(
+                {"game_uuid": "x", "game": self.game.to_dict()}
+            ).get_data()
+
+        with self.app.app_context():
+            fast = jsonify({"game_uuid": "x", "game": self.game}).get_data()
+
+        self.assertEqual(fast, expected)
+
+    def test_debug_output_falls_back(self):
+        self.app.debug = True
+
+        with self.app.app_context():
+            pretty = jsonify({"game": self.game}).get_data(as_text=True)
+
+        self.assertIn('\n  "game": {', pretty)
+        self.assertEqual(
+            json.loads(pretty), json.loads(compact({"game": self.game.to_dict()}))
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
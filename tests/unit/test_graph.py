@@ -3,6 +3,7 @@
 import unittest
 
 from src.tiled_tools.common.graph import Edge, Graph, Node
+from src.tiled_tools.common.ids import CounterIdAllocator
 
 
 class TestNode(unittest.TestCase):
@@ -19,6 +20,22 @@ class TestNode(unittest.TestCase):
         n3 = Node([4, 5, 6])
         self.assertNotEqual(self.n, n3)
 
+    def test_id_allocator(self):
+        self.assertIsInstance(Node().id, str)
+
+        default_allocator = Node.id_allocator
+        Node.id_allocator = CounterIdAllocator(10)
+        try:
+            self.assertEqual(Node().id, 10)
+            self.assertEqual(Node().id, 11)
+            self.assertEqual(Node(ident="given").id, "given")
+        finally:
+            Node.id_allocator = default_allocator
+
+    def test_slots(self):
+        with self.assertRaises(AttributeError):
+            self.n.extra = 1
+
 
 class TestEdge(unittest.TestCase):
     def setUp(self):
@@ -35,6 +52,14 @@ class TestEdge(unittest.TestCase):
 
         self.assertEqual(self.e.length, 5)
         self.assertTrue(any(self.e.id))
+        self.assertIsInstance(self.e.id, str)
+
+    def test_hash(self):
+        reverse = Edge(self.n2, self.n1, 5)
+        self.assertEqual(hash(self.e), hash(reverse))
+
+        mixed = Edge(Node(ident=1), self.n1, 5)
+        self.assertIsInstance(hash(mixed), int)
 
 
 class TestGraph(unittest.TestCase):
@@ -1,6 +1,9 @@
 # pylint: disable=missing-docstring
 
+import os
+import tempfile
 import unittest
+from unittest import mock
 
 import numpy as np
 
@@ -36,6 +39,77 @@ class TestGrid(unittest.TestCase):
 
         self.assertEqual(copy, copy.copy())
 
+        copy.set(0, 0, 5)
+        self.assertEqual(self.g.get(0, 0), 1)
+
+    def test_copy_on_write(self):
+        self.g.set(0, 0, 1)
+        snapshot = self.g.copy(copy_on_write=True)
+
+        self.assertIs(snapshot.get_grid().base, self.g.get_grid().base)
+
+        snapshot.set(0, 0, 2)
+        self.assertEqual(snapshot.get(0, 0), 2)
+        self.assertEqual(self.g.get(0, 0), 1)
+
+        other = self.g.copy(copy_on_write=True)
+        self.g.set(1, 1, 3)
+        self.assertEqual(self.g.get(1, 1), 3)
+        self.assertIsNone(other.get(1, 1))
+
+    def test_copy_on_write_after_view(self):
+        grid = Grid(np.arange(12).reshape(3, 4))
+        window = grid.view(1, 1, 2, 2)
+        snapshot = grid.copy(copy_on_write=True)
+
+        window.set(0, 0, 50)
+        self.assertEqual(grid.get(1, 1), 50)
+        self.assertEqual(snapshot.get(1, 1), 5)
+
+        # A view of the view writes to the same buffer as well
+        inner = window.view(1, 1, 1, 1)
+        del window
+        inner.set(0, 0, 100)
+        self.assertEqual(grid.get(2, 2), 100)
+        self.assertEqual(grid.copy(copy_on_write=True).get(2, 2), 100)
+        self.assertEqual(snapshot.get(2, 2), 10)
+
+        # Once the views are gone, copies share the buffer again
+        del inner
+        shared = grid.copy(copy_on_write=True)
+        self.assertIs(shared.get_grid().base, grid.get_grid().base)
+
+    def test_view(self):
+        grid = Grid(np.arange(12).reshape(3, 4))
+        window = grid.view(1, 1, 2, 2)
+
+        self.assertEqual(window.width, 2)
+        self.assertEqual(window.height, 2)
+        self.assertListEqual(window.tolist(), [[5, 6], [9, 10]])
+
+        window.set(0, 0, 50)
+        self.assertEqual(grid.get(1, 1), 50)
+
+        grid.set(2, 2, 100)
+        self.assertEqual(window.get(1, 1), 100)
+
+        with self.assertRaises(AssertionError):
+            grid.view(3, 0, 2, 2)
+
+    def test_view_wrap(self):
+        grid = Grid(np.arange(12).reshape(3, 4), wrap_direction=WrapDirection.TORUS)
+
+        window = grid.view(-1, 0, 1, 3)
+        self.assertListEqual(window.tolist(), [[3], [7], [11]])
+        self.assertEqual(window.get_wrap_direction(), WrapDirection.VERTICAL)
+        self.assertEqual(
+            grid.view(0, 0, 4, 3).get_wrap_direction(), WrapDirection.TORUS
+        )
+        self.assertEqual(grid.view(0, 0, 2, 2).get_wrap_direction(), WrapDirection.NONE)
+
+        with self.assertRaises(AssertionError):
+            grid.view(-1, 0, 2, 3)
+
     def test_grid_type(self):
         self.assertEqual(self.g.get_grid_type(), GridType.TABLE)
 
@@ -170,6 +244,121 @@ class TestGrid(unittest.TestCase):
         self.assertListEqual(identity.get_adjacent(1, 0), [1, 0, 1])
 
 
+class TestTypedGrid(unittest.TestCase):
+    def setUp(self):
+        self.cell_dtype = [("value", np.int64), ("momentum", np.int8)]
+
+    def test_dtype(self):
+        grid = Grid([[1, 2], [3, 4]], dtype=np.int32)
+        self.assertEqual(grid.dtype, np.int32)
+        self.assertFalse(grid.is_structured())
+
+        grid.set(1, 0, 7)
+        self.assertEqual(grid.get(1, 0), 7)
+        self.assertEqual(grid.copy().dtype, np.int32)
+        self.assertEqual(GridGenerator.identity(2, dtype=np.int8).dtype, np.int8)
+
+    def test_structured(self):
+        grid = GridGenerator.filled(3, 2, (0, 0), dtype=self.cell_dtype)
+        self.assertTrue(grid.is_structured())
+        self.assertEqual(grid.width, 3)
+        self.assertEqual(grid.height, 2)
+
+        grid.set(2, 1, (4, 3))
+        self.assertEqual(grid.get(2, 1)["value"], 4)
+        self.assertEqual(grid.get(2, 1)["momentum"], 3)
+
+        values = grid.field("value")
+        self.assertListEqual(values.tolist(), [[0, 0, 0], [0, 0, 4]])
+
+        values.set(0, 0, 8)
+        self.assertEqual(grid.get(0, 0)["value"], 8)
+
+        with self.assertRaises(AssertionError):
+            GridGenerator.identity(2).field("value")
+
+
+class TestGridPersistence(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "map.grid")
+        self.g = Grid(
+            np.arange(12, dtype=np.int16).reshape(3, 4),
+            GridType.HEX,
+            WrapDirection.HORIZONTAL,
+        )
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_save_and_open(self):
+        self.g.save(self.path)
+        loaded = Grid.open_memmap(self.path)
+
+        self.assertEqual(loaded, self.g)
+        self.assertEqual(loaded.width, 4)
+        self.assertEqual(loaded.height, 3)
+        self.assertEqual(loaded.dtype, np.int16)
+        self.assertEqual(loaded.get_grid_type(), GridType.HEX)
+        self.assertEqual(loaded.get_wrap_direction(), WrapDirection.HORIZONTAL)
+
+        with self.assertRaises(ValueError):
+            loaded.set(0, 0, 1)
+
+    def test_write_through(self):
+        self.g.save(self.path)
+        writable = Grid.open_memmap(self.path, mode="r+")
+        writable.set(1, 2, 99)
+        writable.flush()
+
+        self.assertEqual(Grid.open_memmap(self.path).get(1, 2), 99)
+
+    def test_copy_on_write_keeps_file(self):
+        self.g.save(self.path)
+        writable = Grid.open_memmap(self.path, mode="r+")
+        snapshot = writable.copy(copy_on_write=True)
+
+        writable.set(0, 0, 7)
+        writable.flush()
+
+        self.assertEqual(Grid.open_memmap(self.path).get(0, 0), 7)
+        self.assertEqual(snapshot.get(0, 0), 0)
+
+        # Read only maps cannot change, so are still shared
+        read_only = Grid.open_memmap(self.path)
+        shared = read_only.copy(copy_on_write=True)
+        self.assertTrue(np.shares_memory(shared.get_grid(), read_only.get_grid()))
+
+    def test_structured(self):
+        cell_dtype = [("value", np.int64), ("momentum", np.int8)]
+        grid = GridGenerator.filled(2, 2, (2, 1), dtype=cell_dtype)
+        grid.save(self.path)
+
+        loaded = Grid.open_memmap(self.path)
+        self.assertEqual(loaded.dtype, np.dtype(cell_dtype))
+        self.assertEqual(loaded, grid)
+
+    def test_save_in_chunks(self):
+        grid = Grid(np.arange(60, dtype=np.int32).reshape(6, 10))
+        window = grid.view(2, 1, 6, 5)
+        self.assertFalse(window.get_grid().flags.c_contiguous)
+
+        # Two rows at a time
+        with mock.patch("src.tiled_tools.common.grid.GRID_FILE_CHUNK_SIZE", 48):
+            window.save(self.path)
+
+        self.assertEqual(Grid.open_memmap(self.path).tolist(), window.tolist())
+
+        # Saving a memory mapped grid writes it straight from the map
+        copy_path = self.path + ".copy"
+        Grid.open_memmap(self.path).save(copy_path)
+        self.assertEqual(Grid.open_memmap(copy_path), window)
+
+    def test_save_objects(self):
+        with self.assertRaises(AssertionError):
+            Grid([[None, None]]).save(self.path)
+
+
 class TestHexGrid(unittest.TestCase):
     def setUp(self):
         self.initial_list = [[0 for _i in range(5)] for _j in range(7)]
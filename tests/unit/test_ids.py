@@ -0,0 +1,43 @@
+# pylint: disable=missing-docstring
+
+import unittest
+
+from src.tiled_tools.common.constants import ALPHABET, ID_SIZE
+from src.tiled_tools.common.ids import (
+    CounterIdAllocator,
+    FunctionIdAllocator,
+    RandomIdAllocator,
+)
+
+
+class TestCounterIdAllocator(unittest.TestCase):
+    def test_next_id(self):
+        allocator = CounterIdAllocator(5)
+        self.assertEqual(allocator.next_id(), 5)
+        self.assertEqual(allocator.next_id(), 6)
+        self.assertEqual(allocator(), 7)
+
+
+class TestRandomIdAllocator(unittest.TestCase):
+    def test_next_id(self):
+        allocator = RandomIdAllocator(batch_size=4)
+        ids = [allocator.next_id() for _ in range(10)]
+
+        for ident in ids:
+            self.assertEqual(len(ident), ID_SIZE)
+            self.assertTrue(set(ident) <= set(ALPHABET.tolist()))
+
+        self.assertEqual(len(set(ids)), 10)
+
+    def test_size(self):
+        self.assertEqual(len(RandomIdAllocator(size=4).next_id()), 4)
+
+
+class TestFunctionIdAllocator(unittest.TestCase):
+    def test_next_id(self):
+        allocator = FunctionIdAllocator(lambda: "fixed")
+        self.assertEqual(allocator.next_id(), "fixed")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,7 +2,9 @@
 
 import unittest
 
-from src.tiled_tools.carver.measurements import Size
+import numpy as np
+
+from src.tiled_tools.carver.measurements import Size, SizeArray, SizePacker
 
 
 class TestSize(unittest.TestCase):
@@ -35,3 +37,92 @@ class TestSize(unittest.TestCase):
 
         size3 = Size(1, 2, 4)
         self.assertNotEqual(size1, size3)
+
+
+class TestSizeArray(unittest.TestCase):
+    def setUp(self):
+        self.sizes = SizeArray([2, 4, 1], [3, 1, 1], [1, 2, 5])
+
+    def test_from_sizes(self):
+        sizes = [Size(2, 3), Size(4, 1, 2)]
+        size_array = SizeArray.from_sizes(sizes)
+
+        self.assertEqual(len(size_array), 2)
+        self.assertEqual(size_array[1], Size(4, 1, 2))
+        self.assertEqual(size_array.to_sizes(), sizes)
+
+    def test_area_and_volume(self):
+        self.assertListEqual(self.sizes.area().tolist(), [6, 4, 1])
+        self.assertListEqual(self.sizes.volume().tolist(), [6, 8, 5])
+        self.assertEqual(self.sizes.total_area(), 11)
+
+    def test_comparisons(self):
+        self.assertListEqual(
+            self.sizes.equals(Size(4, 1, 2)).tolist(), [False, True, False]
+        )
+        self.assertListEqual(
+            self.sizes.fits_within(Size(3, 4, 2)).tolist(), [True, False, False]
+        )
+        self.assertListEqual(
+            self.sizes.fits_within(Size(3, 4, 2), allow_rotation=True).tolist(),
+            [True, True, False],
+        )
+
+    def test_sorting(self):
+        self.assertListEqual(self.sizes.argsort().tolist(), [2, 1, 0])
+        self.assertListEqual(self.sizes.argsort("volume", True).tolist(), [1, 0, 2])
+        self.assertEqual(
+            self.sizes.sorted("width"), SizeArray([1, 2, 4], [1, 3, 1], [5, 1, 2])
+        )
+
+        with self.assertRaises(AssertionError):
+            self.sizes.argsort("colour")
+
+
+class TestSizePacker(unittest.TestCase):
+    def assert_no_overlap(self, pieces, packing):
+        widths = np.where(packing.rotated, pieces.heights, pieces.widths)
+        heights = np.where(packing.rotated, pieces.widths, pieces.heights)
+
+        for i in range(len(pieces)):
+            for j in range(i + 1, len(pieces)):
+                if packing.sheet[i] != packing.sheet[j] or packing.sheet[i] < 0:
+                    continue
+
+                overlaps = (
+                    packing.x[i] < packing.x[j] + widths[j]
+                    and packing.x[j] < packing.x[i] + widths[i]
+                    and packing.y[i] < packing.y[j] + heights[j]
+                    and packing.y[j] < packing.y[i] + heights[i]
+                )
+                self.assertFalse(overlaps, f"Pieces {i} and {j} overlap")
+
+    def test_shelf_pack(self):
+        pieces = SizeArray([4, 4, 2, 2, 3], [2, 2, 2, 2, 1])
+        stock = Size(8, 4)
+        packing = SizePacker.shelf_pack(pieces, stock)
+
+        self.assertEqual(packing.sheet_count, 1)
+        self.assertListEqual(packing.unplaced().tolist(), [])
+        self.assertAlmostEqual(packing.utilization(pieces, stock), 27 / 32)
+        self.assert_no_overlap(pieces, packing)
+
+    def test_rotation_and_unplaced(self):
+        pieces = SizeArray([1, 3, 9], [4, 1, 9])
+        packing = SizePacker.shelf_pack(pieces, Size(4, 4))
+
+        self.assertListEqual(packing.rotated.tolist(), [True, False, False])
+        self.assertListEqual(packing.unplaced().tolist(), [2])
+
+        packing = SizePacker.shelf_pack(pieces, Size(4, 4), allow_rotation=False)
+        self.assertListEqual(packing.rotated.tolist(), [False, False, False])
+
+    def test_many_pieces(self):
+        rng = np.random.default_rng(3)
+        pieces = SizeArray(rng.integers(1, 20, 3000), rng.integers(1, 20, 3000))
+
+        packing = SizePacker.shelf_pack(pieces, Size(96, 48), kerf=0.125)
+
+        self.assertEqual(len(packing.unplaced()), 0)
+        self.assertLess(packing.sheet.max(), packing.sheet_count)
+        self.assertGreater(packing.utilization(pieces, Size(96, 48)), 0.5)
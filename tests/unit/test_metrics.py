@@ -0,0 +1,60 @@
+# pylint: disable=missing-docstring
+
+import unittest
+
+from src.backend.metrics import NULL_TIMER, Metrics, ServerTiming
+
+
+class TestMetrics(unittest.TestCase):
+    def test_timers_and_counters(self):
+        metrics = Metrics(namespace="test")
+
+        with metrics.timer("load"):
+            pass
+        metrics.observe("load", 0.5)
+        metrics.increment("slides")
+        metrics.increment("slides", 2)
+
+        count, total = metrics.timers["load"]
+        self.assertEqual(count, 2)
+        self.assertGreaterEqual(total, 0.5)
+        self.assertEqual(metrics.counters["slides"], 3)
+
+        metrics.reset()
+        self.assertDictEqual(metrics.timers, {})
+
+    def test_disabled(self):
+        metrics = Metrics(enabled=False)
+
+        self.assertIs(metrics.timer("load"), NULL_TIMER)
+        with metrics.timer("load"):
+            pass
+        metrics.increment("slides")
+
+        self.assertDictEqual(metrics.timers, {})
+        self.assertDictEqual(metrics.counters, {})
+
+    def test_render(self):
+        metrics = Metrics(namespace="test")
+        metrics.observe("load", 0.25)
+        metrics.increment("slides")
+
+        text = metrics.render({"conflicts": 2}, {"spectators": 1})
+
+        self.assertIn("# TYPE test_phase_seconds summary", text)
+        self.assertIn('test_phase_seconds_sum{phase="load"} 0.250000000', text)
+        self.assertIn('test_phase_seconds_count{phase="load"} 1', text)
+        self.assertIn("test_slides_total 1", text)
+        self.assertIn("test_conflicts_total 2", text)
+        self.assertIn("# TYPE test_spectators gauge\ntest_spectators 1", text)
+
+    def test_server_timing(self):
+        metrics = Metrics()
+
+        ServerTiming.start()
+        metrics.observe("load", 0.002)
+        metrics.observe("save", 0.001)
+        self.assertEqual(ServerTiming.header(), "load;dur=2.000, save;dur=1.000")
+
+        metrics.observe("load", 0.002)
+        self.assertIsNone(ServerTiming.header())
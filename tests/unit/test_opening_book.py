@@ -0,0 +1,211 @@
+# pylint: disable=missing-docstring
+
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from src.games.twenty_forty_eight.game import Game, GameConfig, SlideDirection, Tile
+from src.games.twenty_forty_eight.opening_book import (
+    BoardSearch,
+    BookPolicy,
+    OpeningBook,
+    build_book,
+)
+from src.games.twenty_forty_eight.simulate import DIRECTIONS
+from src.games.twenty_forty_eight.symmetry import Symmetry, SymmetryHelper
+
+SMALL_CONFIG = GameConfig(grid_size=3)
+
+
+class TestBoardSearch(unittest.TestCase):
+    def test_slide_matches_game(self):
+        rng = random.Random(47)
+        config = GameConfig(grid_size=4, root_tile_value=3)
+        search = BoardSearch(config)
+
+        for _board in range(30):
+            values = [
+                [rng.choice([0, 0, 3, 3, 9, 27]) for _c in range(4)] for _r in range(4)
+            ]
+            for direction in DIRECTIONS:
+                game = Game(config)
+                game.set_tiles([[Tile(value) for value in row] for row in values])
+                game.score = 0
+                game.slide_tiles(direction)
+
+                slid, gained = search.slide(search.encode(values), direction)
+
+                self.assertEqual(search.decode(slid), game.grid_values())
+                self.assertEqual(gained, game.score)
+
+    def test_encode(self):
+        search = BoardSearch(GameConfig(grid_size=2))
+
+        self.assertEqual(search.encode([[0, 2], [4, 2048]]), (0, 1, 2, 11))
+        self.assertEqual(search.decode((0, 1, 2, 11)), [[0, 2], [4, 2048]])
+        self.assertIsNone(search.encode([[0, 3], [0, 0]]))
+
+    def test_spawn_distribution_sums_to_one(self):
+        search = BoardSearch(SMALL_CONFIG)
+        board = (1, 0, 0, 0, 2, 0, 0, 0, 1)
+
+        distribution = search.spawn_distribution(board)
+
+        self.assertAlmostEqual(sum(distribution.values()), 1.0)
+        for outcome in distribution:
+            self.assertEqual(outcome.count(0), board.count(0) - 2)
+
+    def test_starting_boards(self):
+        search = BoardSearch(GameConfig(grid_size=3, mutation_at_start=False))
+        boards = set(search.starting_boards())
+
+        # 2 of 9 tiles, each a 2
+        self.assertEqual(len(boards), 36)
+
+    def test_best_move_prefers_merges(self):
+        search = BoardSearch(SMALL_CONFIG)
+        board = (3, 3, 0, 0, 0, 0, 0, 0, 0)
+
+        self.assertIn(
+            search.best_move(board, depth=2),
+            [SlideDirection.LEFT, SlideDirection.RIGHT],
+        )
+
+
+class TestOpeningBook(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.book = build_book(SMALL_CONFIG, plies=2, depth=1)
+
+    def test_lookup_every_symmetry(self):
+        search = BoardSearch(SMALL_CONFIG)
+        boards = [
+            tuple(slot["board"].tolist())
+            for slot in self.book.slots
+            if slot["move"] != SlideDirection.NONE.value
+        ]
+        self.assertEqual(len(boards), len(self.book))
+
+        for board in boards[:50]:
+            move = self.book.lookup_board(board)
+            slid, _gained = search.slide(board, move)
+            expected = SymmetryHelper.canonical_key(np.reshape(slid, (3, 3)))
+
+            for symmetry in Symmetry:
+                transformed = tuple(
+                    SymmetryHelper.apply(np.reshape(board, (3, 3)), symmetry)
+                    .ravel()
+                    .tolist()
+                )
+                transformed_move = self.book.lookup(search.decode(transformed))
+
+                # Symmetric boards may get a different, but equivalent, move
+                transformed_slid, _gained = search.slide(transformed, transformed_move)
+                self.assertEqual(
+                    SymmetryHelper.canonical_key(np.reshape(transformed_slid, (3, 3))),
+                    expected,
+                )
+
+    def test_lookup_misses(self):
+        late_board = [[2, 4, 8], [16, 32, 64], [128, 256, 0]]
+
+        self.assertIsNone(self.book.lookup(late_board))
+        self.assertIsNone(self.book.lookup([[3, 0, 0], [0, 0, 0], [0, 0, 0]]))
+
+    def test_covers_new_games(self):
+        for seed in range(20):
+            random.seed(seed)
+            np.random.seed(seed)
+            game = Game(SMALL_CONFIG)
+
+            move = self.book.lookup(game.grid_values())
+            self.assertIsNotNone(move)
+
+            game.play_turn(move)
+            self.assertIsNotNone(self.book.lookup(game.grid_values()))
+
+    def test_save_and_open(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "small.book")
+            self.book.save(path)
+
+            opened = OpeningBook.open(path)
+
+            self.assertIsInstance(opened.slots, np.memmap)
+            self.assertEqual(len(opened), len(self.book))
+            self.assertEqual(opened.header["plies"], 2)
+            self.assertTrue(opened.matches(SMALL_CONFIG))
+            self.assertFalse(opened.matches(GameConfig(grid_size=3, spawn_kill=True)))
+            self.assertEqual(opened.slots.tobytes(), self.book.slots.tobytes())
+
+            random.seed(1)
+            np.random.seed(1)
+            values = Game(SMALL_CONFIG).grid_values()
+            self.assertEqual(opened.lookup(values), self.book.lookup(values))
+
+            with mock.patch.dict(os.environ, {"OPENING_BOOK": path}):
+                policy = BookPolicy(random.Random(0))
+
+            policy.fallback = mock.Mock()
+            policy.fallback.choose.return_value = SlideDirection.NONE
+
+            game = Game(SMALL_CONFIG)
+            self.assertEqual(policy.choose(game), self.book.lookup(game.grid_values()))
+            # Games the book was not searched for fall back to live play
+            self.assertEqual(policy.choose(Game()), SlideDirection.NONE)
+
+            del opened, policy
+            BookPolicy._books.clear()  # pylint: disable=protected-access
+
+    def test_simulate_command_line(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "small.book")
+            output = os.path.join(directory, "results.jsonl")
+            self.book.save(path)
+
+            subprocess.run(
+                [
+                    sys.executable,
+                    "-m",
+                    "src.games.twenty_forty_eight.simulate",
+                    "--games",
+                    "3",
+                    "--workers",
+                    "0",
+                    "--config",
+                    json.dumps({"grid_size": 3}),
+                    "--policy",
+                    "src.games.twenty_forty_eight.opening_book:BookPolicy",
+                    "--output",
+                    output,
+                ],
+                env={**os.environ, "OPENING_BOOK": path},
+                capture_output=True,
+                check=True,
+            )
+
+            with open(output, encoding="utf-8") as results:
+                moves = [json.loads(line)["moves"] for line in results]
+
+            self.assertEqual(len(moves), 3)
+            self.assertTrue(all(move > 0 for move in moves))
+
+    def test_rejects_other_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "not.book")
+            with open(path, "wb") as not_book:
+                not_book.write(b"not a book")
+
+            with self.assertRaises(AssertionError):
+                OpeningBook.open(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+# pylint: disable=missing-docstring
+
+import os
+import tempfile
+import time
+import unittest
+
+from src.tiled_tools.common.grid import Grid, WrapDirection
+from src.tiled_tools.common.profiling import PhaseCounters, Profile, SamplingProfiler
+from src.tiled_tools.map.algorithms import QuantumState, WaveFunctionCollapse
+from src.tiled_tools.map.map import ISLAND_RULESET, TileType
+
+
+def busy_wait(seconds: float):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+class TestPhaseCounters(unittest.TestCase):
+    def test_counts_and_rates(self):
+        counters = PhaseCounters()
+        counters.increment("slides")
+        counters.increment("slides", 3)
+        counters.stop()
+
+        self.assertEqual(counters.counts["slides"], 4)
+        self.assertAlmostEqual(
+            counters.rates()["slides"], 4 / counters.elapsed(), places=3
+        )
+        self.assertIn("slides: 4", counters.report())
+
+
+class TestSamplingProfiler(unittest.TestCase):
+    def test_samples_profiled_thread(self):
+        with SamplingProfiler(interval=0.001) as profiler:
+            busy_wait(0.05)
+
+        self.assertGreater(profiler.samples, 0)
+        self.assertTrue(any("busy_wait" in stack for stack in profiler.stacks))
+
+        stack, count = profiler.collapsed().splitlines()[0].rsplit(" ", 1)
+        self.assertIn(";", stack)
+        self.assertGreater(int(count), 0)
+
+    def test_profile_wfc(self):
+        states = [[QuantumState(TileType) for _c in range(5)] for _r in range(5)]
+        grid = Grid(states, wrap_direction=WrapDirection.NONE)
+
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "wfc.folded")
+
+            with Profile(output, interval=0.001) as profile:
+                wfc = WaveFunctionCollapse(
+                    ISLAND_RULESET, grid, {}, counters=profile.counters
+                )
+                wfc.collapse()
+
+            self.assertTrue(os.path.exists(output))
+
+        self.assertGreater(profile.counters.counts["cells_observed"], 0)
+        self.assertGreaterEqual(
+            profile.counters.counts["propagation_steps"],
+            profile.counters.counts["cells_observed"],
+        )
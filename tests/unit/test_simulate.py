@@ -0,0 +1,115 @@
+# pylint: disable=missing-docstring
+
+import csv
+import io
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+
+from src.games.twenty_forty_eight.game import Game, SlideDirection
+from src.games.twenty_forty_eight.simulate import (
+    Policy,
+    PolicyHelper,
+    ResultWriter,
+    SimulationTask,
+    build_tasks,
+    load_policy,
+    main,
+    play_game,
+    simulate,
+)
+
+
+class UpPolicy(Policy):
+    def choose(self, game: Game) -> SlideDirection:
+        return SlideDirection.UP
+
+
+class TestSimulate(unittest.TestCase):
+    def test_preview_leaves_game_unchanged(self):
+        game = Game()
+        before = game.to_dict()
+
+        for direction in [SlideDirection.UP, SlideDirection.LEFT]:
+            PolicyHelper.preview(game, direction)
+
+        self.assertEqual(game.to_dict(), before)
+
+    def test_play_game_is_reproducible(self):
+        for policy in ["random", "greedy", "corner"]:
+            task = SimulationTask(0, {"grid_size": 4}, 0, 42, policy, 1000)
+            first = play_game(task)
+
+            self.assertEqual(first, play_game(task))
+            self.assertGreater(first.moves, 0)
+            self.assertGreaterEqual(first.highest_tile, 4)
+
+    def test_load_policy(self):
+        self.assertIs(load_policy("tests.unit.test_simulate:UpPolicy"), UpPolicy)
+        self.assertIsInstance(load_policy("corner")(random.Random(0)), Policy)
+
+        with self.assertRaises(AssertionError):
+            load_policy("minimax")
+
+    def test_simulate_in_pool(self):
+        configs = [{}, {"grid_size": 3}]
+        tasks = list(build_tasks(configs, 3, "random", 0, 1000))
+        self.assertEqual(len({task.seed for task in tasks}), 6)
+
+        streamed = simulate(build_tasks(configs, 3, "random", 0, 1000), 6, workers=2)
+        results = sorted(streamed, key=lambda r: r.seed)
+        self.assertEqual(results, [play_game(task) for task in tasks])
+
+    def test_writer(self):
+        result = play_game(SimulationTask(0, {}, 0, 1, "random", 1000))
+
+        output = io.StringIO()
+        ResultWriter(output, "csv").write(result)
+        row = next(csv.DictReader(io.StringIO(output.getvalue())))
+        self.assertEqual(int(row["score"]), result.score)
+
+        output = io.StringIO()
+        ResultWriter(output, "jsonl").write(result)
+        self.assertEqual(json.loads(output.getvalue())["moves"], result.moves)
+
+    def test_main(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "results.jsonl")
+            with redirect_stderr(io.StringIO()) as stderr:
+                main(["--games", "4", "--workers", "0", "--output", path])
+
+            with open(path, encoding="utf-8") as results:
+                self.assertEqual(len(results.readlines()), 4)
+
+        self.assertIn("4 games", stderr.getvalue())
+
+    def test_command_line_policy(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "results.jsonl")
+            subprocess.run(
+                [
+                    sys.executable,
+                    "-m",
+                    "src.games.twenty_forty_eight.simulate",
+                    "--games",
+                    "2",
+                    "--workers",
+                    "0",
+                    "--max-moves",
+                    "50",
+                    "--policy",
+                    "tests.unit.test_simulate:UpPolicy",
+                    "--output",
+                    path,
+                ],
+                capture_output=True,
+                check=True,
+            )
+
+            with open(path, encoding="utf-8") as results:
+                self.assertEqual(len(results.readlines()), 2)
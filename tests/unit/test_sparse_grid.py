@@ -0,0 +1,81 @@
+# pylint: disable=missing-docstring
+
+import unittest
+
+import numpy as np
+
+from src.tiled_tools.common.grid import GridType, WrapDirection
+from src.tiled_tools.common.sparse_grid import SparseGrid
+
+
+class TestSparseGrid(unittest.TestCase):
+    def setUp(self):
+        self.g = SparseGrid(
+            100_000, 100_000, fill_value=0, dtype=np.int8, chunk_size=16
+        )
+
+    def test_init(self):
+        self.assertEqual(self.g.width, 100_000)
+        self.assertEqual(self.g.height, 100_000)
+        self.assertEqual(self.g.dtype, np.int8)
+        self.assertEqual(self.g.get_grid_type(), GridType.TABLE)
+        self.assertEqual(self.g.get_wrap_direction(), WrapDirection.NONE)
+        self.assertEqual(self.g.populated_chunks(), 0)
+
+    def test_get_and_set(self):
+        self.assertEqual(self.g.get(99_999, 99_999), 0)
+
+        self.g.set(50_000, 20, 3)
+        self.g.set(50_001, 21, 4)
+        self.assertEqual(self.g.get(50_000, 20), 3)
+        self.assertEqual(self.g.get(50_001, 21), 4)
+        self.assertEqual(self.g.populated_chunks(), 1)
+
+        # Writing the fill value does not allocate
+        self.g.set(0, 0, 0)
+        self.assertEqual(self.g.populated_chunks(), 1)
+
+        with self.assertRaises(AssertionError):
+            self.g.get(100_000, 0)
+
+    def test_iter_populated(self):
+        self.g.set(5, 5, 1)
+        self.g.set(70_000, 3, 2)
+
+        self.assertEqual(len(list(self.g.iter_chunks())), 2)
+        self.assertEqual(sorted(self.g.iter_populated()), [(5, 5, 1), (70_000, 3, 2)])
+
+    def test_adjacent(self):
+        self.g.set(1, 0, 7)
+        self.assertListEqual(self.g.get_adjacent_coords(0, 0), [(1, 0), (0, 1)])
+        self.assertListEqual(self.g.get_adjacent(0, 0), [7, 0])
+
+        self.g.set_wrap_direction(WrapDirection.TORUS)
+        self.assertListEqual(
+            self.g.get_adjacent_coords(0, 0),
+            [(99_999, 0), (1, 0), (0, 99_999), (0, 1)],
+        )
+
+    def test_rows_and_cols(self):
+        small = SparseGrid(5, 3, chunk_size=2)
+        small.set_row(1, [1, 2, 3, 4, 5])
+        small.set_col(4, [6, 7, 8])
+
+        self.assertListEqual(small.get_row(1), [1, 2, 3, 4, 7])
+        self.assertListEqual(small.get_col(4), [6, 7, 8])
+        self.assertListEqual(
+            small.to_grid().tolist(),
+            [[0, 0, 0, 0, 6], [1, 2, 3, 4, 7], [0, 0, 0, 0, 8]],
+        )
+
+    def test_copy(self):
+        self.g.set(1, 1, 1)
+        copy = self.g.copy()
+        copy.set(1, 1, 2)
+
+        self.assertEqual(self.g.get(1, 1), 1)
+        self.assertEqual(copy.get(1, 1), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
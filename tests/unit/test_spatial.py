@@ -0,0 +1,73 @@
+# pylint: disable=missing-docstring
+
+import unittest
+
+import numpy as np
+
+from src.tiled_tools.carver.measurements import Size
+from src.tiled_tools.carver.spatial import KDTreeIndex, UniformGridIndex
+from src.tiled_tools.carver.vector import Vector, VectorArray
+
+
+class TestSpatialIndexes(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.points = rng.uniform(0, 100, (500, 2))
+        self.center = np.array([40.0, 60.0])
+        self.indexes = [
+            UniformGridIndex(VectorArray(self.points)),
+            UniformGridIndex(VectorArray(self.points), cell_size=3),
+            KDTreeIndex(VectorArray(self.points)),
+            KDTreeIndex(VectorArray(self.points), leaf_size=1),
+        ]
+
+    def test_radius_query(self):
+        distances = np.linalg.norm(self.points - self.center, axis=1)
+        expected = np.nonzero(distances <= 15)[0].tolist()
+
+        for index in self.indexes:
+            self.assertListEqual(index.radius_query(self.center, 15).tolist(), expected)
+
+    def test_k_nearest(self):
+        distances = np.linalg.norm(self.points - self.center, axis=1)
+        expected = np.argsort(distances)[:7].tolist()
+
+        for index in self.indexes:
+            self.assertListEqual(index.k_nearest(self.center, 7).tolist(), expected)
+            self.assertEqual(len(index.k_nearest(self.center, 1000)), 500)
+
+    def test_range_query(self):
+        inside = np.all((self.points >= [10, 20]) & (self.points <= [30, 25]), axis=1)
+        expected = np.nonzero(inside)[0].tolist()
+
+        for index in self.indexes:
+            self.assertListEqual(
+                index.range_query(Vector([10, 20]), Vector([30, 25])).tolist(),
+                expected,
+            )
+
+    def test_box_overlap(self):
+        positions = [Vector([0, 0]), Vector([5, 5]), Vector([20, 0]), Vector([2, 9])]
+        sizes = [Size(4, 4), Size(2, 2), Size(1, 1), Size(1, 1)]
+
+        for index_class in (UniformGridIndex, KDTreeIndex):
+            index = index_class(positions, sizes)
+            self.assertEqual(len(index), 4)
+
+            overlapping = index.box_overlap(Vector([3, 3]), Size(3, 3))
+            self.assertListEqual(overlapping.tolist(), [0, 1])
+
+            # Touching edges do not overlap
+            self.assertListEqual(
+                index.box_overlap(Vector([4, 0]), Size(1, 1)).tolist(), []
+            )
+
+    def test_empty(self):
+        for index_class in (UniformGridIndex, KDTreeIndex):
+            index = index_class(np.empty((0, 3)))
+            self.assertListEqual(index.radius_query([0, 0, 0], 5).tolist(), [])
+            self.assertListEqual(index.k_nearest([0, 0, 0], 3).tolist(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+# pylint: disable=missing-docstring
+
+import asyncio
+import json
+import unittest
+import uuid
+
+from src.backend.spectate import EVICTED, HEARTBEAT, SpectatorHub
+
+
+class TestSpectatorHub(unittest.TestCase):
+    def setUp(self):
+        self.hub = SpectatorHub(buffer_size=2, heartbeat=0.01)
+        self.game_uuid = uuid.uuid4()
+
+    def test_fan_out(self):
+        first = self.hub.subscribe(self.game_uuid)
+        second = self.hub.subscribe(self.game_uuid)
+        self.hub.subscribe(uuid.uuid4())
+
+        self.assertEqual(self.hub.publish(self.game_uuid, "slide", {"score": 4}), 2)
+        self.assertEqual(self.hub.spectator_count(), 3)
+
+        frame = next(first.frames())
+        self.assertEqual(frame, next(second.frames()))
+        self.assertTrue(frame.startswith("event: slide\ndata: "))
+        self.assertEqual(json.loads(frame.splitlines()[1][6:]), {"score": 4})
+
+    def test_heartbeat(self):
+        subscription = self.hub.subscribe(self.game_uuid)
+        self.assertEqual(next(subscription.frames()), HEARTBEAT)
+
+    def test_eviction(self):
+        slow = self.hub.subscribe(self.game_uuid)
+        fast = self.hub.subscribe(self.game_uuid)
+        frames = fast.frames()
+
+        for i in range(3):
+            self.hub.publish(self.game_uuid, "slide", {"version": i})
+            next(frames)
+
+        self.assertTrue(slow.evicted)
+        self.assertFalse(fast.evicted)
+        self.assertEqual(self.hub.evictions, 1)
+        self.assertEqual(self.hub.spectator_count(self.game_uuid), 1)
+        self.assertListEqual(list(slow.frames()), [EVICTED])
+
+    def test_unsubscribe(self):
+        subscription = self.hub.subscribe(self.game_uuid)
+        self.hub.unsubscribe(self.game_uuid, subscription)
+
+        self.assertFalse(self.hub.has_subscribers(self.game_uuid))
+        self.assertEqual(self.hub.publish(self.game_uuid, "slide", {}), 0)
+
+    def test_async_subscription(self):
+        async def receive():
+            subscription = self.hub.subscribe(self.game_uuid, asynchronous=True)
+            frames = subscription.async_frames()
+            heartbeat = await anext(frames)
+            self.hub.publish(self.game_uuid, "slide", {})
+            return heartbeat, await anext(frames)
+
+        heartbeat, frame = asyncio.run(receive())
+        self.assertEqual(heartbeat, HEARTBEAT)
+        self.assertEqual(frame, "event: slide\ndata: {}\n\n")
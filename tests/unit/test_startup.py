@@ -0,0 +1,117 @@
+# pylint: disable=missing-docstring
+
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+import uuid
+
+from sqlalchemy import create_engine, inspect, text
+
+from src.backend.app import (
+    GameModel2048,
+    GameObject2048,
+    create_app,
+    db,
+    init_db,
+    services,
+)
+from src.backend.startup import StartupTimer
+from src.games.twenty_forty_eight.game import Game, GameConfig, SlideDirection
+
+
+class TestStartupTimer(unittest.TestCase):
+    def test_phases(self):
+        timer = StartupTimer()
+        with timer.phase("first"):
+            pass
+        timer.import_modules("second", ["json", "uuid"])
+        with timer.phase("first"):
+            pass
+
+        self.assertEqual(list(timer.phases), ["first", "second"])
+        self.assertAlmostEqual(timer.total(), sum(timer.phases.values()))
+
+        report = timer.report().splitlines()
+        self.assertEqual(len(report), 3)
+        self.assertTrue(report[0].startswith("first "))
+        self.assertTrue(report[-1].endswith(" ms"))
+
+
+class TestLazyStartup(unittest.TestCase):
+    def test_backend_import_skips_numpy(self):
+        loaded = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys, src.backend.app; print('numpy' in sys.modules)",
+            ],
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+
+        self.assertEqual(loaded.stdout.strip(), "False")
+
+    def test_schema_created_by_init_db(self):
+        app = create_app({"SQLALCHEMY_DATABASE_URI": "sqlite://", "TESTING": True})
+        self.assertEqual(
+            list(services(app).startup.phases), ["config", "database", "routes"]
+        )
+
+        with app.app_context():
+            self.assertEqual(inspect(db.engine).get_table_names(), [])
+
+        init_db(app)
+
+        with app.app_context():
+            self.assertIn("game_model2048", inspect(db.engine).get_table_names())
+
+    def test_init_db_upgrades_old_schema(self):
+        with tempfile.TemporaryDirectory() as directory:
+            database_uri = f"sqlite:///{os.path.join(directory, 'old.db')}"
+            game = Game(GameConfig())
+            game_uuid = uuid.uuid4()
+
+            # The schema before games were versioned
+            engine = create_engine(database_uri)
+            with engine.begin() as connection:
+                connection.execute(
+                    text(
+                        "CREATE TABLE game_model2048 "
+                        "(id CHAR(32) NOT NULL PRIMARY KEY, save_string VARCHAR NOT NULL)"
+                    )
+                )
+                connection.execute(
+                    text("INSERT INTO game_model2048 VALUES (:id, :save_string)"),
+                    {"id": game_uuid.hex, "save_string": game.to_json()},
+                )
+            engine.dispose()
+
+            app = create_app({"SQLALCHEMY_DATABASE_URI": database_uri, "TESTING": True})
+            init_db(app)
+            # Running it again leaves the upgraded schema alone
+            init_db(app)
+
+            with app.app_context():
+                self.assertIn("game_move2048", inspect(db.engine).get_table_names())
+                saved_game = db.session.get(GameModel2048, game_uuid)
+                self.assertEqual(saved_game.version, 0)
+                self.assertEqual(saved_game.snapshot_version, 0)
+
+                game_object = GameObject2048(game_uuid)
+                self.assertEqual(game_object.game.grid_values(), game.grid_values())
+                for direction in [SlideDirection.UP, SlideDirection.LEFT]:
+                    game_object.play_turn(direction)
+                game_object.save_game()
+
+                loaded = GameObject2048(game_uuid).game
+                self.assertEqual(loaded.grid_values(), game_object.game.grid_values())
+                self.assertEqual(loaded.score, game_object.game.score)
+                db.session.remove()
+                db.engine.dispose()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,257 @@
+# pylint: disable=missing-docstring
+
+import io
+import json
+import os
+import random
+import statistics
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from dataclasses import asdict, replace
+
+from src.games.twenty_forty_eight.game import GameConfig
+from src.games.twenty_forty_eight.simulate import (
+    ResultWriter,
+    SimulationResult,
+    canonical_config,
+)
+from src.games.twenty_forty_eight.stats import (
+    ConfigStatistics,
+    SimulationStatistics,
+    main,
+    read_results,
+)
+from src.tiled_tools.common.statistics import Histogram, QuantileSketch, RunningMoments
+
+CONFIGS = [GameConfig(), GameConfig(grid_size=5, root_tile_value=3)]
+
+
+def make_result(config: int, game: int, score: int, highest_tile: int, won=False):
+    return SimulationResult(
+        config=config,
+        game_config=canonical_config(CONFIGS[config]),
+        game=game,
+        seed=game,
+        score=score,
+        highest_tile=highest_tile,
+        moves=score // 4,
+        end_result="GAME_OVER" if not won else None,
+        won=won,
+    )
+
+
+class TestRunningMoments(unittest.TestCase):
+    def test_matches_statistics_module(self):
+        rng = random.Random(1)
+        values = [rng.uniform(-100, 1000) for _ in range(500)]
+
+        moments = RunningMoments()
+        moments.extend(values)
+
+        self.assertEqual(moments.count, 500)
+        self.assertAlmostEqual(moments.mean, statistics.mean(values))
+        self.assertAlmostEqual(moments.variance(), statistics.variance(values))
+        self.assertAlmostEqual(
+            moments.std(sample=False), statistics.pstdev(values), places=6
+        )
+        self.assertEqual(moments.min, min(values))
+        self.assertEqual(moments.max, max(values))
+
+    def test_merge_equals_single_pass(self):
+        rng = random.Random(2)
+        values = [rng.randint(0, 10_000) for _ in range(300)]
+
+        whole = RunningMoments()
+        whole.extend(values)
+
+        parts = [RunningMoments() for _ in range(3)]
+        parts[0].extend(values[:10])
+        parts[1].extend(values[10:200])
+        parts[2].extend(values[200:])
+
+        merged = RunningMoments()
+        for part in parts:
+            merged.merge(part)
+
+        self.assertEqual(merged.count, whole.count)
+        self.assertAlmostEqual(merged.mean, whole.mean)
+        self.assertAlmostEqual(merged.variance(), whole.variance())
+        self.assertEqual((merged.min, merged.max), (whole.min, whole.max))
+
+    def test_empty_and_single_value(self):
+        moments = RunningMoments()
+        self.assertEqual(moments.variance(), 0.0)
+
+        moments.merge(RunningMoments())
+        self.assertEqual(moments.count, 0)
+
+        moments.add(5)
+        self.assertEqual(moments.variance(), 0.0)
+        self.assertEqual(moments.variance(sample=False), 0.0)
+
+
+class TestHistogram(unittest.TestCase):
+    def test_add_and_merge(self):
+        first = Histogram()
+        for value in [3, 1, 3]:
+            first.add(value)
+
+        second = Histogram()
+        second.add(1, 4)
+
+        first.merge(second)
+
+        self.assertEqual(first.to_dict(), {1: 5, 3: 2})
+        self.assertEqual(list(first.to_dict()), [1, 3])
+        self.assertEqual(first.total(), 7)
+
+
+class TestQuantileSketch(unittest.TestCase):
+    def test_quantiles_within_relative_accuracy(self):
+        rng = random.Random(3)
+        values = sorted(rng.expovariate(1 / 5000) for _ in range(5000))
+
+        sketch = QuantileSketch(relative_accuracy=0.01)
+        for value in values:
+            sketch.add(value)
+
+        for q in [0.0, 0.1, 0.5, 0.9, 0.99, 1.0]:
+            exact = values[int(q * (len(values) - 1))]
+            self.assertLessEqual(abs(sketch.quantile(q) - exact), 0.01 * exact)
+
+    def test_merge_equals_single_sketch(self):
+        rng = random.Random(4)
+        values = [rng.randint(0, 50_000) for _ in range(1000)]
+
+        whole = QuantileSketch()
+        first = QuantileSketch()
+        second = QuantileSketch()
+        for index, value in enumerate(values):
+            whole.add(value)
+            (first if index % 2 else second).add(value)
+
+        first.merge(second)
+
+        self.assertEqual(first.count, whole.count)
+        self.assertEqual(
+            first.quantiles([0.25, 0.5, 0.75]), whole.quantiles([0.25, 0.5, 0.75])
+        )
+
+    def test_zeros_and_empty(self):
+        sketch = QuantileSketch()
+        self.assertIsNone(sketch.quantile(0.5))
+
+        for value in [0, 0, 0, 100]:
+            sketch.add(value)
+
+        self.assertEqual(sketch.quantile(0.5), 0.0)
+        self.assertAlmostEqual(sketch.quantile(1.0), 100, delta=1)
+
+    def test_rejects_mismatched_merge(self):
+        with self.assertRaises(AssertionError):
+            QuantileSketch(0.01).merge(QuantileSketch(0.02))
+
+        with self.assertRaises(AssertionError):
+            QuantileSketch().add(-1)
+
+
+class TestSimulationStatistics(unittest.TestCase):
+    def test_config_statistics(self):
+        config = ConfigStatistics()
+        config.add(make_result(0, 0, 1000, 128))
+        config.add(make_result(0, 1, 3000, 256))
+        config.add(make_result(0, 2, 20000, 2048, won=True))
+
+        summary = config.to_dict()
+
+        self.assertEqual(summary["games"], 3)
+        self.assertAlmostEqual(summary["win_rate"], 1 / 3)
+        self.assertAlmostEqual(summary["score"]["mean"], 8000)
+        self.assertEqual(summary["score"]["max"], 20000)
+        self.assertEqual(summary["moves"]["min"], 250)
+        self.assertEqual(summary["highest_tiles"], {128: 1, 256: 1, 2048: 1})
+        self.assertAlmostEqual(summary["score"]["quantiles"][0.5], 3000, delta=30)
+
+    def test_merge_across_workers(self):
+        results = [
+            make_result(game % 2, game, 100 * (game + 1), 2 ** (game % 5 + 3))
+            for game in range(40)
+        ]
+
+        whole = SimulationStatistics()
+        workers = [SimulationStatistics() for _ in range(3)]
+        for index, result in enumerate(results):
+            whole.add(result)
+            workers[index % 3].add(result)
+
+        merged = SimulationStatistics()
+        for worker in workers:
+            merged.merge(worker)
+
+        merged_summary = merged.to_dict()
+        whole_summary = whole.to_dict()
+        self.assertEqual(
+            [summary["config"]["grid_size"] for summary in merged_summary], [4, 5]
+        )
+        for config in [0, 1]:
+            self.assertEqual(
+                merged_summary[config]["games"], whole_summary[config]["games"]
+            )
+            self.assertAlmostEqual(
+                merged_summary[config]["score"]["std"],
+                whole_summary[config]["score"]["std"],
+            )
+            self.assertEqual(
+                merged_summary[config]["highest_tiles"],
+                whole_summary[config]["highest_tiles"],
+            )
+            self.assertEqual(
+                merged_summary[config]["score"]["quantiles"],
+                whole_summary[config]["score"]["quantiles"],
+            )
+
+    def test_reads_jsonl_and_csv(self):
+        results = [make_result(0, 0, 500, 64), make_result(1, 1, 900, 2048, True)]
+
+        with tempfile.TemporaryDirectory() as directory:
+            paths = []
+            for output_format in ["jsonl", "csv"]:
+                path = os.path.join(directory, f"results.{output_format}")
+                with open(path, "w", encoding="utf-8", newline="") as output:
+                    writer = ResultWriter(output, output_format)
+                    for result in results:
+                        writer.write(result)
+
+                self.assertEqual(list(read_results(path)), results)
+                paths.append(path)
+
+            stdout = io.StringIO()
+            with redirect_stdout(stdout):
+                main(paths)
+
+        summary = json.loads(stdout.getvalue())
+        self.assertEqual(summary[0]["games"], 2)
+        self.assertEqual(summary[1]["win_rate"], 1.0)
+        self.assertEqual(summary[1]["highest_tiles"], {"2048": 2})
+
+    def test_merge_keys_on_config_contents(self):
+        # Config 0 of one run is config 1 of another
+        first_run = SimulationStatistics()
+        first_run.add(make_result(0, 0, 100, 8))
+        second_run = SimulationStatistics()
+        second_run.add(replace(make_result(1, 0, 300, 27), config=0))
+        second_run.add(make_result(0, 1, 200, 16))
+
+        first_run.merge(second_run)
+        summary = first_run.to_dict()
+
+        self.assertEqual(len(summary), 2)
+        self.assertEqual(summary[0]["config"], asdict(CONFIGS[0]))
+        self.assertEqual(summary[0]["games"], 2)
+        self.assertEqual(summary[1]["config"]["root_tile_value"], 3)
+        self.assertEqual(summary[1]["highest_tiles"], {27: 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
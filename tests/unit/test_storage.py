@@ -0,0 +1,77 @@
+# pylint: disable=missing-docstring
+
+import os
+import tempfile
+import unittest
+
+from sqlalchemy import create_engine
+
+from src.backend.storage import STORAGE_PROFILES, StorageHelper
+
+
+class TestStorageHelper(unittest.TestCase):
+    def test_engine_options(self):
+        profile = StorageHelper.profile("sqlite")
+
+        options = StorageHelper.engine_options("sqlite:///backend.db", profile)
+        self.assertEqual(options["pool_size"], profile.pool_size)
+        self.assertEqual(options["connect_args"], {"cached_statements": 500})
+        self.assertEqual(options["query_cache_size"], 500)
+
+        options = StorageHelper.engine_options("sqlite://", profile)
+        self.assertNotIn("pool_size", options)
+
+        options = StorageHelper.engine_options(
+            "postgresql+asyncpg://user@localhost/games",
+            StorageHelper.profile("postgres"),
+        )
+        self.assertTrue(options["pool_pre_ping"])
+        self.assertEqual(options["connect_args"], {"statement_cache_size": 500})
+
+        with self.assertRaises(AssertionError):
+            StorageHelper.profile("mongo")
+
+    def test_instance_uri(self):
+        with tempfile.TemporaryDirectory() as directory:
+            instance_path = os.path.join(directory, "instance")
+            database_path = os.path.join(instance_path, "backend.db")
+
+            self.assertEqual(
+                StorageHelper.instance_uri(
+                    "sqlite+aiosqlite:///backend.db", instance_path
+                ),
+                f"sqlite+aiosqlite:///{database_path}",
+            )
+            self.assertTrue(os.path.isdir(instance_path))
+
+            for database_uri in [
+                f"sqlite:///{database_path}",
+                "sqlite+aiosqlite://",
+                "sqlite:///:memory:",
+                "postgresql+asyncpg://user@localhost/games",
+            ]:
+                self.assertEqual(
+                    StorageHelper.instance_uri(database_uri, instance_path),
+                    database_uri,
+                )
+
+    def test_pragmas(self):
+        self.assertListEqual(StorageHelper.pragmas(STORAGE_PROFILES["postgres"]), [])
+        self.assertIn(
+            "PRAGMA synchronous=FULL",
+            StorageHelper.pragmas(STORAGE_PROFILES["sqlite_durable"]),
+        )
+
+        with tempfile.TemporaryDirectory() as directory:
+            uri = f"sqlite:///{os.path.join(directory, 'backend.db')}"
+            profile = StorageHelper.profile("sqlite")
+            engine = create_engine(uri, **StorageHelper.engine_options(uri, profile))
+            StorageHelper.apply_pragmas(engine, profile)
+
+            with engine.connect() as connection:
+                journal_mode = connection.exec_driver_sql("PRAGMA journal_mode")
+                self.assertEqual(journal_mode.scalar(), "wal")
+                synchronous = connection.exec_driver_sql("PRAGMA synchronous")
+                self.assertEqual(synchronous.scalar(), 1)
+
+            engine.dispose()
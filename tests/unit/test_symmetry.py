@@ -0,0 +1,136 @@
+# pylint: disable=missing-docstring
+
+import random
+import unittest
+
+import numpy as np
+
+from src.games.twenty_forty_eight.game import Game, GameConfig, SlideDirection, Tile
+from src.games.twenty_forty_eight.symmetry import (
+    DIRECTION_STEPS,
+    Symmetry,
+    SymmetryHelper,
+)
+
+
+def random_board(rng: random.Random, size: int = 4) -> np.ndarray:
+    values = [0, 0, 2, 2, 4, 8, 16]
+    return np.array([[rng.choice(values) for _c in range(size)] for _r in range(size)])
+
+
+def slide(board: np.ndarray, direction: SlideDirection) -> np.ndarray:
+    game = Game(GameConfig(grid_size=board.shape[0]))
+    game.set_tiles([[Tile(int(value)) for value in row] for row in board])
+    game.slide_tiles(direction)
+    return np.array(game.grid_values())
+
+
+class TestSymmetry(unittest.TestCase):
+    def test_apply(self):
+        board = np.arange(9).reshape(3, 3)
+
+        self.assertEqual(
+            SymmetryHelper.apply(board, Symmetry.ROTATE_90).tolist(),
+            [[2, 5, 8], [1, 4, 7], [0, 3, 6]],
+        )
+        self.assertEqual(
+            SymmetryHelper.apply(board, Symmetry.TRANSPOSE).tolist(), board.T.tolist()
+        )
+        self.assertEqual(
+            SymmetryHelper.apply(board, Symmetry.FLIP_HORIZONTAL).tolist(),
+            np.fliplr(board).tolist(),
+        )
+        self.assertEqual(
+            SymmetryHelper.apply(board, Symmetry.FLIP_VERTICAL).tolist(),
+            np.flipud(board).tolist(),
+        )
+
+        variants = {SymmetryHelper.apply(board, s).tobytes() for s in Symmetry}
+        self.assertEqual(len(variants), 8)
+
+    def test_invert(self):
+        board = np.arange(16).reshape(4, 4)
+
+        for symmetry in Symmetry:
+            transformed = SymmetryHelper.apply(board, symmetry)
+            restored = SymmetryHelper.apply(
+                transformed, SymmetryHelper.invert(symmetry)
+            )
+            self.assertEqual(restored.tolist(), board.tolist())
+
+    def test_slides_commute_with_symmetries(self):
+        rng = random.Random(46)
+
+        for _board in range(20):
+            board = random_board(rng)
+            for symmetry in Symmetry:
+                transformed = SymmetryHelper.apply(board, symmetry)
+                for direction in DIRECTION_STEPS:
+                    mapped = SymmetryHelper.map_direction(direction, symmetry)
+
+                    self.assertEqual(
+                        SymmetryHelper.apply(
+                            slide(board, direction), symmetry
+                        ).tolist(),
+                        slide(transformed, mapped).tolist(),
+                    )
+                    self.assertEqual(
+                        SymmetryHelper.unmap_direction(mapped, symmetry), direction
+                    )
+
+        self.assertEqual(
+            SymmetryHelper.map_direction(SlideDirection.NONE, Symmetry.ROTATE_90),
+            SlideDirection.NONE,
+        )
+
+    def test_canonicalize(self):
+        rng = random.Random(8)
+        board = random_board(rng)
+        canonical, symmetry = SymmetryHelper.canonicalize(board)
+
+        self.assertEqual(
+            SymmetryHelper.apply(board, symmetry).tolist(), canonical.tolist()
+        )
+        for other in Symmetry:
+            variant = SymmetryHelper.apply(board, other)
+            self.assertLessEqual(canonical.ravel().tolist(), variant.ravel().tolist())
+
+            variant_canonical, _symmetry = SymmetryHelper.canonicalize(variant)
+            self.assertEqual(variant_canonical.tolist(), canonical.tolist())
+            self.assertEqual(
+                SymmetryHelper.canonical_key(variant),
+                SymmetryHelper.canonical_key(board),
+            )
+
+    def test_canonicalize_symmetric_board(self):
+        board = np.zeros((4, 4), dtype=int)
+        canonical, symmetry = SymmetryHelper.canonicalize(board)
+
+        self.assertEqual(canonical.tolist(), board.tolist())
+        self.assertEqual(symmetry, Symmetry.IDENTITY)
+
+    def test_canonicalize_batch_matches_smallest_variant(self):
+        rng = random.Random(9)
+        boards = np.stack([random_board(rng, 5) for _board in range(50)])
+
+        canonical, symmetries = SymmetryHelper.canonicalize_batch(boards)
+
+        self.assertEqual(canonical.shape, boards.shape)
+        for board, batch_canonical, value in zip(boards, canonical, symmetries):
+            smallest = min(
+                SymmetryHelper.apply(board, symmetry).ravel().tolist()
+                for symmetry in Symmetry
+            )
+            self.assertEqual(batch_canonical.ravel().tolist(), smallest)
+            self.assertEqual(
+                SymmetryHelper.apply(board, Symmetry(int(value))).tolist(),
+                batch_canonical.tolist(),
+            )
+
+    def test_rejects_non_square(self):
+        with self.assertRaises(AssertionError):
+            SymmetryHelper.canonicalize(np.zeros((3, 4)))
+
+
+if __name__ == "__main__":
+    unittest.main()